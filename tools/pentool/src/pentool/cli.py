@@ -21,6 +21,7 @@ from pentool.commands.recon import run_recon
 from pentool.commands.scan import run_scan
 from pentool.commands.update_data import run_update_data
 from pentool.commands.webmap import run_webmap
+from pentool.common import parse_tool_timeouts
 from pentool.docker_runner import DockerRunner
 
 LOG = logging.getLogger("pentool")
@@ -28,6 +29,9 @@ LOG = logging.getLogger("pentool")
 TOOLKIT_NAME = "pentool"
 DEFAULT_IMAGE = os.environ.get("PENTEST_TOOLKIT_IMAGE", "pentool:latest")
 DEFAULT_CACHE_TTL = int(os.environ.get("PENTEST_TOOLKIT_CACHE_TTL", "14400"))
+DEFAULT_TOOL_TIMEOUT = float(
+    os.environ.get("PENTEST_TOOLKIT_TOOL_TIMEOUT", "0")
+)
 
 
 # -------------------------
@@ -65,9 +69,15 @@ def handle_recon(args: argparse.Namespace) -> int:
         cidr=cidr,
         host=host,
         targets=Path(args.targets) if args.targets else None,
+        exclude=Path(args.exclude) if args.exclude else None,
         top_ports=args.top_ports,
         rate=args.rate,
         refresh=args.refresh,
+        adaptive=args.adaptive,
+        min_rate=args.min_rate,
+        max_rate=args.max_rate,
+        chunk_size=args.chunk_size,
+        resume=args.resume,
     )
     summary = run_recon(opts, runner)
     print(summary)
@@ -80,9 +90,17 @@ def handle_fingerprint(args: argparse.Namespace) -> int:
         input_path=Path(args.input) if args.input else None,
         targets=Path(args.targets) if args.targets else None,
         hosts=tuple(args.hosts or ()),
+        exclude=Path(args.exclude) if args.exclude else None,
         enable_http=args.http,
         threads=args.threads,
         refresh=args.refresh,
+        timeout=args.timeout or None,
+        tool_timeouts=parse_tool_timeouts(args.tool_timeout),
+        probe=not args.no_probe,
+        max_age=args.max_age,
+        shards=args.shards,
+        sort_buffer=args.sort_buffer,
+        reuse_known=args.reuse_known,
     )
     summary = run_fingerprint(opts, runner)
     print(summary)
@@ -97,6 +115,15 @@ def handle_webmap(args: argparse.Namespace) -> int:
         wordlist=Path(args.wordlist) if args.wordlist else None,
         rate=args.rate,
         refresh=args.refresh,
+        timeout=args.timeout or None,
+        tool_timeouts=parse_tool_timeouts(args.tool_timeout),
+        dedup_wordlist=args.dedup_wordlist,
+        urls_file=Path(args.urls_file) if args.urls_file else None,
+        concurrency=args.concurrency,
+        recursive=args.recursive,
+        dns_filter=not args.no_dns_filter,
+        resolvers=tuple(filter(None, args.resolvers.split(","))),
+        probe_max_age=args.probe_max_age,
     )
     summary = run_webmap(opts, runner)
     print(summary)
@@ -105,7 +132,15 @@ def handle_webmap(args: argparse.Namespace) -> int:
 
 def handle_scan(args: argparse.Namespace) -> int:
     runner = _make_runner(args)
-    opts = ScanOptions(url=args.url, profile=args.profile, refresh=args.refresh)
+    opts = ScanOptions(
+        url=args.url,
+        profile=args.profile,
+        refresh=args.refresh,
+        timeout=args.timeout or None,
+        tool_timeouts=parse_tool_timeouts(args.tool_timeout),
+        urls_file=Path(args.urls_file) if args.urls_file else None,
+        concurrency=args.concurrency,
+    )
     summary = run_scan(opts, runner)
     print(summary)
     return 0
@@ -116,7 +151,7 @@ def handle_scan(args: argparse.Namespace) -> int:
 # -------------------------
 def _load_usage() -> str:
     """Load epilog text from file."""
-    usage_path = Path(__file__).parent / "resources", "USAGE.txt"
+    usage_path = Path(__file__).parent / "resources" / "USAGE.txt"
     if usage_path.exists():
         return usage_path.read_text(encoding="utf-8")
     return ""
@@ -132,6 +167,23 @@ class _HelpfulArgumentParser(argparse.ArgumentParser):
         self.exit(2, f"{self.prog}: error: {message}\n")
 
 
+def _add_timeout_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared per-tool timeout options to a subcommand."""
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TOOL_TIMEOUT,
+        help="Default per-tool timeout in seconds (0 disables)",
+    )
+    parser.add_argument(
+        "--tool-timeout",
+        action="append",
+        default=[],
+        metavar="TOOL=SECONDS",
+        help="Override the timeout of one tool (repeatable)",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     usage = _load_usage()
     parser = _HelpfulArgumentParser(
@@ -171,12 +223,45 @@ def build_parser() -> argparse.ArgumentParser:
     recon.add_argument("--cidr")
     recon.add_argument("--host")
     recon.add_argument("--targets", help="Targets file (one per line)")
+    recon.add_argument(
+        "--exclude", help="Exclusion file (CIDRs, ranges, hosts; one per line)"
+    )
     recon.add_argument("--top-ports", type=int, default=100)
     recon.add_argument(
         "--rate",
         type=int,
         default=int(os.environ.get("PENTEST_TOOLKIT_DISCOVER_RATE", "15000")),
     )
+    recon.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Sweep in chunks and tune --rate from observed loss",
+    )
+    recon.add_argument(
+        "--min-rate",
+        type=int,
+        default=int(
+            os.environ.get("PENTEST_TOOLKIT_DISCOVER_MIN_RATE", "1000")
+        ),
+    )
+    recon.add_argument(
+        "--max-rate",
+        type=int,
+        default=int(
+            os.environ.get("PENTEST_TOOLKIT_DISCOVER_MAX_RATE", "100000")
+        ),
+    )
+    recon.add_argument(
+        "--chunk-size",
+        type=int,
+        default=int(os.environ.get("PENTEST_TOOLKIT_DISCOVER_CHUNK", "65536")),
+        help="Addresses per sweep chunk (also the resume checkpoint)",
+    )
+    recon.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the newest interrupted run of the same scan",
+    )
     recon.add_argument(
         "--refresh", action="store_true", help="Force re-run and ignore cache"
     )
@@ -193,6 +278,9 @@ def build_parser() -> argparse.ArgumentParser:
     )
     fingerprint.add_argument("--input", help="Recon JSON file")
     fingerprint.add_argument("--targets", help="Targets file (host[:port])")
+    fingerprint.add_argument(
+        "--exclude", help="Exclusion file (CIDRs, ranges, hosts; one per line)"
+    )
     fingerprint.add_argument(
         "--http", action="store_true", help="Enable HTTP probing via httpx"
     )
@@ -201,6 +289,41 @@ def build_parser() -> argparse.ArgumentParser:
         type=int,
         default=int(os.environ.get("PENTEST_TOOLKIT_HTTP_THREADS", "50")),
     )
+    fingerprint.add_argument(
+        "--no-probe",
+        action="store_true",
+        help="Route endpoints without service hints by port number only",
+    )
+    fingerprint.add_argument(
+        "--max-age",
+        type=float,
+        default=float(
+            os.environ.get("PENTEST_TOOLKIT_SERVICE_MAX_AGE", "86400")
+        ),
+        help=(
+            "Reuse recon nmap data, and knowledge base records for "
+            "--reuse-known, younger than this many seconds "
+            "(0 disables recon reuse)"
+        ),
+    )
+    fingerprint.add_argument(
+        "--reuse-known",
+        action="store_true",
+        help="Skip endpoints whose quick signature matches a recent record",
+    )
+    fingerprint.add_argument(
+        "--shards",
+        type=int,
+        default=int(os.environ.get("PENTEST_TOOLKIT_FINGERPRINT_SHARDS", "1")),
+        help="Split hosts into N groups, each with its own tool containers",
+    )
+    fingerprint.add_argument(
+        "--sort-buffer",
+        type=int,
+        default=int(os.environ.get("PENTEST_TOOLKIT_SORT_BUFFER", "1000000")),
+        help="Endpoints held in memory while sorting targets; more spill",
+    )
+    _add_timeout_arguments(fingerprint)
     fingerprint.add_argument("--refresh", action="store_true")
     fingerprint.add_argument(
         "hosts", nargs="*", help="Host[:port] positional targets"
@@ -211,24 +334,73 @@ def build_parser() -> argparse.ArgumentParser:
     webmap = subparsers.add_parser(
         "webmap", help="Automated web surface mapping"
     )
-    webmap.add_argument("--url", required=True)
+    webmap_target = webmap.add_mutually_exclusive_group(required=True)
+    webmap_target.add_argument("--url")
+    webmap_target.add_argument(
+        "--urls-file", help="File with one base URL per line (batch mode)"
+    )
     webmap.add_argument("--depth", type=int, default=2)
     webmap.add_argument("--wordlist", help="Optional directory/file wordlist")
+    webmap.add_argument(
+        "--dedup-wordlist",
+        action="store_true",
+        help="Sort and deduplicate a custom wordlist when it is stored",
+    )
     webmap.add_argument(
         "--rate",
         type=int,
         default=int(os.environ.get("PENTEST_TOOLKIT_WEB_RATE", "50")),
     )
+    webmap.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Recurse gobuster into found directories up to --depth levels",
+    )
+    webmap.add_argument(
+        "--resolvers",
+        default=os.environ.get("PENTEST_TOOLKIT_RESOLVERS", ""),
+        help="Comma-separated DNS resolvers (IP[:PORT]); default resolv.conf",
+    )
+    webmap.add_argument(
+        "--no-dns-filter",
+        action="store_true",
+        help="Probe every amass subdomain without resolving it first",
+    )
+    webmap.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.environ.get("PENTEST_TOOLKIT_WEB_CONCURRENCY", "4")),
+        help="Discovery containers run at once in batch mode",
+    )
+    webmap.add_argument(
+        "--probe-max-age",
+        type=float,
+        default=float(os.environ.get("PENTEST_TOOLKIT_PROBE_MAX_AGE", "86400")),
+        help="Reuse cached httpx results younger than this (0 disables)",
+    )
     webmap.add_argument("--refresh", action="store_true")
+    _add_timeout_arguments(webmap)
     webmap.set_defaults(func=handle_webmap)
 
     # scan
     scan = subparsers.add_parser("scan", help="Lightweight vulnerability scan")
-    scan.add_argument("--url", required=True)
+    scan_target = scan.add_mutually_exclusive_group(required=True)
+    scan_target.add_argument("--url")
+    scan_target.add_argument(
+        "--urls-file",
+        help="File with one URL per line, scanned with a shared ZAP daemon",
+    )
     scan.add_argument(
         "--profile", choices=["quick", "extended"], default="quick"
     )
+    scan.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.environ.get("PENTEST_TOOLKIT_SCAN_CONCURRENCY", "4")),
+        help="Tool containers run at once in batch mode (plus the ZAP daemon)",
+    )
     scan.add_argument("--refresh", action="store_true")
+    _add_timeout_arguments(scan)
     scan.set_defaults(func=handle_scan)
 
     return parser
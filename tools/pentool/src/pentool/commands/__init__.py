@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Mapping, Optional, Sequence
 
 
 @dataclass(frozen=True)
@@ -12,9 +12,15 @@ class DiscoverOptions:
     cidr: Optional[str]
     host: Optional[str]
     targets: Optional[Path]
+    exclude: Optional[Path]
     top_ports: int
     rate: int
     refresh: bool
+    adaptive: bool = False
+    min_rate: int = 1000
+    max_rate: int = 100000
+    chunk_size: int = 65536
+    resume: bool = False
 
 
 @dataclass(frozen=True)
@@ -22,22 +28,43 @@ class FingerprintOptions:
     input_path: Optional[Path]
     targets: Optional[Path]
     hosts: Sequence[str]
+    exclude: Optional[Path]
     enable_http: bool
     threads: int
     refresh: bool
+    timeout: Optional[float] = None
+    tool_timeouts: Mapping[str, float] = field(default_factory=dict)
+    probe: bool = True
+    max_age: float = 86400.0
+    shards: int = 1
+    sort_buffer: int = 1_000_000
+    reuse_known: bool = False
 
 
 @dataclass(frozen=True)
 class WebMapOptions:
-    url: str
+    url: Optional[str]
     depth: int
     wordlist: Optional[Path]
     rate: int
     refresh: bool
+    timeout: Optional[float] = None
+    tool_timeouts: Mapping[str, float] = field(default_factory=dict)
+    dedup_wordlist: bool = False
+    urls_file: Optional[Path] = None
+    concurrency: int = 4
+    recursive: bool = False
+    dns_filter: bool = True
+    resolvers: Sequence[str] = ()
+    probe_max_age: float = 86400.0
 
 
 @dataclass(frozen=True)
 class ScanOptions:
-    url: str
+    url: Optional[str]
     profile: str
     refresh: bool
+    timeout: Optional[float] = None
+    tool_timeouts: Mapping[str, float] = field(default_factory=dict)
+    urls_file: Optional[Path] = None
+    concurrency: int = 4
@@ -5,45 +5,118 @@ This module performs comprehensive service fingerprinting on discovered hosts an
 by orchestrating multiple specialized tools:
 
 - nmap: Service version detection that identifies running services, versions, and
-  banners on discovered TCP ports
+  banners on discovered TCP ports; results are streamed from nmap XML (product,
+  version, extra info, TLS tunnel and CPE detail) with gnmap as a fallback
 - sslyze: TLS/SSL certificate analysis that extracts certificate details, accepted
-  TLS versions, and cipher suite information for TLS-enabled services (ports 443,
-  465, 993, 995, etc.)
+  TLS versions, and cipher suite information for TLS-enabled services
 - httpx: HTTP service fingerprinting that extracts page titles, status codes,
   response headers, and technology stack information (optional, can be enabled/disabled)
 
+Endpoints are routed to sslyze and httpx by what they actually speak: service
+names and ``ssl`` tunnel markers from recon input are used when present, and a
+quick TLS/HTTP handshake probe classifies the rest. With probing disabled, or
+when a probe gets no answer, endpoints fall back to routing by port number
+(well-known TLS port list for sslyze, everything to httpx). Probes run from
+the host process, not through the container network or proxy settings the
+tools use.
+
+A persistent knowledge base keyed by (host, port) stores every completed
+fingerprint with its cheap signature. With ``--reuse-known`` a quick banner or
+certificate check runs first, and endpoints whose signature matches a recent
+entry reuse the stored record instead of being rescanned.
+
+When the input is a recon summary, the service data recon's nmap run already
+collected is imported instead of version-scanning the same endpoints again;
+nmap only runs for endpoints without fresh service data.
+
 Targets can be provided from multiple sources: discover JSON output, targets file,
-or command-line host list. The module processes each host:port combination, runs
-appropriate fingerprinting tools based on port type, and merges results into a
-unified data structure per host:port endpoint.
+or command-line host list. Hosts are normalised and deduplicated, and endpoints
+matching an optional exclusion list are dropped. Deduplication and ordering use
+a bounded-memory external sort, and targets.txt plus the per-tool support files
+are written in a single pass over the sorted stream. The module processes each
+host:port combination, runs appropriate fingerprinting tools based on port type,
+and merges results into a unified data structure per host:port endpoint.
 
 Results include service names, versions, banners, TLS certificate details, HTTP
 metadata, and technology stack information. All findings are consolidated into
 a JSON summary with source attribution, enabling comprehensive service mapping
 and technology identification across the target infrastructure.
 
+The summary is built as a streaming merge: scanner outputs are externally sorted
+by host and port and merged with the already sorted targets, and each host's
+record is written as soon as it is complete, so memory is bounded by one host.
+External sorts spill into the run directory rather than the system temp dir.
+Recon service records are streamed to nmap-reused.jsonl and matched against
+the sorted targets through a sorted file, and shards are split by streaming
+the routed support files. What still grows with the input: a recon JSON
+``--input`` is loaded whole and its service hints are kept in a dict, the
+set of distinct ports is held per run and shard, and sharding keeps one
+load counter per host.
+
+The three tools read only the support files and write separate artifacts, so
+they run concurrently with per-tool timeouts; a failed or timed-out tool is
+recorded in the summary without cancelling the others.
+
 Supports result caching, configurable HTTP scanning, and multi-threaded HTTP
 probe execution for efficient large-scale fingerprinting operations.
 """
 
 from __future__ import annotations
 
+import datetime as dt
+import heapq
 import json
 import logging
+import re
+import sqlite3
+import time
 from collections import defaultdict
+from contextlib import ExitStack, closing
+from datetime import timezone as tz
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
 
 from pentool.commands import FingerprintOptions
-from pentool.common import check_cache, iter_lines, safe_int
+from pentool.common import (
+    ProbeResult,
+    ServiceSignature,
+    Stage,
+    TargetPlan,
+    build_target_plan,
+    check_cache,
+    concatenate_files,
+    external_sort,
+    iter_lines,
+    iter_target_file,
+    normalise_host,
+    open_store,
+    probe_endpoints,
+    run_stages,
+    safe_int,
+    signature_endpoints,
+    target_file_digest,
+)
 from pentool.docker_runner import DockerRunner
 from pentool.parsers import (
     build_http_info,
     extract_host_from_httpx,
     extract_port_from_httpx,
-    iter_gnmap,
     iter_httpx,
+    iter_nmap_results,
     iter_sslyze,
+    merge_nmap_xml,
 )
 from pentool.utils import (
     CacheKey,
@@ -51,10 +124,67 @@ from pentool.utils import (
     parse_host_port,
     utc_timestamp,
     write_json,
+    write_json_stream,
 )
 
 LOG = logging.getLogger(__name__)
 
+Endpoint = Tuple[str, int]
+
+# Service names that imply TLS even without an nmap ``ssl`` tunnel marker.
+TLS_SERVICE_NAMES = frozenset(
+    {
+        "https",
+        "https-alt",
+        "imaps",
+        "ldaps",
+        "pop3s",
+        "smtps",
+        "submissions",
+        "ftps",
+        "ircs",
+        "nntps",
+    }
+)
+# Service names too vague to route on; such endpoints are probed instead.
+UNROUTABLE_SERVICE_NAMES = frozenset({"", "unknown", "tcpwrapped", "ssl"})
+
+NMAP_REUSED_FILENAME = "nmap-reused.jsonl"
+# Sorted rows (``_encode_row``) of the endpoints recon already covers.
+COVERED_FILENAME = "nmap-covered.txt"
+# "host port" lines of the endpoints nmap scans, sorted; shards split from it.
+NMAP_ENDPOINTS_FILENAME = "nmap-endpoints.txt"
+# Routed "host:port" inputs for sslyze and httpx.
+ROUTED_TARGET_FILES = ("tls-targets.txt", "http-targets.txt")
+# Endpoints routed (and probed) together while writing support files.
+ROUTE_BATCH = 4096
+
+KNOWLEDGE_FILENAME = "fingerprint-kb.sqlite"
+KNOWN_RECORDS_FILENAME = "known-records.jsonl"
+SIGNATURES_FILENAME = "signatures.txt"
+# Summary record sources in merge order; later sources win field conflicts.
+SUMMARY_SOURCES = (
+    "seed",
+    "known",
+    "reused",
+    "nmap",
+    "sslyze",
+    "httpx",
+    "signature",
+)
+KNOWLEDGE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS services (
+    host TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    banner_hash TEXT,
+    cert_fingerprint TEXT,
+    record TEXT NOT NULL,
+    PRIMARY KEY (host, port)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS services_seen_at ON services (seen_at);
+"""
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Setup and initialization
@@ -72,6 +202,27 @@ def _descriptor(opts: FingerprintOptions) -> str:
     return "fingerprint"
 
 
+def _cache_components(opts: FingerprintOptions, desc: str) -> Tuple[str, ...]:
+    """Build cache key components; exclusions only key when present."""
+    components = [
+        "fingerprint",
+        desc,
+        f"http={int(opts.enable_http)}",
+        f"threads={opts.threads}",
+    ]
+    if opts.exclude:
+        components.append(
+            f"exclude={opts.exclude.name}:{target_file_digest(opts.exclude)}"
+        )
+    if not opts.probe:
+        components.append("probe=0")
+    if opts.max_age <= 0:
+        components.append("reuse=0")
+    if opts.reuse_known:
+        components.append("known=1")
+    return tuple(components)
+
+
 def _check_cache(runner: DockerRunner, key: CacheKey) -> Optional[Path]:
     """Check if cached fingerprint results exist and return summary path if found."""
     return check_cache(runner, key, "fingerprint.json")
@@ -144,77 +295,416 @@ def _iter_targets_from_list(values: Sequence[str]) -> Iterator[Tuple[str, int]]:
             yield parsed
 
 
-def _collect_targets_from_input(
-    opts: FingerprintOptions, dedup: set[Tuple[str, int]]
-) -> None:
-    """Collect targets from input_path option."""
-    if not opts.input_path:
+def _iter_service_hints(
+    data: Dict[str, object],
+) -> Iterator[Tuple[Endpoint, Tuple[str, str]]]:
+    """Iterate ``(host, port) -> (service name, tunnel)`` from discover JSON."""
+    hosts = data.get("hosts")
+    if not isinstance(hosts, list):
         return
-    if not opts.input_path.exists():
-        raise RuntimeError(f"Input file not found: {opts.input_path}")
-    dedup.update(_iter_targets_from_discover(load_json(opts.input_path)))
+    for row in hosts:
+        address = _extract_address_from_row(row)
+        if not address:
+            continue
+        for p in row.get("ports", []):
+            if not isinstance(p, dict):
+                continue
+            port = safe_int(p.get("port"))
+            service = p.get("service")
+            if isinstance(service, dict):
+                service = service.get("name")
+            if port is None or not service:
+                continue
+            yield (normalise_host(address), port), (
+                str(service),
+                str(p.get("tunnel") or ""),
+            )
+
+
+def _iter_input_targets(
+    opts: FingerprintOptions,
+    hints: Optional[Dict[Endpoint, Tuple[str, str]]] = None,
+) -> Iterator[Tuple[str, int]]:
+    """Yield raw host:port pairs from every configured target source.
 
+    Service hints from a discover JSON input are collected into ``hints``.
+    """
+    if opts.input_path:
+        if not opts.input_path.exists():
+            raise RuntimeError(f"Input file not found: {opts.input_path}")
+        data = load_json(opts.input_path)
+        if hints is not None:
+            hints.update(_iter_service_hints(data))
+        yield from _iter_targets_from_discover(data)
+    if opts.targets:
+        if not opts.targets.exists():
+            raise RuntimeError(f"Targets file not found: {opts.targets}")
+        yield from _iter_targets_from_file(opts.targets)
+    if opts.hosts:
+        yield from _iter_targets_from_list(opts.hosts)
 
-def _collect_targets_from_file(
-    opts: FingerprintOptions, dedup: set[Tuple[str, int]]
-) -> None:
-    """Collect targets from targets file option."""
-    if not opts.targets:
-        return
-    if not opts.targets.exists():
-        raise RuntimeError(f"Targets file not found: {opts.targets}")
-    dedup.update(_iter_targets_from_file(opts.targets))
 
+def _load_exclusions(opts: FingerprintOptions) -> Optional[TargetPlan]:
+    """Load the exclusion plan; hostnames match by name, not resolution."""
+    if not opts.exclude:
+        return None
+    return build_target_plan(iter_target_file(opts.exclude), resolve=False)
 
-def _collect_targets_from_list(
-    opts: FingerprintOptions, dedup: set[Tuple[str, int]]
-) -> None:
-    """Collect targets from hosts list option."""
-    if opts.hosts:
-        dedup.update(_iter_targets_from_list(opts.hosts))
 
+def _encode_row(host: str, port: int) -> str:
+    """Encode a row so string order equals ``(host, port)`` order."""
+    return f"{host}\t{port:05d}"
 
-def _collect_target_rows(opts: FingerprintOptions) -> List[Tuple[str, int]]:
-    """Collect and deduplicate target rows from all sources."""
-    dedup: set[Tuple[str, int]] = set()
-    _collect_targets_from_input(opts, dedup)
-    _collect_targets_from_file(opts, dedup)
-    _collect_targets_from_list(opts, dedup)
-    return sorted(dedup)
 
+def _decode_row(line: str) -> Endpoint:
+    """Decode a row produced by ``_encode_row``."""
+    host, _, port = line.partition("\t")
+    return host, int(port)
 
-def _write_targets(path: Path, rows: Sequence[Tuple[str, int]]) -> None:
-    """Write target rows to file in host port format."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if not rows:
-        path.write_text("", encoding="utf-8")
-        return
-    with path.open("w", encoding="utf-8") as fh:
-        fh.writelines(f"{h} {p}\n" for h, p in rows)
+
+def _iter_target_rows(
+    opts: FingerprintOptions,
+    hints: Optional[Dict[Endpoint, Tuple[str, str]]] = None,
+    tmp_dir: Optional[Path] = None,
+) -> Iterator[Endpoint]:
+    """Stream normalised, deduplicated, non-excluded rows in sorted order.
+
+    Deduplication and sorting go through an external sort spilling under
+    ``tmp_dir``, so memory stays bounded by ``opts.sort_buffer`` rows
+    however large the inputs are.
+    """
+    exclusions = _load_exclusions(opts)
+    excluded = 0
+
+    def encoded() -> Iterator[str]:
+        nonlocal excluded
+        for host, port in _iter_input_targets(opts, hints):
+            host = normalise_host(host)
+            if exclusions is not None and exclusions.contains(host):
+                excluded += 1
+                continue
+            yield _encode_row(host, port)
+
+    for line in external_sort(
+        encoded(), buffer_lines=opts.sort_buffer, unique=True, tmp_dir=tmp_dir
+    ):
+        yield _decode_row(line)
+    if exclusions is not None:
+        LOG.info("Excluded %s target entries", excluded)
+
+
+def _sorted_membership(lines: Iterator[str]) -> Callable[[str], bool]:
+    """Test keys against a sorted line stream; keys must be asked in order."""
+    current = next(lines, None)
+
+    def contains(key: str) -> bool:
+        nonlocal current
+        while current is not None and current < key:
+            current = next(lines, None)
+        return current == key
+
+    return contains
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Support file building
+# Recon service reuse
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _parse_hosts_from_targets(targets_path: Path) -> Dict[str, set[int]]:
-    """Parse hosts and ports from targets file."""
-    hosts: Dict[str, set[int]] = defaultdict(set)
-    for line in iter_lines(targets_path):
+def _age_seconds(stamp: object, fallback: Path) -> float:
+    """Age of a recon summary from its timestamp, else from the file mtime."""
+    try:
+        generated = dt.datetime.strptime(str(stamp), "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return time.time() - fallback.stat().st_mtime
+    now = dt.datetime.now(tz.utc)
+    return (now - generated.replace(tzinfo=tz.utc)).total_seconds()
+
+
+def _locate_recon_nmap(
+    opts: FingerprintOptions,
+) -> Optional[Tuple[Path, Path, float]]:
+    """Return recon nmap XML/gnmap paths and their age for recon input."""
+    if not opts.input_path or opts.max_age <= 0:
+        return None
+    data = load_json(opts.input_path)
+    artifacts = data.get("artifacts") if isinstance(data, dict) else None
+    if not isinstance(artifacts, dict) or "nmap_xml" not in artifacts:
+        return None
+    base = opts.input_path.parent
+    xml_path = base / str(artifacts["nmap_xml"])
+    gnmap_path = base / str(artifacts.get("nmap_gnmap", "nmap.gnmap"))
+    source = xml_path if xml_path.exists() else gnmap_path
+    if not source.exists():
+        return None
+    return xml_path, gnmap_path, _age_seconds(data.get("generated_at"), source)
+
+
+def _import_recon_services(
+    opts: FingerprintOptions, run_dir: Path
+) -> Tuple[Optional[Path], Dict[str, object]]:
+    """Copy fresh recon nmap service data into the run.
+
+    Records are streamed to a JSON-lines file and the endpoints they cover
+    to a sorted rows file. Returns that file (None when nothing was
+    imported) and a reuse record for the summary; stale or missing recon
+    data imports nothing. Records for endpoints outside the final targets
+    are ignored when summarising.
+    """
+    located = _locate_recon_nmap(opts)
+    if located is None:
+        return None, {}
+    xml_path, gnmap_path, age = located
+    reuse: Dict[str, object] = {
+        "source": str(xml_path if xml_path.exists() else gnmap_path),
+        "age": int(age),
+        "max_age": opts.max_age,
+        "imported": 0,
+    }
+    if age > opts.max_age:
+        LOG.info("Recon service data is %ss old; rescanning", int(age))
+        reuse["stale"] = True
+        return None, reuse
+
+    def rows(fh: TextIO) -> Iterator[str]:
+        for host, port, fields in iter_nmap_results(xml_path, gnmap_path):
+            service = fields.get("service") or {}
+            if (
+                fields.get("state") == "open"
+                and isinstance(service, dict)
+                and service.get("name")
+            ):
+                host = normalise_host(host)
+                fh.write(json.dumps([host, port, fields]) + "\n")
+                yield _encode_row(host, port)
+
+    covered_path = run_dir / COVERED_FILENAME
+    count = 0
+    with (run_dir / NMAP_REUSED_FILENAME).open(
+        "w", encoding="utf-8"
+    ) as records_fh, covered_path.open("w", encoding="utf-8") as covered_fh:
+        for line in external_sort(
+            rows(records_fh),
+            buffer_lines=opts.sort_buffer,
+            unique=True,
+            tmp_dir=run_dir,
+        ):
+            covered_fh.write(f"{line}\n")
+            count += 1
+    LOG.info("Recon service data available for %s endpoints", count)
+    return covered_path, reuse
+
+
+def _iter_reused_services(
+    run_dir: Path,
+) -> Iterator[Tuple[str, int, Dict[str, object]]]:
+    """Iterate service records imported from recon into this run."""
+    for line in iter_lines(run_dir / NMAP_REUSED_FILENAME):
+        host, port, fields = json.loads(line)
+        yield host, int(port), fields
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Knowledge base
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _open_knowledge(runner: DockerRunner) -> sqlite3.Connection:
+    """Open the cross-run fingerprint knowledge base."""
+    return open_store(runner.paths.data / KNOWLEDGE_FILENAME, KNOWLEDGE_SCHEMA)
+
+
+def _signature_matches(
+    row: Optional[sqlite3.Row], signature: ServiceSignature, cutoff: float
+) -> bool:
+    """Return True when a stored entry is recent and has the same signature."""
+    return (
+        row is not None
+        and row["seen_at"] >= cutoff
+        and row["banner_hash"] is not None
+        and row["banner_hash"] == signature.banner_hash
+        and row["cert_fingerprint"] == signature.cert_fingerprint
+    )
+
+
+def _known_matcher(
+    conn: sqlite3.Connection, run_dir: Path, max_age: float
+) -> Callable[[List[Endpoint]], set[Endpoint]]:
+    """Build a batch matcher that reuses stored records of unchanged endpoints.
+
+    Matched records are appended to the run's known-records file and the
+    signatures of all other live endpoints to the signatures file, so the
+    summary can reuse the former and store the latter.
+    """
+
+    def match(batch: List[Endpoint]) -> set[Endpoint]:
+        signatures = signature_endpoints(batch)
+        cutoff = time.time() - max_age
+        matched: set[Endpoint] = set()
+        known_path = run_dir / KNOWN_RECORDS_FILENAME
+        signatures_path = run_dir / SIGNATURES_FILENAME
+        with known_path.open(
+            "a", encoding="utf-8"
+        ) as known_fh, signatures_path.open(
+            "a", encoding="utf-8"
+        ) as signatures_fh:
+            for host, port in batch:
+                signature = signatures.get((host, port))
+                if signature is None:
+                    continue
+                row = conn.execute(
+                    "SELECT seen_at, banner_hash, cert_fingerprint, record"
+                    " FROM services WHERE host = ? AND port = ?",
+                    (host, port),
+                ).fetchone()
+                if _signature_matches(row, signature, cutoff):
+                    matched.add((host, port))
+                    record = json.loads(row["record"])
+                    known_fh.write(json.dumps([host, port, record]) + "\n")
+                else:
+                    signatures_fh.write(
+                        f"{host} {port} {signature.banner_hash or '-'}"
+                        f" {signature.cert_fingerprint or '-'}\n"
+                    )
+        return matched
+
+    return match
+
+
+def _iter_known_records(
+    run_dir: Path,
+) -> Iterator[Tuple[str, int, Dict[str, object]]]:
+    """Iterate records reused from the knowledge base in this run."""
+    path = run_dir / KNOWN_RECORDS_FILENAME
+    if not path.exists():
+        return
+    for line in iter_lines(path):
+        host, port, record = json.loads(line)
+        yield host, int(port), record
+
+
+def _iter_signatures(
+    run_dir: Path,
+) -> Iterator[Tuple[str, int, Dict[str, object]]]:
+    """Iterate the signatures taken for endpoints scanned in this run."""
+    path = run_dir / SIGNATURES_FILENAME
+    if not path.exists():
+        return
+    for line in iter_lines(path):
         parts = line.split()
-        if len(parts) != 2:
-            continue
-        host, port_str = parts[0], parts[1]
-        port = safe_int(port_str)
-        if port is not None:
-            hosts[host].add(port)
-    return hosts
+        if len(parts) == 4:
+            host, port, banner, cert = parts
+            yield host, int(port), {
+                "banner_hash": "" if banner == "-" else banner,
+                "cert_fingerprint": "" if cert == "-" else cert,
+            }
+
+
+def _record_knowledge(
+    conn: sqlite3.Connection,
+    hosts: Iterable[Tuple[Dict[str, object], Dict[int, Dict[str, object]]]],
+) -> Iterator[Dict[str, object]]:
+    """Pass summary targets through, upserting their fresh endpoints.
+
+    Reused endpoints keep their original timestamp so they still expire;
+    endpoints scanned without a signature are stored unmatched until a
+    ``--reuse-known`` run records one. The upserts share one transaction
+    that commits once the summary is fully written.
+    """
+    now = time.time()
+    with conn:
+        for target, signatures in hosts:
+            conn.executemany(
+                "INSERT INTO services"
+                " (host, port, seen_at, banner_hash, cert_fingerprint, record)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (host, port) DO UPDATE SET"
+                " seen_at = excluded.seen_at,"
+                " banner_hash = excluded.banner_hash,"
+                " cert_fingerprint = excluded.cert_fingerprint,"
+                " record = excluded.record",
+                (
+                    (
+                        target["address"],
+                        entry["port"],
+                        now,
+                        signatures.get(entry["port"], {}).get("banner_hash"),
+                        signatures.get(entry["port"], {}).get(
+                            "cert_fingerprint"
+                        ),
+                        json.dumps(entry, sort_keys=True),
+                    )
+                    for entry in target["ports"]  # type: ignore[attr-defined]
+                    if "known" not in entry["sources"]
+                ),
+            )
+            yield target
 
 
-def _extract_all_ports(hosts: Dict[str, set[int]]) -> List[int]:
-    """Extract and sort all unique ports from hosts dictionary."""
-    return sorted({p for s in hosts.values() for p in s})
+# ──────────────────────────────────────────────────────────────────────────────
+# Endpoint routing
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _route_from_service(name: str, tunnel: str) -> Optional[ProbeResult]:
+    """Route from an nmap service name such as ``http`` or ``ssl|http``."""
+    parts = re.split(r"[|/]", name.strip().lower().rstrip("?"))
+    base = parts[-1]
+    if base in UNROUTABLE_SERVICE_NAMES:
+        return None
+    tls = tunnel == "ssl" or "ssl" in parts[:-1] or base in TLS_SERVICE_NAMES
+    return ProbeResult(tls=tls, http=base.startswith("http"))
+
+
+def _route_from_port(port: int) -> ProbeResult:
+    """Route by port number alone, as done before service detection."""
+    return ProbeResult(tls=port in _get_tls_ports(), http=True)
+
+
+def _route_endpoints(
+    rows: Sequence[Endpoint],
+    hints: Dict[Endpoint, Tuple[str, str]],
+    *,
+    probe: bool,
+) -> Tuple[Dict[Endpoint, ProbeResult], Dict[str, int]]:
+    """Decide which endpoints go to sslyze and httpx.
+
+    Service hints win; remaining endpoints are probed, or routed by port
+    number when probing is disabled or the probe got no answer.
+    """
+    routes: Dict[Endpoint, ProbeResult] = {}
+    pending: List[Endpoint] = []
+    for row in rows:
+        hint = hints.get(row)
+        route = _route_from_service(*hint) if hint else None
+        if route is None:
+            pending.append(row)
+        else:
+            routes[row] = route
+    stats = {"hinted": len(routes), "probed": 0, "port_based": 0}
+    if probe and pending:
+        LOG.info("Probing %s endpoints for TLS/HTTP", len(pending))
+        probed = probe_endpoints(pending)
+        pending = [row for row, result in probed.items() if not result.answered]
+        routes.update(
+            (row, result) for row, result in probed.items() if result.answered
+        )
+        stats["probed"] = len(probed) - len(pending)
+        if pending:
+            LOG.info(
+                "%s endpoints did not answer the probe; routing by port",
+                len(pending),
+            )
+    routes.update((row, _route_from_port(row[1])) for row in pending)
+    stats["port_based"] = len(pending)
+    stats["tls"] = sum(route.tls for route in routes.values())
+    stats["http"] = sum(route.http for route in routes.values())
+    return routes, stats
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Support file building
+# ──────────────────────────────────────────────────────────────────────────────
 
 
 def _get_tls_ports() -> set[int]:
@@ -222,69 +712,226 @@ def _get_tls_ports() -> set[int]:
     return {443, 465, 993, 995, 8443, 9443, 10443, 12443}
 
 
-def _write_nmap_hosts_file(
-    nmap_hosts: Path, hosts: Dict[str, set[int]]
-) -> None:
-    """Write sorted unique host IPs to nmap hosts file."""
-    with nmap_hosts.open("w", encoding="utf-8") as fh:
-        fh.writelines(f"{h}\n" for h in sorted(hosts))
-
-
 def _write_ports_file(ports_file: Path, all_ports: List[int]) -> None:
     """Write sorted port numbers to ports file."""
     with ports_file.open("w", encoding="utf-8") as fh:
         fh.writelines(f"{p}\n" for p in all_ports)
 
 
-def _write_tls_targets_file(
-    tls_targets: Path, hosts: Dict[str, set[int]]
-) -> None:
-    """Write TLS targets file with host:port pairs for TLS ports."""
-    tls_ports = _get_tls_ports()
-    with tls_targets.open("w", encoding="utf-8") as fh:
-        fh.writelines(
-            f"{h}:{p}\n"
-            for h, s in hosts.items()
-            for p in sorted(s)
-            if p in tls_ports
-        )
+def _iter_batches(
+    rows: Iterable[Endpoint], size: int
+) -> Iterator[List[Endpoint]]:
+    """Group a row stream into lists of at most ``size`` rows."""
+    batch: List[Endpoint] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
-def _write_http_targets_file(
-    http_targets: Path, hosts: Dict[str, set[int]]
-) -> None:
-    """Write HTTP targets file with all host:port pairs."""
-    with http_targets.open("w", encoding="utf-8") as fh:
-        fh.writelines(f"{h}:{p}\n" for h, s in hosts.items() for p in sorted(s))
-
-
-def _build_support_files(
-    targets_path: Path, run_dir: Path
+def _write_collected_targets(
+    rows: Iterable[Endpoint],
+    run_dir: Path,
+    hints: Dict[Endpoint, Tuple[str, str]],
+    covered: Optional[Path],
+    *,
+    probe: bool,
+    known: Optional[Callable[[List[Endpoint]], set[Endpoint]]] = None,
 ) -> Dict[str, object]:
-    """Build support files for nmap, TLS, and HTTP scanning."""
-    hosts = _parse_hosts_from_targets(targets_path)
+    """Write targets.txt and the nmap, TLS and HTTP support files in one pass.
+
+    ``rows`` must be sorted; endpoints are routed in batches so probing
+    never holds more than ``ROUTE_BATCH`` rows. Endpoints listed in the
+    sorted ``covered`` rows file already have service data and are left
+    out of the nmap files, checked by walking it alongside ``rows``; those
+    ``known`` reports as unchanged are left out of every tool. The
+    endpoints nmap scans are also listed in nmap-endpoints.txt, from which
+    shards are split.
+    """
     run_dir.mkdir(parents=True, exist_ok=True)
-
+    targets_path = run_dir / "targets.txt"
     nmap_hosts = run_dir / "nmap-hosts.txt"
-    ports_file = run_dir / "ports.txt"
+    nmap_endpoints = run_dir / NMAP_ENDPOINTS_FILENAME
     tls_targets = run_dir / "tls-targets.txt"
     http_targets = run_dir / "http-targets.txt"
 
-    all_ports = _extract_all_ports(hosts)
-    _write_nmap_hosts_file(nmap_hosts, hosts)
-    _write_ports_file(ports_file, all_ports)
-    _write_tls_targets_file(tls_targets, hosts)
-    _write_http_targets_file(http_targets, hosts)
-
+    is_covered = _sorted_membership(
+        iter_lines(covered) if covered is not None else iter(())
+    )
+    ports: set[int] = set()
+    routing: Dict[str, int] = defaultdict(int)
+    count = reused = matched = 0
+    last_nmap_host: Optional[str] = None
+    with ExitStack() as stack:
+        targets_fh, nmap_fh, endpoints_fh, tls_fh, http_fh = (
+            stack.enter_context(path.open("w", encoding="utf-8"))
+            for path in (
+                targets_path,
+                nmap_hosts,
+                nmap_endpoints,
+                tls_targets,
+                http_targets,
+            )
+        )
+        for batch in _iter_batches(rows, ROUTE_BATCH):
+            unchanged = known(batch) if known else set()
+            matched += len(unchanged)
+            scan = [row for row in batch if row not in unchanged]
+            routes, stats = _route_endpoints(scan, hints, probe=probe)
+            for key, value in stats.items():
+                routing[key] += value
+            for host, port in batch:
+                count += 1
+                targets_fh.write(f"{host} {port}\n")
+                if (host, port) in unchanged:
+                    continue
+                if is_covered(_encode_row(host, port)):
+                    reused += 1
+                else:
+                    ports.add(port)
+                    endpoints_fh.write(f"{host} {port}\n")
+                    if host != last_nmap_host:
+                        nmap_fh.write(f"{host}\n")
+                        last_nmap_host = host
+                route = routes[(host, port)]
+                if route.tls:
+                    tls_fh.write(f"{host}:{port}\n")
+                if route.http:
+                    http_fh.write(f"{host}:{port}\n")
+
+    all_ports = sorted(ports)
+    _write_ports_file(run_dir / "ports.txt", all_ports)
     return {
-        "hosts": hosts,
+        "count": count,
+        "reused": reused,
+        "known": matched,
         "ports": all_ports,
+        "routing": dict(routing),
+        "targets": targets_path,
         "nmap_targets": nmap_hosts,
         "tls_targets": tls_targets,
         "http_targets": http_targets,
     }
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Sharding
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _host_loads(run_dir: Path) -> Dict[str, int]:
+    """Count each host's entries across the routed nmap, TLS and HTTP inputs.
+
+    Endpoints left out of every tool (known unchanged) add no load.
+    """
+    loads: Dict[str, int] = defaultdict(int)
+    for line in iter_lines(run_dir / NMAP_ENDPOINTS_FILENAME):
+        loads[line.partition(" ")[0]] += 1
+    for name in ROUTED_TARGET_FILES:
+        for line in iter_lines(run_dir / name):
+            loads[line.rpartition(":")[0]] += 1
+    return loads
+
+
+def _partition_hosts(loads: Dict[str, int], count: int) -> Dict[str, int]:
+    """Assign hosts to ``count`` groups balanced by load.
+
+    Hosts are placed largest first onto the least loaded group (LPT), which
+    keeps the slowest shard within 4/3 of the optimum.
+    """
+    assignment: Dict[str, int] = {}
+    heap = [(0, index) for index in range(count)]
+    for host, load in sorted(
+        loads.items(), key=lambda item: (-item[1], item[0])
+    ):
+        total, index = heapq.heappop(heap)
+        assignment[host] = index
+        heapq.heappush(heap, (total + load, index))
+    return assignment
+
+
+def _write_shard_supports(
+    run_dir: Path, shard_dirs: Sequence[Path], assignment: Dict[str, int]
+) -> List[Dict[str, object]]:
+    """Split the routed run files into per-shard support files.
+
+    Each routed file is streamed once, so only the host assignment is held
+    in memory; endpoints left out of the run's nmap input stay out of every
+    shard's.
+    """
+    ports: List[set[int]] = [set() for _ in shard_dirs]
+    last_host: List[Optional[str]] = [None] * len(shard_dirs)
+    with ExitStack() as stack:
+
+        def open_shard_files(name: str) -> List[TextIO]:
+            return [
+                stack.enter_context(
+                    (shard_dir / name).open("w", encoding="utf-8")
+                )
+                for shard_dir in shard_dirs
+            ]
+
+        for shard_dir in shard_dirs:
+            shard_dir.mkdir(parents=True, exist_ok=True)
+        nmap_fhs = open_shard_files("nmap-hosts.txt")
+        for line in iter_lines(run_dir / NMAP_ENDPOINTS_FILENAME):
+            host, _, port = line.partition(" ")
+            index = assignment[host]
+            ports[index].add(int(port))
+            if host != last_host[index]:
+                nmap_fhs[index].write(f"{host}\n")
+                last_host[index] = host
+        for name in ROUTED_TARGET_FILES:
+            fhs = open_shard_files(name)
+            for line in iter_lines(run_dir / name):
+                fhs[assignment[line.rpartition(":")[0]]].write(f"{line}\n")
+
+    supports: List[Dict[str, object]] = []
+    for shard_dir, shard_ports in zip(shard_dirs, ports):
+        all_ports = sorted(shard_ports)
+        _write_ports_file(shard_dir / "ports.txt", all_ports)
+        supports.append(
+            {
+                "ports": all_ports,
+                "nmap_targets": shard_dir / "nmap-hosts.txt",
+                "tls_targets": shard_dir / "tls-targets.txt",
+                "http_targets": shard_dir / "http-targets.txt",
+            }
+        )
+    return supports
+
+
+def _shard_stage_name(shard: Optional[int], tool: str) -> str:
+    """Name a stage, prefixing the shard when sharding."""
+    return tool if shard is None else f"shard-{shard:02d}/{tool}"
+
+
+def _merge_sslyze_outputs(sources: Sequence[Path], destination: Path) -> None:
+    """Combine per-shard sslyze JSON documents into one."""
+    results: List[object] = []
+    for source in sources:
+        try:
+            data = load_json(source) if source.exists() else {}
+        except ValueError as exc:
+            LOG.warning("Skipping unreadable %s: %s", source, exc)
+            continue
+        results.extend(data.get("server_scan_results", []))
+    write_json(destination, {"server_scan_results": results})
+
+
+def _merge_shard_outputs(run_dir: Path, shard_dirs: Sequence[Path]) -> None:
+    """Merge per-shard tool outputs into the run directory."""
+    merge_nmap_xml([d / "nmap.xml" for d in shard_dirs], run_dir / "nmap.xml")
+    for name in ("nmap.gnmap", "nmap.txt", "httpx.json"):
+        concatenate_files([d / name for d in shard_dirs], run_dir / name)
+    _merge_sslyze_outputs(
+        [d / "sslyze.json" for d in shard_dirs], run_dir / "sslyze.json"
+    )
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Scan execution
 # ──────────────────────────────────────────────────────────────────────────────
@@ -296,6 +943,7 @@ def _run_nmap_scan(
     descriptor: str,
     port_list: str,
     env: Dict[str, str],
+    timeout: Optional[float] = None,
 ) -> None:
     """Run nmap service scan for fingerprinting."""
     LOG.info("nmap fingerprint %s", descriptor)
@@ -316,6 +964,7 @@ def _run_nmap_scan(
             f"/work/{run_rel}/nmap-hosts.txt",
         ],
         env,
+        timeout=timeout,
     )
 
 
@@ -325,6 +974,7 @@ def _run_sslyze_scan(
     run_rel: str,
     tls_targets: Path,
     env: Dict[str, str],
+    timeout: Optional[float] = None,
 ) -> None:
     """Run sslyze TLS scan if TLS targets exist."""
     if tls_targets.exists() and tls_targets.stat().st_size > 0:
@@ -339,6 +989,7 @@ def _run_sslyze_scan(
             ],
             env,
             check=False,
+            timeout=timeout,
         )
         if res.returncode != 0:
             LOG.warning("sslyze exited with code %s", res.returncode)
@@ -354,6 +1005,7 @@ def _run_httpx_scan(
     enable_http: bool,
     threads: int,
     env: Dict[str, str],
+    timeout: Optional[float] = None,
 ) -> None:
     """Run httpx HTTP scan if enabled or targets exist."""
     if enable_http or (
@@ -374,6 +1026,7 @@ def _run_httpx_scan(
             ],
             env,
             check=False,
+            timeout=timeout,
         )
         if res.returncode != 0:
             LOG.warning("httpx exited with code %s", res.returncode)
@@ -381,50 +1034,161 @@ def _run_httpx_scan(
         (run_dir / "httpx.json").write_text("", encoding="utf-8")
 
 
+def _stage_jobs(
+    runner: DockerRunner,
+    run_dir: Path,
+    support: Dict[str, object],
+    descriptor: str,
+    options: FingerprintOptions,
+    shard: Optional[int] = None,
+) -> Dict[str, Stage]:
+    """Build the nmap, sslyze and httpx stages for one support file set."""
+    run_rel = runner.relative_posix(run_dir)
+    env = {"RUN_DIR": f"/work/{run_rel}"}
+    nmap_hosts: Path = support["nmap_targets"]  # type: ignore[assignment]
+    ports: List[int] = support["ports"]  # type: ignore[assignment]
+    tls_targets: Path = support["tls_targets"]  # type: ignore[assignment]
+    http_targets: Path = support["http_targets"]  # type: ignore[assignment]
+    port_list = ",".join(map(str, ports)) if ports else "80,443"
+    label = descriptor if shard is None else f"{descriptor} shard {shard}"
+
+    jobs: Dict[str, Stage] = {
+        _shard_stage_name(shard, "sslyze"): lambda timeout: _run_sslyze_scan(
+            runner, run_dir, run_rel, tls_targets, env, timeout
+        ),
+        _shard_stage_name(shard, "httpx"): lambda timeout: _run_httpx_scan(
+            runner,
+            run_dir,
+            run_rel,
+            http_targets,
+            options.enable_http,
+            options.threads,
+            env,
+            timeout,
+        ),
+    }
+    if nmap_hosts.stat().st_size > 0:
+        jobs[_shard_stage_name(shard, "nmap")] = lambda timeout: _run_nmap_scan(
+            runner, run_rel, label, port_list, env, timeout
+        )
+    return jobs
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Summary building
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _seed_hosts_from_targets(
-    run_dir: Path, hosts_map: Dict[str, Dict[int, Dict[str, object]]]
-) -> None:
-    """Seed hosts map with entries from targets file."""
+def _encode_record(
+    host: str, port: int, source: str, seq: int, fields: object
+) -> str:
+    """Encode a summary record so string order is merge order."""
+    rank = SUMMARY_SOURCES.index(source)
+    return (
+        f"{_encode_row(host, port)}\t{rank}\t{seq:012d}\t{json.dumps(fields)}"
+    )
+
+
+def _iter_seed_records(run_dir: Path) -> Iterator[str]:
+    """Encode targets.txt, which is already in row order, as seed records."""
     for line in iter_lines(run_dir / "targets.txt"):
         parts = line.split()
         if len(parts) != 2:
             continue
-        host, port_str = parts[0], parts[1]
-        port = safe_int(port_str)
-        if port is None:
-            continue
-        entry = _ensure_entry(hosts_map, host, port, state="unknown")
-        entry.setdefault("service", {})
+        port = safe_int(parts[1])
+        if port is not None:
+            yield _encode_record(parts[0], port, "seed", 0, None)
 
 
-def _merge_scanner_results(
-    hosts_map: Dict[str, Dict[int, Dict[str, object]]],
-    scanner_iter: Iterator[Tuple[str, int, Dict[str, object]]],
-    source_name: str,
-) -> None:
-    """Merge scanner results into hosts map."""
-    for host, port, fields in scanner_iter:
-        entry = _ensure_entry(hosts_map, host, port)
-        entry.update({k: v for k, v in fields.items() if k not in {"src"}})
-        _add_source(entry, source_name)
+def _iter_scanner_records(run_dir: Path) -> Iterator[str]:
+    """Encode every reused, scanner and signature record of a run."""
+    sources = (
+        ("known", _iter_known_records(run_dir)),
+        ("reused", _iter_reused_services(run_dir)),
+        (
+            "nmap",
+            iter_nmap_results(run_dir / "nmap.xml", run_dir / "nmap.gnmap"),
+        ),
+        ("sslyze", iter_sslyze(run_dir / "sslyze.json")),
+        ("httpx", iter_httpx(run_dir / "httpx.json")),
+        ("signature", _iter_signatures(run_dir)),
+    )
+    for source, records in sources:
+        for seq, (host, port, fields) in enumerate(records):
+            yield _encode_record(host, port, source, seq, fields)
+
+
+def _iter_summary_records(
+    run_dir: Path, buffer_lines: int
+) -> Iterator[Tuple[str, int, str, Dict[str, object]]]:
+    """Stream all records of a run sorted by host, port and precedence.
+
+    The scanner outputs go through an external sort and are merged with
+    the already sorted targets, so memory stays bounded by ``buffer_lines``.
+    """
+    merged = heapq.merge(
+        _iter_seed_records(run_dir),
+        external_sort(
+            _iter_scanner_records(run_dir),
+            buffer_lines=buffer_lines,
+            tmp_dir=run_dir,
+        ),
+    )
+    for line in merged:
+        host, port, rank, _, fields = line.split("\t", 4)
+        yield host, int(port), SUMMARY_SOURCES[int(rank)], json.loads(fields)
 
 
-def _build_targets_list(
-    hosts_map: Dict[str, Dict[int, Dict[str, object]]],
-) -> List[Dict[str, object]]:
-    """Build sorted targets list from hosts map."""
-    return [
-        {
-            "address": host,
-            "ports": [entry for _, entry in sorted(ports.items())],
-        }
-        for host, ports in sorted(hosts_map.items())
-    ]
+def _apply_record(
+    entry: Optional[Dict[str, object]],
+    port: int,
+    source: str,
+    fields: Dict[str, object],
+) -> Optional[Dict[str, object]]:
+    """Fold one record into an endpoint entry, creating it when needed.
+
+    Reused recon data only enriches endpoints that were collected as
+    targets, so it never creates an entry.
+    """
+    if entry is None:
+        if source == "reused":
+            return None
+        entry = _new_entry(
+            port, state="unknown" if source == "seed" else "open"
+        )
+    if source == "known":
+        entry.update({k: v for k, v in fields.items() if k != "sources"})
+        for name in fields.get("sources", []):  # type: ignore[union-attr]
+            _add_source(entry, name)
+        _add_source(entry, "known")
+    elif source != "seed":
+        entry.update({k: v for k, v in fields.items() if k not in {"src"}})
+        _add_source(entry, "nmap" if source == "reused" else source)
+    return entry
+
+
+def _iter_summary_hosts(
+    run_dir: Path, buffer_lines: int
+) -> Iterator[Tuple[Dict[str, object], Dict[int, Dict[str, object]]]]:
+    """Yield each host's summary target with its endpoint signatures.
+
+    Only one host's records are held in memory at a time.
+    """
+    records = _iter_summary_records(run_dir, buffer_lines)
+    for host, host_records in groupby(records, key=itemgetter(0)):
+        ports: List[Dict[str, object]] = []
+        signatures: Dict[int, Dict[str, object]] = {}
+        for port, port_records in groupby(host_records, key=itemgetter(1)):
+            entry: Optional[Dict[str, object]] = None
+            for _, _, source, fields in port_records:
+                if source == "signature":
+                    signatures[port] = fields
+                else:
+                    entry = _apply_record(entry, port, source, fields)
+            if entry is not None:
+                ports.append(entry)
+        if ports:
+            yield {"address": host, "ports": ports}, signatures
 
 
 def _build_summary(
@@ -433,36 +1197,48 @@ def _build_summary(
     *,
     enable_http: bool,
     threads: int,
+    stages: Optional[Dict[str, Dict[str, object]]] = None,
+    routing: Optional[Dict[str, int]] = None,
+    reuse: Optional[Dict[str, object]] = None,
+    knowledge: Optional[sqlite3.Connection] = None,
+    buffer_lines: int = 1_000_000,
 ) -> Dict[str, object]:
-    """Build final summary JSON with all scanner results."""
-    hosts_map: Dict[str, Dict[int, Dict[str, object]]] = defaultdict(dict)
-
-    _seed_hosts_from_targets(run_dir, hosts_map)
-    _merge_scanner_results(
-        hosts_map, iter_gnmap(run_dir / "nmap.gnmap"), "nmap"
-    )
-    _merge_scanner_results(
-        hosts_map, iter_sslyze(run_dir / "sslyze.json"), "sslyze"
+    """Build final summary JSON with all scanner results.
+
+    ``targets`` is a lazy per-host iterator meant for ``write_json_stream``.
+    When ``knowledge`` is given, freshly scanned endpoints are recorded in
+    the knowledge base as the targets are written.
+    """
+    hosts = _iter_summary_hosts(run_dir, buffer_lines)
+    targets: Iterator[Dict[str, object]] = (
+        _record_knowledge(knowledge, hosts)
+        if knowledge is not None
+        else (target for target, _ in hosts)
     )
-    _merge_scanner_results(
-        hosts_map, iter_httpx(run_dir / "httpx.json"), "httpx"
-    )
-
-    targets = _build_targets_list(hosts_map)
+    artifacts = {
+        "nmap_gnmap": "nmap.gnmap",
+        "nmap_xml": "nmap.xml",
+        "nmap_text": "nmap.txt",
+        "sslyze_json": "sslyze.json",
+        "httpx_json": "httpx.json",
+    }
+    if reuse:
+        artifacts["nmap_reused"] = NMAP_REUSED_FILENAME
 
-    return {
+    summary: Dict[str, object] = {
         "descriptor": descriptor,
         "generated_at": utc_timestamp(),
         "targets": targets,
-        "artifacts": {
-            "nmap_gnmap": "nmap.gnmap",
-            "nmap_xml": "nmap.xml",
-            "nmap_text": "nmap.txt",
-            "sslyze_json": "sslyze.json",
-            "httpx_json": "httpx.json",
-        },
+        "artifacts": artifacts,
         "settings": {"http": bool(enable_http), "threads": int(threads)},
     }
+    if stages is not None:
+        summary["stages"] = stages
+    if routing is not None:
+        summary["routing"] = routing
+    if reuse:
+        summary["reuse"] = reuse
+    return summary
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -470,25 +1246,15 @@ def _build_summary(
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _ensure_entry(
-    hosts_map: Dict[str, Dict[int, Dict[str, object]]],
-    host: str,
-    port: int,
-    *,
-    state: str = "open",
-) -> Dict[str, object]:
-    """Ensure and return entry for host:port in hosts map."""
-    host_bucket = hosts_map.setdefault(host, {})
-    return host_bucket.setdefault(
-        port,
-        {
-            "port": port,
-            "state": state,
-            "protocol": "tcp",
-            "service": {},
-            "sources": [],
-        },
-    )
+def _new_entry(port: int, *, state: str = "open") -> Dict[str, object]:
+    """Return a fresh summary entry for a port."""
+    return {
+        "port": port,
+        "state": state,
+        "protocol": "tcp",
+        "service": {},
+        "sources": [],
+    }
 
 
 def _add_source(entry: Dict[str, object], name: str) -> None:
@@ -503,35 +1269,36 @@ def _add_source(entry: Dict[str, object], name: str) -> None:
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def run_fingerprint(options: FingerprintOptions, runner: DockerRunner) -> Path:
-    """Run fingerprint scan with nmap, sslyze, and httpx."""
-    desc = _descriptor(options)
-    key = CacheKey(
-        namespace="fingerprint",
-        components=(
-            "fingerprint",
-            desc,
-            f"http={int(options.enable_http)}",
-            f"threads={options.threads}",
+def _fingerprint_into(
+    options: FingerprintOptions,
+    runner: DockerRunner,
+    run_dir: Path,
+    desc: str,
+    key: CacheKey,
+    knowledge: sqlite3.Connection,
+) -> Path:
+    """Collect targets, run the tool stages and write the summary."""
+    covered, reuse = _import_recon_services(options, run_dir)
+    # Hints fill up while the external sort drains the inputs, which
+    # completes before the first sorted row reaches the writer.
+    hints: Dict[Endpoint, Tuple[str, str]] = {}
+    support = _write_collected_targets(
+        _iter_target_rows(options, hints, run_dir),
+        run_dir,
+        hints,
+        covered,
+        probe=options.probe,
+        known=(
+            _known_matcher(knowledge, run_dir, options.max_age)
+            if options.reuse_known
+            else None
         ),
     )
-
-    if not options.refresh:
-        cached_summary = _check_cache(runner, key)
-        if cached_summary:
-            return cached_summary
-
-    runner.ensure_image()
-    run_dir = runner.new_run_dir("fingerprint", desc)
-    run_rel = runner.relative_posix(run_dir)
-    env = {"RUN_DIR": f"/work/{run_rel}"}
-
-    targets_path = run_dir / "targets.txt"
-    rows = _collect_target_rows(options)
-    _write_targets(targets_path, rows)
+    if reuse:
+        reuse["imported"] = support["reused"]
 
     summary_path = run_dir / "fingerprint.json"
-    if not rows:
+    if not support["count"]:
         write_json(
             summary_path,
             _empty_summary(
@@ -541,40 +1308,67 @@ def run_fingerprint(options: FingerprintOptions, runner: DockerRunner) -> Path:
         runner.cache_store(key, run_dir, desc)
         return summary_path
 
-    support = _build_support_files(targets_path, run_dir)
-    nmap_hosts: Path = support["nmap_targets"]  # type: ignore[assignment]
-    ports: List[int] = support["ports"]  # type: ignore[assignment]
-
-    if not nmap_hosts.exists() or nmap_hosts.stat().st_size == 0:
-        write_json(
-            summary_path,
-            _empty_summary(
-                desc, enable_http=options.enable_http, threads=options.threads
-            ),
+    jobs: Dict[str, Stage] = {}
+    shard_dirs: List[Path] = []
+    if options.shards > 1:
+        loads = _host_loads(run_dir)
+        count = max(1, min(options.shards, len(loads)))
+        shard_dirs = [run_dir / f"shard-{index:02d}" for index in range(count)]
+        shard_supports = _write_shard_supports(
+            run_dir, shard_dirs, _partition_hosts(loads, count)
         )
-        runner.cache_store(key, run_dir, desc)
-        return summary_path
-
-    port_list = ",".join(map(str, ports)) if ports else "80,443"
-    _run_nmap_scan(runner, run_rel, desc, port_list, env)
-
-    tls_targets: Path = support["tls_targets"]  # type: ignore[assignment]
-    _run_sslyze_scan(runner, run_dir, run_rel, tls_targets, env)
+        for index, (shard_dir, shard_support) in enumerate(
+            zip(shard_dirs, shard_supports)
+        ):
+            jobs.update(
+                _stage_jobs(
+                    runner, shard_dir, shard_support, desc, options, index
+                )
+            )
+        LOG.info("Fingerprinting across %s shards", len(shard_dirs))
+    else:
+        jobs.update(_stage_jobs(runner, run_dir, support, desc, options))
+    stages = run_stages(jobs, options.timeout, options.tool_timeouts)
+    if shard_dirs:
+        _merge_shard_outputs(run_dir, shard_dirs)
+    complete = all(stage["status"] == "ok" for stage in stages.values())
 
-    http_targets: Path = support["http_targets"]  # type: ignore[assignment]
-    _run_httpx_scan(
-        runner,
+    summary = _build_summary(
         run_dir,
-        run_rel,
-        http_targets,
-        options.enable_http,
-        options.threads,
-        env,
+        desc,
+        enable_http=options.enable_http,
+        threads=options.threads,
+        stages=stages,
+        routing=support["routing"],  # type: ignore[arg-type]
+        reuse=reuse,
+        knowledge=knowledge if complete else None,
+        buffer_lines=options.sort_buffer,
     )
+    if options.reuse_known:
+        summary["known"] = {"matched": support["known"]}
+    write_json_stream(summary_path, summary)
+    if complete:
+        runner.cache_store(key, run_dir, desc)
+    else:
+        LOG.warning("Not caching %s: some stages did not complete", desc)
+    return summary_path
 
-    summary = _build_summary(
-        run_dir, desc, enable_http=options.enable_http, threads=options.threads
+
+def run_fingerprint(options: FingerprintOptions, runner: DockerRunner) -> Path:
+    """Run fingerprint scan with nmap, sslyze, and httpx."""
+    desc = _descriptor(options)
+    key = CacheKey(
+        namespace="fingerprint",
+        components=_cache_components(options, desc),
     )
-    write_json(summary_path, summary)
-    runner.cache_store(key, run_dir, desc)
-    return summary_path
+
+    if not options.refresh:
+        cached_summary = _check_cache(runner, key)
+        if cached_summary:
+            return cached_summary
+
+    runner.ensure_image()
+    run_dir = runner.new_run_dir("fingerprint", desc)
+
+    with closing(_open_knowledge(runner)) as knowledge:
+        return _fingerprint_into(options, runner, run_dir, desc, key, knowledge)
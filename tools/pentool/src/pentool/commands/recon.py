@@ -3,8 +3,8 @@
 This module performs fast network reconnaissance by orchestrating two complementary tools:
 
 - masscan: High-speed port scanner that rapidly sweeps large CIDR ranges or host lists
-  to identify open TCP ports. Uses a configurable scan rate and focuses on common
-  TCP ports (derived from nmap-services frequency data) for efficient discovery.
+  to identify open TCP ports. Uses a configurable scan rate and focuses on the top N
+  TCP ports ranked by nmap-services open frequency for efficient discovery.
   Outputs JSON results with discovered host:port combinations.
 
 - nmap: Service version detection scanner that performs detailed analysis on discovered
@@ -13,7 +13,10 @@ This module performs fast network reconnaissance by orchestrating two complement
   service information beyond simple port discovery.
 
 Targets can be specified as CIDR ranges (e.g., 192.168.1.0/24), single hosts, or
-target files containing host lists. The module processes masscan results, extracts
+target files containing CIDRs, address ranges and hostnames. Scope entries are
+resolved, merged and deduplicated, and an optional exclusion list is subtracted
+before masscan runs, so overlapping scope files never sweep the same address
+twice. The module processes masscan results, extracts
 unique hosts and ports, then runs nmap service detection on discovered ports to
 identify running services and versions.
 
@@ -23,47 +26,88 @@ names, versions, and banners. If no ports are discovered, the scan completes ear
 with a summary indicating no open ports were found.
 
 Supports result caching, configurable port count (top N common ports), and adjustable
-masscan scan rates for balancing speed against network impact. Generates multiple
-output formats (JSON summary, nmap XML/text/gnmap) for integration with other tools.
+masscan scan rates for balancing speed against network impact. The adaptive mode
+sweeps in chunks, re-probes a sample of already-open ports between chunks and
+raises or lowers the rate within configured bounds. The re-probe's answer rate
+is weighed against the chunk's response yield relative to earlier healthy
+chunks, so a sparse segment is not mistaken for packet loss. Adaptive chunks
+and re-probes wait for late replies before masscan exits.
+Generates multiple output formats (JSON summary, nmap XML/text/gnmap) for
+integration with other tools.
 """
 
 from __future__ import annotations
 
 import logging
+import random
+import shutil
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Tuple
 
 from pentool.commands import DiscoverOptions
-from pentool.common import check_cache, iter_lines, safe_int
-from pentool.constants import COMMON_TCP_PORTS
+from pentool.common import (
+    TargetPlan,
+    build_target_plan,
+    check_cache,
+    compress_ports,
+    concatenate_files,
+    iter_lines,
+    iter_target_entries,
+    iter_target_file,
+    load_port_ranks,
+    masscan_port_spec,
+    safe_int,
+    target_file_digest,
+    top_ports,
+)
+from pentool.constants import PORT_RANKS_NAME
 from pentool.docker_runner import DockerRunner
-from pentool.parsers import (
-    extract_ip_from_gnmap_line,
-    extract_ports_segment_from_gnmap,
-    parse_gnmap_port_block,
+from pentool.parsers import iter_nmap_results, merge_nmap_xml
+from pentool.utils import (
+    CacheKey,
+    load_json,
+    slugify,
+    utc_timestamp,
+    write_json,
 )
-from pentool.utils import CacheKey, load_json, utc_timestamp, write_json
 
 logger = logging.getLogger(__name__)
 
 PORT_FALLBACK_RANGE = "1-1024"
 
+# Service fields copied from nmap results onto recon port entries.
+NMAP_DETAIL_FIELDS = (
+    "banner",
+    "product",
+    "version",
+    "extrainfo",
+    "tunnel",
+    "cpe",
+)
 
-def _choose_port_seed(count: int) -> str:
-    """Choose a comma-separated seed of unique common ports or a safe fallback."""
+# Adaptive sweeps re-probe this many known-open endpoints between chunks.
+CALIBRATION_SAMPLE = 16
+CALIBRATION_BACKOFF_LOSS = 0.1
+CALIBRATION_TOLERATED_LOSS = 0.02
+# A chunk yielding under this share of the healthy-chunk yield counts as a drop.
+YIELD_DROP_RATIO = 0.5
+# Seconds each sweep chunk and calibration run keep listening after the last
+# probe is sent, so replies still in flight are not lost at chunk boundaries.
+SWEEP_WAIT = 3
+RATE_DECREASE = 0.5
+RATE_INCREASE = 1.25
+
+# nmap runs over batches of this many hosts so interrupted runs can resume.
+NMAP_BATCH_HOSTS = 256
+STATE_FILENAME = "recon-state.json"
+
+
+def _choose_port_seed(count: int, ranks_path: Optional[Path] = None) -> str:
+    """Choose a masscan port spec of the ``count`` most frequent TCP ports."""
     if count <= 0:
         return PORT_FALLBACK_RANGE
-    seen: set[int] = set()
-    picked: List[int] = []
-    for p in COMMON_TCP_PORTS:
-        if p not in seen:
-            seen.add(p)
-            picked.append(p)
-            if len(picked) == count:
-                break
-    if len(picked) != count:
-        return PORT_FALLBACK_RANGE
-    return ",".join(str(p) for p in picked)
+    ranked = top_ports(count, "tcp", load_port_ranks(ranks_path))
+    return masscan_port_spec(ranked)
 
 
 def _descriptor(options: DiscoverOptions) -> str:
@@ -76,32 +120,66 @@ def _descriptor(options: DiscoverOptions) -> str:
     return "recon"
 
 
-def _write_targets_from_file(run_dir: Path, targets_file: Path) -> None:
-    """Write target files from an existing targets file."""
-    if not targets_file.exists():
-        raise RuntimeError(f"Targets file not found: {targets_file}")
-    content = targets_file.read_text(encoding="utf-8")
-    (run_dir / "masscan-targets.txt").write_text(content, encoding="utf-8")
-    (run_dir / "source_targets.txt").write_text(content, encoding="utf-8")
+def _cache_components(
+    options: DiscoverOptions, descriptor: str
+) -> Tuple[str, ...]:
+    """Build cache key components; exclusions only key when present."""
+    components = [
+        "recon",
+        descriptor,
+        f"top={options.top_ports}",
+        f"rate={options.rate}",
+    ]
+    if options.exclude:
+        components.append(
+            f"exclude={options.exclude.name}"
+            f":{target_file_digest(options.exclude)}"
+        )
+    if options.adaptive:
+        components.append(
+            f"adaptive={options.min_rate}-{options.max_rate}"
+            f"/{options.chunk_size}"
+        )
+    return tuple(components)
 
 
-def _write_targets_from_value(run_dir: Path, value: str) -> None:
-    """Write target files from a CIDR or host value."""
-    line = f"{value}\n"
-    (run_dir / "masscan-targets.txt").write_text(line, encoding="utf-8")
-    (run_dir / "source_targets.txt").write_text(line, encoding="utf-8")
+def _iter_scope_entries(options: DiscoverOptions) -> Iterator[str]:
+    """Yield raw scope entries from the targets file or CIDR/host value."""
+    if options.targets:
+        return iter_target_file(options.targets)
+    value = (options.cidr or options.host or "").strip()
+    if not value:
+        raise RuntimeError("Provide CIDR, host, or targets file")
+    return iter_target_entries([value])
 
 
-def _prepare_targets(run_dir: Path, options: DiscoverOptions) -> None:
-    """Prepare target files for masscan from options."""
+def _write_source_targets(run_dir: Path, options: DiscoverOptions) -> None:
+    """Keep a verbatim copy of the requested scope for reference."""
+    source = run_dir / "source_targets.txt"
     if options.targets:
-        _write_targets_from_file(run_dir, options.targets)
+        if not options.targets.exists():
+            raise RuntimeError(f"Targets file not found: {options.targets}")
+        shutil.copyfile(options.targets, source)
         return
-
     value = (options.cidr or options.host or "").strip()
-    if not value:
-        raise RuntimeError("Provide CIDR, host, or targets file")
-    _write_targets_from_value(run_dir, value)
+    source.write_text(f"{value}\n", encoding="utf-8")
+
+
+def _prepare_targets(run_dir: Path, options: DiscoverOptions) -> TargetPlan:
+    """Plan merged, deduplicated masscan targets from options."""
+    _write_source_targets(run_dir, options)
+    excludes = iter_target_file(options.exclude) if options.exclude else ()
+    plan = build_target_plan(_iter_scope_entries(options), excludes)
+    plan.write(run_dir / "masscan-targets.txt")
+    write_json(run_dir / "target-plan.json", plan.describe())
+    if not plan.address_count:
+        raise RuntimeError("No scannable targets remain after exclusions")
+    logger.info(
+        "Planned %s addresses across %s ranges",
+        plan.address_count,
+        plan.describe()["ranges"],
+    )
+    return plan
 
 
 def _load_masscan_data(masscan_path: Path) -> List[Dict[str, object]]:
@@ -194,8 +272,30 @@ def _process_masscan_results(
     return hosts, port_values
 
 
+def _summary_settings(
+    options: DiscoverOptions,
+    trajectory: Optional[List[Dict[str, object]]],
+) -> Dict[str, object]:
+    """Build the settings block, including the adaptive rate trajectory."""
+    settings: Dict[str, object] = {
+        "top_ports": int(options.top_ports),
+        "max_rate": int(options.rate),
+    }
+    if options.adaptive:
+        settings["adaptive"] = {
+            "min_rate": int(options.min_rate),
+            "max_rate": int(options.max_rate),
+            "chunk_size": int(options.chunk_size),
+            "rate_trajectory": trajectory or [],
+        }
+    return settings
+
+
 def _build_summary_no_ports(
-    masscan_summary_path: Path, descriptor: str
+    masscan_summary_path: Path,
+    descriptor: str,
+    address_count: int,
+    settings: Dict[str, object],
 ) -> Dict[str, object]:
     data = load_json(masscan_summary_path) or {}
     hosts_list = [
@@ -207,10 +307,15 @@ def _build_summary_no_ports(
         "generated_at": utc_timestamp(),
         "hosts": hosts_list,
         "stats": {
+            "addresses": int(address_count),
             "hosts": len(hosts_list),
             "services": sum(len(h.get("ports", [])) for h in hosts_list),
         },
-        "artifacts": {"masscan_json": "masscan.json"},
+        "artifacts": {
+            "masscan_json": "masscan.json",
+            "target_plan": "target-plan.json",
+        },
+        "settings": settings,
         "notes": "No open TCP ports identified; nmap enrichment skipped.",
     }
 
@@ -232,18 +337,20 @@ def _find_existing_port_entry(
 
 
 def _create_port_detail(
-    port: int, protocol: str, state: str, service: str, banner: str
+    port: int, protocol: str, state: str, service: Dict[str, object]
 ) -> Dict[str, object]:
     """Create a port detail dictionary for nmap results."""
     detail = {
         "port": port,
         "protocol": protocol,
         "state": state,
-        "service": service,
+        "service": service.get("name", ""),
         "source": "nmap",
     }
-    if banner:
-        detail["banner"] = banner
+    for key in NMAP_DETAIL_FIELDS:
+        value = service.get(key)
+        if value:
+            detail[key] = value
     return detail
 
 
@@ -252,12 +359,11 @@ def _update_host_with_port(
     port: int,
     protocol: str,
     state: str,
-    service: str,
-    banner: str,
+    service: Dict[str, object],
 ) -> None:
     """Update or add a port entry to a host."""
     merged = _find_existing_port_entry(host, port, protocol)
-    detail = _create_port_detail(port, protocol, state, service, banner)
+    detail = _create_port_detail(port, protocol, state, service)
     if merged:
         merged.update(detail)
         merged["source"] = "masscan+nmap"
@@ -265,37 +371,20 @@ def _update_host_with_port(
         host["ports"].append(detail)
 
 
-def _process_gnmap_line(
-    line: str, hosts_map: Dict[str, Dict[str, object]]
-) -> None:
-    """Process a single gnmap line and update hosts map."""
-    if not line.startswith("Host: "):
-        return
-    ip = extract_ip_from_gnmap_line(line)
-    if not ip:
-        return
-    host = hosts_map.setdefault(ip, {"address": ip, "ports": []})
-    parts = line.split("\t")
-    ports_segment = extract_ports_segment_from_gnmap(parts)
-    if not ports_segment:
-        return
-    for block in ports_segment.split(","):
-        parsed = parse_gnmap_port_block(block)
-        if not parsed:
-            continue
-        port, state, protocol, service, banner = parsed
-        _update_host_with_port(host, port, protocol, state, service, banner)
-
-
-def _merge_gnmap_into_hosts(
+def _merge_nmap_into_hosts(
     run_dir: Path, hosts_map: Dict[str, Dict[str, object]]
 ) -> None:
-    """Update hosts_map in-place with nmap .gnmap details."""
-    gnmap_path = run_dir / "nmap.gnmap"
-    if not gnmap_path.exists():
-        return
-    for line in iter_lines(gnmap_path):
-        _process_gnmap_line(line, hosts_map)
+    """Update hosts_map in-place with nmap details, preferring XML output."""
+    results = iter_nmap_results(run_dir / "nmap.xml", run_dir / "nmap.gnmap")
+    for ip, port, fields in results:
+        host = hosts_map.setdefault(ip, {"address": ip, "ports": []})
+        _update_host_with_port(
+            host,
+            port,
+            str(fields.get("protocol", "tcp")),
+            str(fields.get("state", "")),
+            fields.get("service") or {},  # type: ignore[arg-type]
+        )
 
 
 def _load_hosts_from_masscan_summary(
@@ -335,12 +424,12 @@ def _build_summary(
     run_dir: Path,
     descriptor: str,
     *,
-    top_ports: int,
-    max_rate: int,
+    address_count: int,
+    settings: Dict[str, object],
 ) -> Dict[str, object]:
     """Build final summary JSON with masscan and nmap results."""
     hosts_map = _load_hosts_from_masscan_summary(run_dir)
-    _merge_gnmap_into_hosts(run_dir, hosts_map)
+    _merge_nmap_into_hosts(run_dir, hosts_map)
     hosts = _build_sorted_hosts_list(hosts_map)
 
     return {
@@ -348,17 +437,19 @@ def _build_summary(
         "generated_at": utc_timestamp(),
         "hosts": hosts,
         "stats": {
+            "addresses": int(address_count),
             "hosts": len(hosts),
             "services": sum(len(h["ports"]) for h in hosts),
         },
         "artifacts": {
+            "target_plan": "target-plan.json",
             "masscan_json": "masscan.json",
             "masscan_summary": "masscan-summary.json",
             "nmap_gnmap": "nmap.gnmap",
             "nmap_xml": "nmap.xml",
             "nmap_text": "nmap.txt",
         },
-        "settings": {"top_ports": int(top_ports), "max_rate": int(max_rate)},
+        "settings": settings,
     }
 
 
@@ -368,6 +459,11 @@ def _validate_options(options: DiscoverOptions) -> None:
         raise RuntimeError("Specify either --cidr or --host, not both")
     if not any([options.cidr, options.host, options.targets]):
         raise RuntimeError("Provide a CIDR, host, or target list")
+    if options.adaptive:
+        if not 0 < options.min_rate <= options.max_rate:
+            raise RuntimeError("Require 0 < --min-rate <= --max-rate")
+        if options.chunk_size <= 0:
+            raise RuntimeError("--chunk-size must be positive")
 
 
 def _check_cache(runner: DockerRunner, key: CacheKey) -> Optional[Path]:
@@ -383,30 +479,227 @@ def _run_masscan_scan(
     port_seed: str,
     rate: int,
     env: Dict[str, str],
+    *,
+    targets_name: str = "masscan-targets.txt",
+    output_name: str = "masscan.json",
+    wait: int = 0,
 ) -> None:
-    """Run masscan port scan."""
+    """Run masscan port scan, listening ``wait`` seconds after sending."""
     logger.info(
-        "masscan sweep %s (ports %s)", descriptor or "targets", port_seed
+        "masscan sweep %s (ports %s, rate %s)",
+        descriptor or "targets",
+        port_seed,
+        rate,
     )
     runner.run(
         [
             "masscan",
             "--wait",
-            "0",
+            str(wait),
             "--open",
             "--rate",
             str(rate),
             "--ports",
             port_seed,
             "-oJ",
-            f"/work/{run_rel}/masscan.json",
+            f"/work/{run_rel}/{output_name}",
             "-iL",
-            f"/work/{run_rel}/masscan-targets.txt",
+            f"/work/{run_rel}/{targets_name}",
         ],
         env,
     )
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Adaptive sweep
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _iter_open_endpoints(
+    entries: List[Dict[str, object]],
+) -> Iterator[Tuple[str, int]]:
+    """Yield open TCP (ip, port) pairs from masscan entries."""
+    for entry in entries:
+        ip = _extract_ip_from_entry(entry)
+        if not ip:
+            continue
+        for p in entry.get("ports", []):
+            port = safe_int(p.get("port"))
+            if port is not None and _is_valid_tcp_port(p):
+                yield str(ip), port
+
+
+def _clamp_rate(rate: float, options: DiscoverOptions) -> int:
+    """Clamp a rate to the configured adaptive bounds."""
+    return int(max(options.min_rate, min(options.max_rate, rate)))
+
+
+def _reference_yield(trajectory: List[Dict[str, object]]) -> Optional[float]:
+    """Return the mean yield of chunks whose re-probe showed no real loss."""
+    healthy: List[float] = []
+    for entry in trajectory:
+        loss = entry.get("calibration_loss")
+        if loss is not None and float(loss) <= CALIBRATION_TOLERATED_LOSS:
+            healthy.append(float(entry["yield"]))  # type: ignore[arg-type]
+    return sum(healthy) / len(healthy) if healthy else None
+
+
+def _next_rate(
+    rate: int,
+    loss: Optional[float],
+    yield_ratio: Optional[float],
+    options: DiscoverOptions,
+) -> int:
+    """Adjust the rate from the re-probe loss and the chunk's relative yield.
+
+    The rate is halved only when the re-probe lost responses and the chunk
+    yield also dropped below the healthy reference (or none exists yet); a
+    lossy re-probe alongside a steady yield is treated as sampling noise. A
+    clean re-probe raises the rate even if the yield fell: the link keeps
+    up, so the segment is just sparser.
+    """
+    if loss is None:
+        return rate
+    if loss > CALIBRATION_BACKOFF_LOSS:
+        if yield_ratio is None or yield_ratio < YIELD_DROP_RATIO:
+            return _clamp_rate(rate * RATE_DECREASE, options)
+        return rate
+    if loss <= CALIBRATION_TOLERATED_LOSS:
+        return _clamp_rate(rate * RATE_INCREASE, options)
+    return rate
+
+
+def _run_calibration(
+    runner: DockerRunner,
+    run_dir: Path,
+    run_rel: str,
+    index: int,
+    known: List[Tuple[str, int]],
+    rate: int,
+    env: Dict[str, str],
+) -> Tuple[int, Optional[float]]:
+    """Re-probe a sample of known-open endpoints and return (size, loss)."""
+    if not known:
+        return 0, None
+    sample = random.sample(known, min(CALIBRATION_SAMPLE, len(known)))
+    targets_name = f"masscan-calibrate-{index:04d}.txt"
+    output_name = f"masscan-calibrate-{index:04d}.json"
+    hosts = sorted({ip for ip, _ in sample})
+    (run_dir / targets_name).write_text(
+        "".join(f"{ip}\n" for ip in hosts), encoding="utf-8"
+    )
+    _run_masscan_scan(
+        runner,
+        run_dir,
+        run_rel,
+        "calibration",
+        compress_ports(port for _, port in sample),
+        rate,
+        env,
+        targets_name=targets_name,
+        output_name=output_name,
+        wait=SWEEP_WAIT,
+    )
+    seen = set(_iter_open_endpoints(_load_masscan_data(run_dir / output_name)))
+    answered = sum(1 for endpoint in sample if endpoint in seen)
+    return len(sample), 1.0 - answered / len(sample)
+
+
+def _run_sweep(
+    runner: DockerRunner,
+    run_dir: Path,
+    run_rel: str,
+    descriptor: str,
+    plan: TargetPlan,
+    port_seed: str,
+    options: DiscoverOptions,
+    env: Dict[str, str],
+    state: Dict[str, object],
+) -> Optional[List[Dict[str, object]]]:
+    """Sweep the plan chunk by chunk, checkpointing after every chunk.
+
+    Chunks already recorded in ``state`` are skipped, so a resumed run
+    continues where the interrupted one stopped. In adaptive mode the rate
+    is tuned between chunks and its trajectory is returned.
+    """
+    chunk_size = int(state["chunk_size"])  # type: ignore[arg-type]
+    done = int(state.get("chunks_done", 0))  # type: ignore[arg-type]
+    rate = int(state.get("rate", options.rate))  # type: ignore[arg-type]
+    trajectory: List[Dict[str, object]] = list(
+        state.get("trajectory", [])  # type: ignore[arg-type]
+    )
+    known: List[Tuple[str, int]] = []
+    outputs: List[Path] = []
+    for index, (ranges, addresses) in enumerate(plan.iter_shards(chunk_size)):
+        output_name = f"masscan-{index:04d}.json"
+        outputs.append(run_dir / output_name)
+        if index < done:
+            if options.adaptive:
+                known.extend(
+                    _iter_open_endpoints(_load_masscan_data(outputs[-1]))
+                )
+            continue
+        targets_name = f"masscan-targets-{index:04d}.txt"
+        (run_dir / targets_name).write_text(
+            "".join(f"{line}\n" for line in ranges), encoding="utf-8"
+        )
+        _run_masscan_scan(
+            runner,
+            run_dir,
+            run_rel,
+            f"{descriptor} chunk {index}",
+            port_seed,
+            rate,
+            env,
+            targets_name=targets_name,
+            output_name=output_name,
+            wait=SWEEP_WAIT,
+        )
+        if options.adaptive:
+            found = list(_iter_open_endpoints(_load_masscan_data(outputs[-1])))
+            sampled, loss = _run_calibration(
+                runner, run_dir, run_rel, index, known, rate, env
+            )
+            known.extend(found)
+            chunk_yield = len(found) / addresses if addresses else 0.0
+            reference = _reference_yield(trajectory)
+            yield_ratio = chunk_yield / reference if reference else None
+            next_rate = _next_rate(rate, loss, yield_ratio, options)
+            trajectory.append(
+                {
+                    "chunk": index,
+                    "rate": rate,
+                    "addresses": addresses,
+                    "open": len(found),
+                    "yield": chunk_yield,
+                    "yield_ratio": yield_ratio,
+                    "calibration_sample": sampled,
+                    "calibration_loss": loss,
+                    "next_rate": next_rate,
+                }
+            )
+            if next_rate != rate:
+                logger.info(
+                    "masscan rate %s -> %s (loss %.2f, yield ratio %s)",
+                    rate,
+                    next_rate,
+                    loss,
+                    "n/a" if yield_ratio is None else f"{yield_ratio:.2f}",
+                )
+            rate = next_rate
+        state.update(chunks_done=index + 1, rate=rate, trajectory=trajectory)
+        _save_state(run_dir, state)
+
+    entries: List[Dict[str, object]] = []
+    for output in outputs:
+        entries.extend(_load_masscan_data(output))
+    write_json(run_dir / "masscan.json", entries)
+    if not options.adaptive:
+        return None
+    write_json(run_dir / "rate-trajectory.json", trajectory)
+    return trajectory
+
+
 def _run_nmap_scan(
     runner: DockerRunner,
     run_dir: Path,
@@ -414,6 +707,9 @@ def _run_nmap_scan(
     descriptor: str,
     port_list: str,
     env: Dict[str, str],
+    *,
+    targets_name: str = "nmap-targets.txt",
+    output_stem: str = "nmap",
 ) -> None:
     """Run nmap service scan on discovered ports."""
     logger.info("nmap enrichment %s", descriptor or "targets")
@@ -425,18 +721,136 @@ def _run_nmap_scan(
             "-p",
             port_list,
             "-oG",
-            f"/work/{run_rel}/nmap.gnmap",
+            f"/work/{run_rel}/{output_stem}.gnmap",
             "-oX",
-            f"/work/{run_rel}/nmap.xml",
+            f"/work/{run_rel}/{output_stem}.xml",
             "-oN",
-            f"/work/{run_rel}/nmap.txt",
+            f"/work/{run_rel}/{output_stem}.txt",
             "-iL",
-            f"/work/{run_rel}/nmap-targets.txt",
+            f"/work/{run_rel}/{targets_name}",
         ],
         env,
     )
 
 
+def _run_nmap_batches(
+    runner: DockerRunner,
+    run_dir: Path,
+    run_rel: str,
+    descriptor: str,
+    port_list: str,
+    env: Dict[str, str],
+    state: Dict[str, object],
+) -> None:
+    """Run nmap over host batches, checkpointing after every batch."""
+    hosts = list(iter_lines(run_dir / "nmap-targets.txt"))
+    done = int(state.get("nmap_batches_done", 0))  # type: ignore[arg-type]
+    stems: List[str] = []
+    for index, start in enumerate(range(0, len(hosts), NMAP_BATCH_HOSTS)):
+        stem = f"nmap-{index:04d}"
+        stems.append(stem)
+        if index < done:
+            continue
+        targets_name = f"nmap-targets-{index:04d}.txt"
+        batch = hosts[start : start + NMAP_BATCH_HOSTS]
+        (run_dir / targets_name).write_text(
+            "".join(f"{host}\n" for host in batch), encoding="utf-8"
+        )
+        _run_nmap_scan(
+            runner,
+            run_dir,
+            run_rel,
+            f"{descriptor} batch {index}",
+            port_list,
+            env,
+            targets_name=targets_name,
+            output_stem=stem,
+        )
+        state["nmap_batches_done"] = index + 1
+        _save_state(run_dir, state)
+
+    merge_nmap_xml(
+        [run_dir / f"{stem}.xml" for stem in stems], run_dir / "nmap.xml"
+    )
+    for suffix in ("gnmap", "txt"):
+        concatenate_files(
+            [run_dir / f"{stem}.{suffix}" for stem in stems],
+            run_dir / f"nmap.{suffix}",
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Checkpoints
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _load_state(run_dir: Path) -> Dict[str, object]:
+    """Load the recon checkpoint of a run directory."""
+    return load_json(run_dir / STATE_FILENAME) or {}
+
+
+def _save_state(run_dir: Path, state: Dict[str, object]) -> None:
+    """Persist the recon checkpoint of a run directory."""
+    write_json(run_dir / STATE_FILENAME, state)
+
+
+def _find_incomplete_run(
+    runner: DockerRunner, descriptor: str, digest: str
+) -> Optional[Path]:
+    """Return the newest unfinished run directory for the same cache key."""
+    pattern = f"*-recon-{slugify(descriptor)}"
+    for run_dir in sorted(runner.paths.runs.glob(pattern), reverse=True):
+        state = _load_state(run_dir)
+        if state.get("key") == digest and not state.get("complete"):
+            return run_dir
+    return None
+
+
+def _start_run(
+    runner: DockerRunner,
+    options: DiscoverOptions,
+    descriptor: str,
+    digest: str,
+) -> Tuple[Path, TargetPlan, Dict[str, object]]:
+    """Create a run directory, or reopen an interrupted one on ``--resume``."""
+    incomplete = _find_incomplete_run(runner, descriptor, digest)
+    if incomplete and options.resume:
+        logger.info("Resuming interrupted recon in %s", incomplete)
+        state = _load_state(incomplete)
+        plan = build_target_plan(
+            iter_target_file(incomplete / "masscan-targets.txt"),
+            resolve=False,
+        )
+        return incomplete, plan, state
+    if incomplete:
+        logger.info(
+            "Interrupted recon found in %s; pass --resume to continue it",
+            incomplete,
+        )
+
+    run_dir = runner.new_run_dir("recon", descriptor)
+    plan = _prepare_targets(run_dir, options)
+    rate = options.rate
+    if options.adaptive:
+        rate = _clamp_rate(rate, options)
+    state: Dict[str, object] = {
+        "key": digest,
+        "complete": False,
+        "chunk_size": options.chunk_size,
+        "chunks_done": 0,
+        "rate": rate,
+        "trajectory": [],
+        "nmap_batches_done": 0,
+    }
+    _save_state(run_dir, state)
+    return run_dir, plan, state
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Entry point
+# ──────────────────────────────────────────────────────────────────────────────
+
+
 def run_recon(options: DiscoverOptions, runner: DockerRunner) -> Path:
     """Run reconnaissance scan with masscan and nmap."""
     _validate_options(options)
@@ -444,12 +858,7 @@ def run_recon(options: DiscoverOptions, runner: DockerRunner) -> Path:
     descriptor = _descriptor(options)
     key = CacheKey(
         namespace="recon",
-        components=(
-            "recon",
-            descriptor,
-            f"top={options.top_ports}",
-            f"rate={options.rate}",
-        ),
+        components=_cache_components(options, descriptor),
     )
 
     if not options.refresh:
@@ -458,16 +867,25 @@ def run_recon(options: DiscoverOptions, runner: DockerRunner) -> Path:
             return cached_summary
 
     runner.ensure_image()
-    run_dir = runner.new_run_dir("recon", descriptor)
+    run_dir, plan, state = _start_run(runner, options, descriptor, key.render())
     run_rel = runner.relative_posix(run_dir)
     env = {"RUN_DIR": f"/work/{run_rel}"}
 
-    _prepare_targets(run_dir, options)
-
-    port_seed = _choose_port_seed(options.top_ports)
-    _run_masscan_scan(
-        runner, run_dir, run_rel, descriptor, port_seed, options.rate, env
+    port_seed = _choose_port_seed(
+        options.top_ports, runner.paths.data / PORT_RANKS_NAME
     )
+    trajectory = _run_sweep(
+        runner,
+        run_dir,
+        run_rel,
+        descriptor,
+        plan,
+        port_seed,
+        options,
+        env,
+        state,
+    )
+    settings = _summary_settings(options, trajectory)
 
     masscan_json = run_dir / "masscan.json"
     masscan_summary = run_dir / "masscan-summary.json"
@@ -480,17 +898,25 @@ def run_recon(options: DiscoverOptions, runner: DockerRunner) -> Path:
     summary_path = run_dir / "recon.json"
     if not port_values:
         write_json(
-            summary_path, _build_summary_no_ports(masscan_summary, descriptor)
+            summary_path,
+            _build_summary_no_ports(
+                masscan_summary, descriptor, plan.address_count, settings
+            ),
         )
-        runner.cache_store(key, run_dir, descriptor)
-        return summary_path
-
-    port_list = ",".join(str(p) for p in port_values) or PORT_FALLBACK_RANGE
-    _run_nmap_scan(runner, run_dir, run_rel, descriptor, port_list, env)
+    else:
+        port_list = compress_ports(port_values) or PORT_FALLBACK_RANGE
+        _run_nmap_batches(
+            runner, run_dir, run_rel, descriptor, port_list, env, state
+        )
+        summary = _build_summary(
+            run_dir,
+            descriptor,
+            address_count=plan.address_count,
+            settings=settings,
+        )
+        write_json(summary_path, summary)
 
-    summary = _build_summary(
-        run_dir, descriptor, top_ports=options.top_ports, max_rate=options.rate
-    )
-    write_json(summary_path, summary)
+    state["complete"] = True
+    _save_state(run_dir, state)
     runner.cache_store(key, run_dir, descriptor)
     return summary_path
@@ -17,31 +17,104 @@ into consolidated reports. The module generates both JSON summary reports for
 human review and SARIF (Static Analysis Results Interchange Format) output for
 integration with CI/CD pipelines and security analysis platforms.
 
+The four tools write separate artifacts, so they run concurrently, each with
+its own timeout (nikto, sslyze, zap and sqlmap for ``--tool-timeout``). A tool
+that fails or times out keeps whatever it wrote, its partial output is still
+parsed for findings, and its status is recorded in scan.json.
+
+Batch mode (``--urls-file``) scans many URLs in one run. Instead of one
+``zap-baseline.py`` JVM per target, a single ZAP daemon container is started
+and driven through its local API: each target gets a fresh session, a spider
+run and the passive scan, and its alerts are written in the baseline report
+layout to the target's zap.json. nikto, sslyze and sqlmap run per target
+within a concurrency budget alongside it, every target gets its own scan.json
+and scan.sarif, and a batch.json index lists them. The daemon is stopped at
+the end; batch runs are not cached.
+
+Each finding carries a fingerprint over its normalised source, title,
+location and CWE. Findings are deduplicated by it and recorded in a findings
+store under the data directory, keyed by URL and profile, so scan.json marks
+every finding new, unchanged or resolved relative to the previous scan of
+that target, and SARIF results carry the same state as ``baselineState``.
+Open findings are only resolved by a tool that completed this time.
+
 Supports result caching to avoid redundant scans and configurable scan profiles
-(basic/extended) that adjust tool aggressiveness and coverage depth.
+(basic/extended) that adjust tool aggressiveness and coverage depth. Runs with
+an incomplete tool are not cached.
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import re
+import secrets
+import socket
+import sqlite3
+import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from itertools import chain
 from pathlib import Path
-from typing import Iterable, Iterator, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from pentool.commands import ScanOptions
-from pentool.common import check_cache
-from pentool.docker_runner import DockerRunner
+from pentool.common import (
+    Stage,
+    ZapClient,
+    check_cache,
+    iter_lines,
+    open_store,
+    run_stages,
+    stage_timeout,
+    wait_for_zap,
+    zap_baseline_scan,
+)
+from pentool.docker_runner import ContainerTimeout, DockerRunner
 from pentool.models import (
+    NIKTO_FINDINGS,
     Finding,
-    NiktoFindingModel,
     SslyzeOutputModel,
     ZapBaselineModel,
 )
-from pentool.utils import CacheKey, load_json, utc_timestamp, write_json
+from pentool.utils import (
+    CacheKey,
+    load_json,
+    slugify,
+    utc_timestamp,
+    write_json,
+)
 
 logger = logging.getLogger(__name__)
 
+SCAN_TOOLS = ("nikto", "sslyze", "zap", "sqlmap")
+ZAP_DIR = "/usr/share/zaproxy"
+# Spider time per target in minutes, for the baseline script and the daemon.
+ZAP_SPIDER_MINUTES = 10
+SQLMAP_LOG_PREFIX = re.compile(r"^(\[[\d:]+\]\s*)?\[[A-Z]+\]\s*")
+
+FINDINGS_FILENAME = "scan-findings.sqlite"
+SARIF_BASELINE_STATES = {
+    "new": "new",
+    "unchanged": "unchanged",
+    "resolved": "absent",
+}
+# Open findings have no resolved_at; the store keeps one row per target
+# (URL and profile) and fingerprint.
+FINDINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    target TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    resolved_at REAL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (target, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS findings_open ON findings (target, resolved_at);
+"""
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Setup and initialization
@@ -136,11 +209,11 @@ def _zap_command(run_rel: str, url: str) -> List[str]:
     """Build OWASP ZAP baseline command."""
     return [
         "python3",
-        "/usr/share/zaproxy/zap-baseline.py",
+        f"{ZAP_DIR}/zap-baseline.py",
         "-t",
         url,
         "-m",
-        "10",
+        str(ZAP_SPIDER_MINUTES),
         "-J",
         f"/work/{run_rel}/zap.json",
         "-r",
@@ -150,6 +223,38 @@ def _zap_command(run_rel: str, url: str) -> List[str]:
     ]
 
 
+def _zap_daemon_command(
+    port: int, api_key: str, host_network: bool
+) -> List[str]:
+    """Build the command that runs ZAP as an API-driven daemon.
+
+    Without host networking the API listens on every container interface
+    and accepts the Docker gateway address the published port comes from.
+    """
+    command = [
+        f"{ZAP_DIR}/zap.sh",
+        "-daemon",
+        "-host",
+        "127.0.0.1" if host_network else "0.0.0.0",
+        "-port",
+        str(port),
+        "-config",
+        f"api.key={api_key}",
+        "-config",
+        f"spider.maxDuration={ZAP_SPIDER_MINUTES}",
+    ]
+    if not host_network:
+        command.extend(
+            [
+                "-config",
+                "api.addrs.addr.name=.*",
+                "-config",
+                "api.addrs.addr.regex=true",
+            ]
+        )
+    return command
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Scan execution
 # ──────────────────────────────────────────────────────────────────────────────
@@ -162,11 +267,16 @@ def _run_tool(
     description: str,
     *,
     capture_output: bool = False,
+    timeout: Optional[float] = None,
 ) -> Optional[str]:
     """Run a scan tool and return output if requested."""
     logger.info(description)
     result = runner.run(
-        command, env, check=False, capture_output=capture_output
+        command,
+        env,
+        check=False,
+        capture_output=capture_output,
+        timeout=timeout,
     )
     if result.returncode != 0:
         logger.warning("%s exited with code %s", command[0], result.returncode)
@@ -179,31 +289,44 @@ def _is_https_url(url: str) -> bool:
 
 
 def _run_nikto_scan(
-    runner: DockerRunner, run_rel: str, url: str, env: dict
+    runner: DockerRunner,
+    run_rel: str,
+    url: str,
+    env: dict,
+    timeout: Optional[float] = None,
 ) -> None:
     """Run nikto baseline scan."""
     command = _nikto_command(run_rel, url)
-    _run_tool(runner, command, env, f"nikto baseline {url}")
+    _run_tool(runner, command, env, f"nikto baseline {url}", timeout=timeout)
 
 
 def _run_sslyze_scan(
-    runner: DockerRunner, run_dir: Path, run_rel: str, url: str, env: dict
+    runner: DockerRunner,
+    run_dir: Path,
+    run_rel: str,
+    url: str,
+    env: dict,
+    timeout: Optional[float] = None,
 ) -> None:
     """Run sslyze TLS scan if URL is HTTPS."""
     sslyze_path = run_dir / "sslyze.json"
     if _is_https_url(url):
         command = _sslyze_command(run_rel, url)
-        _run_tool(runner, command, env, "sslyze TLS audit")
+        _run_tool(runner, command, env, "sslyze TLS audit", timeout=timeout)
     else:
         sslyze_path.write_text("{}\n", encoding="utf-8")
 
 
 def _run_zap_scan(
-    runner: DockerRunner, run_rel: str, url: str, env: dict
+    runner: DockerRunner,
+    run_rel: str,
+    url: str,
+    env: dict,
+    timeout: Optional[float] = None,
 ) -> None:
     """Run OWASP ZAP baseline scan."""
     command = _zap_command(run_rel, url)
-    _run_tool(runner, command, env, "OWASP ZAP baseline")
+    _run_tool(runner, command, env, "OWASP ZAP baseline", timeout=timeout)
 
 
 def _run_sqlmap_scan(
@@ -213,17 +336,133 @@ def _run_sqlmap_scan(
     url: str,
     profile: str,
     env: dict,
+    timeout: Optional[float] = None,
 ) -> None:
-    """Run sqlmap audit and save output."""
+    """Run sqlmap audit and save output, including partial output."""
     command = _sqlmap_command(run_rel, url, profile)
-    sqlmap_output = _run_tool(
-        runner, command, env, "sqlmap audit", capture_output=True
-    )
     sqlmap_log = run_dir / "sqlmap.log"
     sqlmap_log.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        sqlmap_output = _run_tool(
+            runner,
+            command,
+            env,
+            "sqlmap audit",
+            capture_output=True,
+            timeout=timeout,
+        )
+    except ContainerTimeout as exc:
+        sqlmap_log.write_text(exc.output, encoding="utf-8")
+        raise
     sqlmap_log.write_text(sqlmap_output or "", encoding="utf-8")
 
 
+def _scan_jobs(
+    runner: DockerRunner,
+    run_dir: Path,
+    url: str,
+    profile: str,
+    *,
+    zap: bool = True,
+) -> Dict[str, Stage]:
+    """Build the tool stages for one target; each writes its own artifacts.
+
+    With ``zap`` unset the ZAP baseline is left to a shared daemon.
+    """
+    run_rel = runner.relative_posix(run_dir)
+    env = {"RUN_DIR": f"/work/{run_rel}"}
+    jobs: Dict[str, Stage] = {
+        "nikto": lambda timeout: _run_nikto_scan(
+            runner, run_rel, url, env, timeout
+        ),
+        "sslyze": lambda timeout: _run_sslyze_scan(
+            runner, run_dir, run_rel, url, env, timeout
+        ),
+        "zap": lambda timeout: _run_zap_scan(
+            runner, run_rel, url, env, timeout
+        ),
+        "sqlmap": lambda timeout: _run_sqlmap_scan(
+            runner, run_dir, run_rel, url, profile, env, timeout
+        ),
+    }
+    if not zap:
+        del jobs["zap"]
+    return jobs
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Shared ZAP daemon
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _free_port() -> int:
+    """Pick a free local port for the daemon API (host networking)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _zap_daemon_target(
+    client: ZapClient, url: str, run_dir: Path, timeout: Optional[float]
+) -> Dict[str, object]:
+    """Baseline-scan one target through the daemon into its zap.json."""
+    logger.info("OWASP ZAP daemon scan %s", url)
+    started = time.monotonic()
+    status: Dict[str, object] = {"status": "ok"}
+    try:
+        report, complete = zap_baseline_scan(client, url, timeout=timeout)
+        write_json(run_dir / "zap.json", report)
+        if not complete:
+            logger.warning("ZAP scan of %s timed out after %ss", url, timeout)
+            status = {
+                "status": "timeout",
+                "error": f"ZAP scan stopped after {timeout}s",
+            }
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("ZAP scan of %s failed: %s", url, exc)
+        status = {"status": "failed", "error": str(exc)}
+    status["timeout"] = timeout
+    status["seconds"] = round(time.monotonic() - started, 3)
+    return status
+
+
+def _run_zap_daemon(
+    runner: DockerRunner, target_dirs: Dict[str, Path], options: ScanOptions
+) -> Dict[str, Dict[str, object]]:
+    """Scan every target through one ZAP daemon; return URL -> status.
+
+    The daemon's API is reached on localhost: directly with host networking
+    (the default Docker options), otherwise through a port published on
+    127.0.0.1. The container is stopped once the last target is done.
+    ``--tool-timeout zap`` bounds each target.
+    """
+    timeout = stage_timeout("zap", options.timeout, options.tool_timeouts)
+    statuses: Dict[str, Dict[str, object]] = {}
+    error = "ZAP daemon stopped"
+    port = _free_port()
+    api_key = secrets.token_hex(16)
+    try:
+        command = _zap_daemon_command(
+            port, api_key, runner.network_mode == "host"
+        )
+        with runner.daemon(command, ports=(port,)):
+            client = ZapClient(f"http://127.0.0.1:{port}", api_key)
+            logger.info("ZAP daemon %s ready", wait_for_zap(client))
+            for url, target_dir in target_dirs.items():
+                statuses[url] = _zap_daemon_target(
+                    client, url, target_dir, timeout
+                )
+    except Exception as exc:  # remaining targets are recorded as failed
+        logger.warning("ZAP daemon failed: %s", exc)
+        error = str(exc)
+    for url in target_dirs:
+        statuses.setdefault(
+            url,
+            {"status": "failed", "error": error, "timeout": timeout},
+        )
+    return statuses
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Finding extraction
 # ──────────────────────────────────────────────────────────────────────────────
@@ -232,28 +471,33 @@ def _run_sqlmap_scan(
 def _iter_nikto_findings(path: Path) -> Iterator[Finding]:
     """Iterate findings from nikto JSON output."""
     data = load_json(path)
-    entries = data.get("findings", [])
-    for entry in entries:
-        model = NiktoFindingModel.model_validate(entry)
+    for model in NIKTO_FINDINGS.validate_python(data.get("findings", [])):
         yield model.to_finding()
 
 
 def _iter_zap_findings(path: Path) -> Iterator[Finding]:
     """Iterate findings from ZAP JSON output."""
     data = ZapBaselineModel.model_validate(load_json(path))
-    for alert in chain.from_iterable(site.alerts for site in data.site):
-        yield alert.to_finding()
+    for site in data.site:
+        for alert in site.alerts:
+            yield alert.to_finding(site.name)
 
 
 def _parse_sqlmap_line(line: str) -> Optional[Finding]:
-    """Parse a single line from sqlmap log."""
+    """Parse a single line from sqlmap log.
+
+    Log lines carry no URL, so the message without its timestamp and level
+    tag stands in as the location that tells findings apart.
+    """
     trimmed = line.strip()
+    location = SQLMAP_LOG_PREFIX.sub("", trimmed)
     if "[CRITICAL]" in trimmed:
         return Finding(
             source="sqlmap",
             severity="high",
             title="SQLMap critical finding",
             description=trimmed,
+            location=location,
         )
     if "[WARNING]" in trimmed:
         return Finding(
@@ -261,6 +505,7 @@ def _parse_sqlmap_line(line: str) -> Optional[Finding]:
             severity="medium",
             title="SQLMap warning",
             description=trimmed,
+            location=location,
         )
     return None
 
@@ -296,20 +541,136 @@ def _collect_findings(run_dir: Path) -> List[Finding]:
     return list(chain.from_iterable(generators))
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Findings store
+# ──────────────────────────────────────────────────────────────────────────────
+
+# A finding is tracked per target as one of these states.
+ClassifiedFinding = Tuple[Finding, str]
+
+
+def _open_findings_store(runner: DockerRunner) -> sqlite3.Connection:
+    """Open the cross-run findings store."""
+    return open_store(runner.paths.data / FINDINGS_FILENAME, FINDINGS_SCHEMA)
+
+
+def _dedupe_findings(findings: Iterable[Finding]) -> List[Finding]:
+    """Keep the first finding per fingerprint."""
+    unique: Dict[str, Finding] = {}
+    for finding in findings:
+        unique.setdefault(finding.fingerprint, finding)
+    return list(unique.values())
+
+
+def _classify_findings(
+    conn: sqlite3.Connection,
+    target: str,
+    findings: List[Finding],
+    complete: Set[str],
+) -> List[ClassifiedFinding]:
+    """Mark findings new or unchanged against the store, and add resolved ones.
+
+    ``findings`` must already be deduplicated. Open findings missing from
+    this run are resolved only when their tool (in ``complete``) finished,
+    so a timed-out tool does not close everything it found last time.
+    """
+    now = time.time()
+    current = {finding.fingerprint: finding for finding in findings}
+    with conn:
+        open_rows = {
+            row["fingerprint"]: row["record"]
+            for row in conn.execute(
+                "SELECT fingerprint, record FROM findings"
+                " WHERE target = ? AND resolved_at IS NULL",
+                (target,),
+            )
+        }
+        classified: List[ClassifiedFinding] = [
+            (finding, "unchanged" if fp in open_rows else "new")
+            for fp, finding in current.items()
+        ]
+        conn.executemany(
+            "INSERT INTO findings"
+            " (target, fingerprint, first_seen, last_seen, resolved_at, record)"
+            " VALUES (?, ?, ?, ?, NULL, ?)"
+            " ON CONFLICT (target, fingerprint) DO UPDATE SET"
+            " first_seen = CASE WHEN resolved_at IS NULL"
+            " THEN first_seen ELSE excluded.first_seen END,"
+            " last_seen = excluded.last_seen,"
+            " resolved_at = NULL,"
+            " record = excluded.record",
+            (
+                (target, fp, now, now, json.dumps(finding.to_dict()))
+                for fp, finding in current.items()
+            ),
+        )
+        resolved: List[str] = []
+        for fp, record in open_rows.items():
+            finding = Finding.from_dict(json.loads(record))
+            if fp not in current and finding.source in complete:
+                classified.append((finding, "resolved"))
+                resolved.append(fp)
+        conn.executemany(
+            "UPDATE findings SET resolved_at = ?"
+            " WHERE target = ? AND fingerprint = ?",
+            ((now, target, fp) for fp in resolved),
+        )
+    return classified
+
+
+def _track_findings(
+    conn: sqlite3.Connection,
+    run_dir: Path,
+    url: str,
+    profile: str,
+    stages: Dict[str, Dict[str, object]],
+) -> Tuple[List[ClassifiedFinding], int]:
+    """Collect, deduplicate and classify a target's findings.
+
+    Returns the classified findings and how many duplicates were dropped.
+    """
+    findings = _collect_findings(run_dir)
+    unique = _dedupe_findings(findings)
+    complete = {
+        tool for tool, stage in stages.items() if stage["status"] == "ok"
+    }
+    classified = _classify_findings(conn, f"{url}:{profile}", unique, complete)
+    return classified, len(findings) - len(unique)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Output generation
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+def _delta_counts(
+    findings: List[ClassifiedFinding], duplicates: int
+) -> Dict[str, int]:
+    """Count findings per state, plus the duplicates dropped."""
+    counts = {"new": 0, "unchanged": 0, "resolved": 0}
+    for _, state in findings:
+        counts[state] += 1
+    counts["duplicates"] = duplicates
+    return counts
+
+
 def _summary_payload(
-    url: str, profile: str, findings: Iterable[Finding]
+    url: str,
+    profile: str,
+    findings: List[ClassifiedFinding],
+    stages: Optional[Dict[str, Dict[str, object]]] = None,
+    duplicates: int = 0,
 ) -> dict:
     """Generate summary JSON payload."""
-    return {
+    summary = {
         "target": url,
         "profile": profile,
         "generated_at": utc_timestamp(),
-        "findings": [finding.summary_payload() for finding in findings],
+        "findings": [
+            {**finding.summary_payload(), "status": state}
+            for finding, state in findings
+        ],
+        "delta": _delta_counts(findings, duplicates),
         "artifacts": {
             "nikto_json": "nikto.json",
             "zap_json": "zap.json",
@@ -318,6 +679,9 @@ def _summary_payload(
             "sqlmap_log": "sqlmap.log",
         },
     }
+    if stages is not None:
+        summary["stages"] = stages
+    return summary
 
 
 def _build_sarif_rules(findings: List[Finding]) -> List[dict]:
@@ -328,9 +692,12 @@ def _build_sarif_rules(findings: List[Finding]) -> List[dict]:
     return list(rules.values())
 
 
-def _sarif_payload(url: str, findings: Iterable[Finding]) -> dict:
-    """Generate SARIF JSON payload."""
-    findings_list = list(findings)
+def _sarif_payload(url: str, findings: List[ClassifiedFinding]) -> dict:
+    """Generate SARIF JSON payload.
+
+    Each result carries its fingerprint and a ``baselineState`` against
+    the previous scan; resolved findings are reported as ``absent``.
+    """
     return {
         "version": "2.1.0",
         "runs": [
@@ -339,12 +706,15 @@ def _sarif_payload(url: str, findings: Iterable[Finding]) -> dict:
                     "driver": {
                         "name": "Pen Test Toolkit",
                         "informationUri": "https://example.com/pentool",
-                        "rules": _build_sarif_rules(findings_list),
+                        "rules": _build_sarif_rules(
+                            [finding for finding, _ in findings]
+                        ),
                     }
                 },
                 "artifacts": [{"location": {"uri": url}}],
                 "results": [
-                    finding.sarif_result(url) for finding in findings_list
+                    finding.sarif_result(url, SARIF_BASELINE_STATES[state])
+                    for finding, state in findings
                 ],
             }
         ],
@@ -352,15 +722,125 @@ def _sarif_payload(url: str, findings: Iterable[Finding]) -> dict:
 
 
 def _write_outputs(
-    run_dir: Path, url: str, profile: str, findings: List[Finding]
+    run_dir: Path,
+    url: str,
+    profile: str,
+    findings: List[ClassifiedFinding],
+    stages: Optional[Dict[str, Dict[str, object]]] = None,
+    duplicates: int = 0,
 ) -> None:
     """Write all output files."""
-    summary = _summary_payload(url, profile, findings)
+    summary = _summary_payload(url, profile, findings, stages, duplicates)
     sarif = _sarif_payload(url, findings)
     write_json(run_dir / "scan.json", summary)
     write_json(run_dir / "scan.sarif", sarif)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Batch mode
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _load_scan_urls(path: Path) -> List[str]:
+    """Read target URLs from a file, skipping comments and duplicates."""
+    if not path.exists():
+        raise RuntimeError(f"URLs file not found: {path}")
+    urls: Dict[str, None] = {}
+    for line in iter_lines(path):
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        if not url.lower().startswith(("http://", "https://")):
+            raise RuntimeError(f"Invalid URL {url!r}; expected http(s)://")
+        urls.setdefault(url)
+    if not urls:
+        raise RuntimeError(f"No URLs found in {path}")
+    return list(urls)
+
+
+def run_scan_batch(options: ScanOptions, runner: DockerRunner) -> Path:
+    """Scan many URLs at once and return the batch index path.
+
+    nikto, sslyze and sqlmap run per target within the concurrency budget
+    while one ZAP daemon works through the targets alongside them. Each
+    target gets a regular scan.json and scan.sarif under ``targets/``.
+    """
+    urls = _load_scan_urls(options.urls_file)  # type: ignore[arg-type]
+    runner.ensure_image()
+    batch_dir = runner.new_run_dir(
+        "scan-batch", options.urls_file.stem  # type: ignore[union-attr]
+    )
+    target_dirs: Dict[str, Path] = {}
+    jobs: Dict[str, Stage] = {}
+    for index, url in enumerate(urls):
+        target_dir = batch_dir / "targets" / f"{index:03d}-{slugify(url)}"
+        target_dir.mkdir(parents=True)
+        target_dirs[url] = target_dir
+        for tool, job in _scan_jobs(
+            runner, target_dir, url, options.profile, zap=False
+        ).items():
+            jobs[f"{target_dir.name}/{tool}"] = job
+    logger.info("scan batch: %s targets", len(urls))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        zap = pool.submit(_run_zap_daemon, runner, target_dirs, options)
+        stages = run_stages(
+            jobs,
+            options.timeout,
+            options.tool_timeouts,
+            workers=options.concurrency,
+        )
+        zap_stages = zap.result()
+
+    entries: List[Dict[str, object]] = []
+    with closing(_open_findings_store(runner)) as store:
+        for url, target_dir in target_dirs.items():
+            target_stages = {
+                tool: (
+                    zap_stages[url]
+                    if tool == "zap"
+                    else stages[f"{target_dir.name}/{tool}"]
+                )
+                for tool in SCAN_TOOLS
+            }
+            findings, duplicates = _track_findings(
+                store, target_dir, url, options.profile, target_stages
+            )
+            _write_outputs(
+                target_dir,
+                url,
+                options.profile,
+                findings,
+                target_stages,
+                duplicates,
+            )
+            entries.append(
+                {
+                    "url": url,
+                    "summary": f"{target_dir.relative_to(batch_dir).as_posix()}"
+                    "/scan.json",
+                    "delta": _delta_counts(findings, duplicates),
+                    "complete": all(
+                        stage["status"] == "ok"
+                        for stage in target_stages.values()
+                    ),
+                }
+            )
+
+    index = {
+        "generated_at": utc_timestamp(),
+        "urls_file": str(options.urls_file),
+        "targets": entries,
+        "settings": {
+            "profile": options.profile,
+            "concurrency": int(options.concurrency),
+        },
+    }
+    index_path = batch_dir / "batch.json"
+    write_json(index_path, index)
+    return index_path
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Entry point
 # ──────────────────────────────────────────────────────────────────────────────
@@ -368,6 +848,8 @@ def _write_outputs(
 
 def run_scan(options: ScanOptions, runner: DockerRunner) -> Path:
     """Run security scan with multiple tools."""
+    if options.urls_file is not None:
+        return run_scan_batch(options, runner)
     descriptor = _descriptor(options)
     key = CacheKey(namespace="scan", components=("scan", descriptor))
 
@@ -378,18 +860,25 @@ def run_scan(options: ScanOptions, runner: DockerRunner) -> Path:
 
     runner.ensure_image()
     run_dir = runner.new_run_dir("scan", descriptor)
-    run_rel = runner.relative_posix(run_dir)
-    env = {"RUN_DIR": f"/work/{run_rel}"}
 
-    _run_nikto_scan(runner, run_rel, options.url, env)
-    _run_sslyze_scan(runner, run_dir, run_rel, options.url, env)
-    _run_zap_scan(runner, run_rel, options.url, env)
-    _run_sqlmap_scan(
-        runner, run_dir, run_rel, options.url, options.profile, env
+    stages = run_stages(
+        _scan_jobs(runner, run_dir, options.url, options.profile),
+        options.timeout,
+        options.tool_timeouts,
     )
 
-    findings = _collect_findings(run_dir)
-    _write_outputs(run_dir, options.url, options.profile, findings)
+    with closing(_open_findings_store(runner)) as store:
+        findings, duplicates = _track_findings(
+            store, run_dir, options.url, options.profile, stages
+        )
+    _write_outputs(
+        run_dir, options.url, options.profile, findings, stages, duplicates
+    )
 
-    runner.cache_store(key, run_dir, descriptor)
+    if all(stage["status"] == "ok" for stage in stages.values()):
+        runner.cache_store(key, run_dir, descriptor)
+    else:
+        logger.warning(
+            "Not caching %s: some tools did not complete", descriptor
+        )
     return run_dir / "scan.json"
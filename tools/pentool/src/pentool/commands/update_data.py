@@ -5,6 +5,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Optional, Sequence, Tuple
 
+from pentool.common.ports import rank_nmap_services, render_port_ranks
+from pentool.constants import PORT_RANKS_NAME
 from pentool.docker_runner import DockerRunner
 from pentool.utils import append_log, utc_timestamp
 
@@ -34,6 +36,12 @@ def _task_definitions(
             base_host / "amass-sources.txt",
         ),
         ("Verifying httpx binary freshness", ["httpx", "-version"], True, None),
+        (
+            "Exporting nmap-services frequency table",
+            ["cat", "/usr/share/nmap/nmap-services"],
+            True,
+            base_host / "nmap-services",
+        ),
     ]
 
 
@@ -115,6 +123,19 @@ def _run_update_tasks(
         )
 
 
+def _update_port_ranks(runner: DockerRunner, run_dir: Path) -> None:
+    """Rebuild the port frequency ranking from the exported nmap-services."""
+    source = run_dir / "nmap-services"
+    if not source.exists():
+        return
+    with source.open("r", encoding="utf-8", errors="ignore") as fh:
+        tiers = rank_nmap_services(fh)
+    if not tiers:
+        return
+    target = runner.paths.data / PORT_RANKS_NAME
+    target.write_text(render_port_ranks(tiers), encoding="utf-8")
+
+
 def _update_last_update_timestamp(runner: DockerRunner) -> None:
     """Write current timestamp to last-update file."""
     last_update = runner.paths.data / "last-update.txt"
@@ -133,6 +154,7 @@ def run_update_data(runner: DockerRunner) -> Path:
     run_rel = runner.relative_posix(run_dir)
 
     _run_update_tasks(runner, run_dir, run_rel)
+    _update_port_ranks(runner, run_dir)
     _update_last_update_timestamp(runner)
 
     return run_dir
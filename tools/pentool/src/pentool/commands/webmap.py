@@ -12,8 +12,9 @@ specialized tools to map the attack surface of a target domain:
 - waybackurls: Historical URL discovery tool that queries the Wayback Machine
   archive to find previously indexed URLs for the target domain. Discovers old
   endpoints, parameters, and file paths that may still be accessible or reveal
-  information about the application structure. Results are limited by depth setting
-  (depth * 500 URLs) to manage output size.
+  information about the application structure. Output is streamed, deduplicated
+  and filtered to in-scope, non-asset URLs as it arrives, and the container is
+  stopped once the depth limit (depth * 500 unique URLs) is reached.
 
 - amass: Passive subdomain enumeration tool that aggregates subdomain information
   from various OSINT sources without actively probing targets. Discovers subdomains
@@ -28,16 +29,48 @@ specialized tools to map the attack surface of a target domain:
 Targets are provided as a base URL, from which the domain is extracted. The module
 runs discovery tools in parallel, then aggregates all discovered paths, URLs,
 and subdomains into a unified target list. httpx verifies accessibility of all
-discovered endpoints, producing a comprehensive web surface map.
+discovered endpoints, producing a comprehensive web surface map. Before probing,
+URLs are canonicalised and variants that differ only in parameter values are
+collapsed to one representative; the collapse ratio is kept in the metadata.
+
+Each tool runs with its own timeout. A discovery tool that fails or times out
+keeps whatever output it produced and is recorded in the summary, and httpx
+starts once every discovery tool has finished or been stopped.
 
 Results include discovered directories with status codes, historical URLs from
 archive services, enumerated subdomains, and verified HTTP endpoints with their
 metadata. All findings are consolidated into both JSON summary reports and CSV
-exports for easy analysis and integration with other tools.
+exports for easy analysis and integration with other tools. Both are written in
+one streaming pass over the tool outputs, so large discovery results are never
+held in memory; webmap-meta.json keeps only derived data (collapse and DNS
+statistics).
 
 Supports result caching, configurable discovery depth (limits historical URL count),
 custom wordlists for directory brute-forcing, and adjustable HTTP probe rates
-for balancing speed against target responsiveness.
+for balancing speed against target responsiveness. Custom wordlists are kept once
+in a content-addressed store mounted read-only into containers, so each run only
+records the wordlist hash.
+
+With ``--recursive``, every directory gobuster finds (2xx/3xx/401/403) is
+brute-forced again, level by level up to the discovery depth, with several
+directories scanned concurrently under a request-rate budget taken from the
+probe rate. Results are merged into the same deduplicated path list.
+
+Subdomains from amass are resolved concurrently before probing: names that
+do not resolve are dropped, names that only match a wildcard DNS zone are
+collapsed to one per zone, and the resolved addresses are kept in
+webmap-meta.json for reuse by recon.
+
+httpx results are cached per URL across runs (status, title, content length,
+technologies and probe time, or the absence of a response). Only URLs missing
+from the cache or older than ``--probe-max-age`` are probed; cached results are
+merged into httpx.json, so overlapping and recurring runs skip most probes.
+
+Batch mode (``--urls-file``) maps many base URLs in one run: amass and
+waybackurls run once per registrable domain and their results are split per
+target, gobuster runs per target within a concurrency budget, and one httpx
+job verifies every target's URLs. Each target gets its own webmap.json and a
+batch.json index lists them all.
 """
 
 from __future__ import annotations
@@ -45,15 +78,57 @@ from __future__ import annotations
 import csv
 import json
 import logging
+import math
+import sqlite3
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 from urllib.parse import urlparse
 
 from pentool.commands import WebMapOptions
-from pentool.common import check_cache
-from pentool.docker_runner import DockerRunner
-from pentool.parsers import parse_httpx_entries
-from pentool.utils import CacheKey, load_json, utc_timestamp, write_json
+from pentool.common import (
+    Resolver,
+    Stage,
+    check_cache,
+    collapse_ratio,
+    collapse_urls,
+    collapse_wildcards,
+    detect_wildcards,
+    in_scope,
+    ingest_wordlist,
+    is_static_url,
+    iter_lines,
+    open_store,
+    parse_resolvers,
+    registrable_domain,
+    resolve_names,
+    run_stages,
+    system_resolvers,
+    wordlist_container_path,
+)
+from pentool.docker_runner import ContainerTimeout, DockerRunner
+from pentool.parsers import iter_httpx_entries, parse_httpx_line
+from pentool.utils import (
+    CacheKey,
+    load_json,
+    slugify,
+    utc_timestamp,
+    write_json,
+    write_json_stream,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +138,41 @@ DEFAULT_WORDLISTS = (
     "/usr/share/wordlists/dirbuster/directory-list-2.3-small.txt",
 )
 
+# Recursive gobuster: concurrent passes per level and threads per pass.
+GOBUSTER_WORKERS = 4
+GOBUSTER_MAX_THREADS = 10
+# Unique, in-scope historical URLs kept per unit of --depth.
+HISTORICAL_URLS_PER_DEPTH = 500
+# Per-target httpx files kept open at once while splitting batch results.
+SPLIT_OPEN_FILES = 64
+
+PROBE_CACHE_FILENAME = "webmap-probes.sqlite"
+PROBE_TARGETS_FILENAME = "httpx-probe.txt"
+PROBED_FILENAME = "httpx-probed.json"
+CACHED_PROBES_FILENAME = "httpx-cached.json"
+# httpx fields kept per URL; enough to rebuild the summary and batch split.
+PROBE_FIELDS = (
+    "input",
+    "url",
+    "host",
+    "port",
+    "status-code",
+    "title",
+    "content-length",
+    "technologies",
+)
+# URLs looked up per query; stays below sqlite's bound-parameter limit.
+PROBE_LOOKUP_BATCH = 500
+# A NULL record marks a URL httpx probed without getting a response.
+PROBE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    url TEXT PRIMARY KEY,
+    probed_at REAL NOT NULL,
+    record TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS probes_probed_at ON probes (probed_at);
+"""
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Setup and initialization
@@ -89,26 +199,32 @@ def _parse_url(url: str) -> tuple[str, str]:
 
 
 def _write_target_data(
-    run_dir: Path, url: str, domain: str, netloc: str
+    run_dir: Path, url: str, domain: str, netloc: str, wordlist: Optional[str]
 ) -> None:
     """Write target metadata to JSON file."""
-    target_data = {"url": url, "domain": domain, "netloc": netloc}
+    target_data = {
+        "url": url,
+        "domain": domain,
+        "netloc": netloc,
+        "wordlist": f"sha256:{wordlist}" if wordlist else "default",
+    }
     write_json(run_dir / "target.json", target_data)
 
 
 def _resolve_wordlist(
-    run_dir: Path, run_rel: str, provided: Optional[Path]
-) -> str:
-    """Resolve wordlist path, copying custom wordlist if provided."""
-    if provided:
-        if not provided.exists():
-            raise RuntimeError(f"Wordlist not found: {provided}")
-        destination = run_dir / "wordlist.txt"
-        destination.write_text(
-            provided.read_text(encoding="utf-8"), encoding="utf-8"
-        )
-        return f"/work/{run_rel}/wordlist.txt"
-    return DEFAULT_WORDLISTS[0]
+    runner: DockerRunner, options: WebMapOptions
+) -> Tuple[str, Optional[str]]:
+    """Return the container wordlist path and, for custom lists, its hash.
+
+    Custom wordlists are ingested into the shared store, which is mounted
+    read-only, instead of being copied into the run directory.
+    """
+    if options.wordlist is None:
+        return DEFAULT_WORDLISTS[0], None
+    digest = ingest_wordlist(
+        runner.paths.wordlists, options.wordlist, dedup=options.dedup_wordlist
+    )
+    return wordlist_container_path(digest), digest
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -117,7 +233,16 @@ def _resolve_wordlist(
 
 
 def _run_gobuster(
-    runner: DockerRunner, run_rel: str, url: str, wordlist_path: str, env: dict
+    runner: DockerRunner,
+    run_rel: str,
+    url: str,
+    wordlist_path: str,
+    env: dict,
+    timeout: Optional[float] = None,
+    *,
+    threads: Optional[int] = None,
+    delay_ms: int = 200,
+    output: str = "gobuster.json",
 ) -> None:
     """Run gobuster directory scan."""
     logger.info("gobuster against %s", url)
@@ -134,48 +259,244 @@ def _run_gobuster(
         "--follow-redirect",
         "-q",
         "--delay",
-        "200ms",
+        f"{delay_ms}ms",
         "--wildcard",
         "--add-slash",
         "--json",
         "-o",
-        f"/work/{run_rel}/gobuster.json",
+        f"/work/{run_rel}/{output}",
     ]
-    result = runner.run(gobuster_cmd, env, check=False)
+    if threads:
+        gobuster_cmd.extend(["-t", str(threads)])
+    result = runner.run(gobuster_cmd, env, check=False, timeout=timeout)
     if result.returncode != 0:
         logger.warning("gobuster exited with code %s", result.returncode)
 
 
+def _gobuster_pacing(rate: int, workers: int) -> Tuple[int, int]:
+    """Split a requests-per-second budget across concurrent gobuster runs.
+
+    Returns the thread count and per-thread delay in milliseconds for each
+    run, so ``workers`` runs together stay within ``rate`` requests/s.
+    """
+    per_run = max(rate, 1) / max(workers, 1)
+    threads = max(1, min(GOBUSTER_MAX_THREADS, int(per_run)))
+    return threads, math.ceil(1000 * threads / per_run)
+
+
+def _is_directory_hit(status: object) -> bool:
+    """Return True for responses worth recursing into."""
+    code = status if isinstance(status, int) else -1
+    return 200 <= code < 400 or code in (401, 403)
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Return the seconds left before ``deadline``, or None if unbounded."""
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise ContainerTimeout("gobuster recursion ran out of time")
+    return left
+
+
+def _run_gobuster_pass(
+    deadline: Optional[float], *args: Any, **kwargs: Any
+) -> None:
+    """Run one recursion pass with the time left when it actually starts.
+
+    Passes still queued once the deadline has passed are skipped.
+    """
+    _run_gobuster(*args, _remaining(deadline), **kwargs)
+
+
+def _run_recursive_gobuster(
+    runner: DockerRunner,
+    run_dir: Path,
+    url: str,
+    wordlist_path: str,
+    depth: int,
+    rate: int,
+    env: dict,
+    timeout: Optional[float] = None,
+) -> None:
+    """Brute-force directories level by level, recursing into hits.
+
+    Directories found at one level are scanned concurrently at the next,
+    up to ``depth`` levels, with ``rate`` requests/s shared by all passes
+    running at once. ``timeout`` bounds the whole recursion: each pass gets
+    the time left when it starts, and passes still queued at the deadline
+    are skipped. Results are rewritten relative to ``url``, deduplicated
+    and merged into gobuster.json, which keeps its usual format.
+    """
+    run_rel = runner.relative_posix(run_dir)
+    deadline = time.monotonic() + timeout if timeout else None
+    (run_dir / "gobuster").mkdir(exist_ok=True)
+    seen: set[str] = set()
+    level = ["/"]
+    passes = 0
+    with (run_dir / "gobuster.json").open("w", encoding="utf-8") as merged:
+        for _ in range(max(depth, 1)):
+            if not level:
+                break
+            workers = min(GOBUSTER_WORKERS, len(level))
+            threads, delay_ms = _gobuster_pacing(rate, workers)
+            outputs = [
+                f"gobuster/pass-{passes + index:04d}.json"
+                for index in range(len(level))
+            ]
+            passes += len(level)
+            failure: Optional[Exception] = None
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        _run_gobuster_pass,
+                        deadline,
+                        runner,
+                        run_rel,
+                        url.rstrip("/") + prefix,
+                        wordlist_path,
+                        env,
+                        threads=threads,
+                        delay_ms=delay_ms,
+                        output=output,
+                    )
+                    for prefix, output in zip(level, outputs)
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as exc:  # merge what the others found
+                        failure = failure or exc
+
+            next_level: List[str] = []
+            for prefix, output in zip(level, outputs):
+                for record in _iter_gobuster_results(run_dir, output):
+                    path = prefix + str(record.get("path") or "").lstrip("/")
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                    merged.write(json.dumps({**record, "path": path}) + "\n")
+                    if _is_directory_hit(record.get("status")):
+                        next_level.append(path.rstrip("/") + "/")
+            if failure is not None:
+                raise failure
+            level = next_level
+    logger.info("gobuster recursion: %s passes, %s paths", passes, len(seen))
+
+
+def _gobuster_stage(
+    runner: DockerRunner,
+    run_dir: Path,
+    url: str,
+    wordlist_path: str,
+    options: WebMapOptions,
+    env: dict,
+) -> Stage:
+    """Build the gobuster stage, recursive when requested."""
+    if options.recursive:
+        return lambda timeout: _run_recursive_gobuster(
+            runner,
+            run_dir,
+            url,
+            wordlist_path,
+            options.depth,
+            options.rate,
+            env,
+            timeout,
+        )
+    run_rel = runner.relative_posix(run_dir)
+    return lambda timeout: _run_gobuster(
+        runner, run_rel, url, wordlist_path, env, timeout
+    )
+
+
+def _collect_output(
+    runner: DockerRunner,
+    args: List[str],
+    env: dict,
+    timeout: Optional[float],
+    destination: Path,
+) -> Tuple[int, str]:
+    """Run a collecting tool, saving partial output if it times out."""
+    try:
+        return runner.run_collect(
+            args, env, allow_failure=True, timeout=timeout
+        )
+    except ContainerTimeout as exc:
+        destination.write_text(exc.output, encoding="utf-8")
+        raise
+
+
+def _is_useful_historical_url(url: str, domain: str) -> bool:
+    """Keep in-scope http(s) URLs that are not static assets."""
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    if parsed.scheme not in ("http", "https"):
+        return False
+    if not in_scope(parsed.hostname or "", domain):
+        return False
+    return not is_static_url(url)
+
+
 def _run_waybackurls(
-    runner: DockerRunner, run_dir: Path, domain: str, depth: int, env: dict
+    runner: DockerRunner,
+    run_dir: Path,
+    domain: str,
+    depth: int,
+    env: dict,
+    timeout: Optional[float] = None,
 ) -> None:
-    """Run waybackurls historical URL discovery."""
+    """Stream waybackurls output, stopping once enough unique URLs arrived.
+
+    URLs are deduplicated and filtered as they are read and written
+    straight to disk, so a timeout still leaves everything kept so far.
+    """
     logger.info("waybackurls %s", domain)
-    wayback_code, wayback_output = runner.run_collect(
-        ["waybackurls", domain],
-        env,
-        allow_failure=True,
-    )
-    limit = depth * 500
-    wayback_lines = wayback_output.splitlines()[:limit]
+    limit = depth * HISTORICAL_URLS_PER_DEPTH
+    scope = domain.lower()
+    seen: set[str] = set()
     wayback_path = run_dir / "waybackurls.txt"
-    wayback_path.write_text(
-        "\n".join(wayback_lines) + ("\n" if wayback_lines else ""),
-        encoding="utf-8",
-    )
-    if wayback_code != 0:
-        logger.warning("waybackurls exited with code %s", wayback_code)
+    with wayback_path.open("w", encoding="utf-8") as out:
+        with runner.stream(
+            ["waybackurls", domain], env, timeout=timeout
+        ) as proc:
+            for line in proc.stdout:
+                url = line.strip()
+                if (
+                    not url
+                    or url in seen
+                    or not _is_useful_historical_url(url, scope)
+                ):
+                    continue
+                seen.add(url)
+                out.write(f"{url}\n")
+                if len(seen) >= limit:
+                    logger.info(
+                        "waybackurls reached %s URLs; stopping early", limit
+                    )
+                    break
+    if len(seen) < limit and proc.returncode != 0:
+        logger.warning("waybackurls exited with code %s", proc.returncode)
 
 
 def _run_amass(
-    runner: DockerRunner, run_dir: Path, domain: str, env: dict
+    runner: DockerRunner,
+    run_dir: Path,
+    domain: str,
+    env: dict,
+    timeout: Optional[float] = None,
 ) -> None:
     """Run amass passive subdomain enumeration."""
     logger.info("amass passive %s", domain)
-    amass_code, amass_output = runner.run_collect(
+    amass_code, amass_output = _collect_output(
+        runner,
         ["amass", "enum", "-passive", "-d", domain],
         env,
-        allow_failure=True,
+        timeout,
+        run_dir / "amass.txt",
     )
     (run_dir / "amass.txt").write_text(amass_output, encoding="utf-8")
     if amass_code != 0:
@@ -183,26 +504,56 @@ def _run_amass(
 
 
 def _run_httpx(
-    runner: DockerRunner, run_rel: str, rate: int, env: dict
+    runner: DockerRunner,
+    run_rel: str,
+    rate: int,
+    env: dict,
+    timeout: Optional[float] = None,
+    *,
+    targets: str = "httpx-targets.txt",
+    output: str = "httpx.json",
 ) -> None:
     """Run httpx HTTP verification."""
     logger.info("httpx verification")
     httpx_cmd = [
         "httpx",
         "-l",
-        f"/work/{run_rel}/httpx-targets.txt",
+        f"/work/{run_rel}/{targets}",
         "-json",
         "-o",
-        f"/work/{run_rel}/httpx.json",
+        f"/work/{run_rel}/{output}",
         "-threads",
         str(rate),
         "-silent",
     ]
-    httpx_result = runner.run(httpx_cmd, env, check=False)
+    httpx_result = runner.run(httpx_cmd, env, check=False, timeout=timeout)
     if httpx_result.returncode != 0:
         logger.warning("httpx exited with code %s", httpx_result.returncode)
 
 
+def _discovery_jobs(
+    runner: DockerRunner,
+    run_dir: Path,
+    run_rel: str,
+    options: WebMapOptions,
+    domain: str,
+    wordlist_path: str,
+    env: dict,
+) -> Dict[str, Stage]:
+    """Build the independent gobuster, waybackurls and amass stages."""
+    return {
+        "gobuster": _gobuster_stage(
+            runner, run_dir, options.url, wordlist_path, options, env
+        ),
+        "waybackurls": lambda timeout: _run_waybackurls(
+            runner, run_dir, domain, options.depth, env, timeout
+        ),
+        "amass": lambda timeout: _run_amass(
+            runner, run_dir, domain, env, timeout
+        ),
+    }
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Result parsing
 # ──────────────────────────────────────────────────────────────────────────────
@@ -224,59 +575,33 @@ def _parse_gobuster_line(line: str) -> Optional[Dict[str, object]]:
     }
 
 
-def _parse_gobuster_results(
-    run_dir: Path, base_url: str
-) -> List[Dict[str, object]]:
-    """Parse gobuster JSON results."""
-    paths: List[Dict[str, object]] = []
-    gobuster_path = run_dir / "gobuster.json"
-    if not gobuster_path.exists():
-        return paths
+def _iter_gobuster_results(
+    run_dir: Path, name: str = "gobuster.json"
+) -> Iterator[Dict[str, object]]:
+    """Iterate gobuster JSON results."""
+    for line in iter_lines(run_dir / name):
+        parsed = _parse_gobuster_line(line)
+        if parsed:
+            yield parsed
 
-    with gobuster_path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            parsed = _parse_gobuster_line(line)
-            if parsed:
-                paths.append(parsed)
-    return paths
 
+def _iter_waybackurls_results(run_dir: Path, depth: int) -> Iterator[str]:
+    """Iterate waybackurls historical URLs up to the depth limit."""
+    limit = depth * HISTORICAL_URLS_PER_DEPTH
+    for idx, line in enumerate(iter_lines(run_dir / "waybackurls.txt")):
+        if idx >= limit:
+            break
+        url = line.strip()
+        if url:
+            yield url
 
-def _parse_waybackurls_results(run_dir: Path, depth: int) -> List[str]:
-    """Parse waybackurls historical URLs."""
-    historical: List[str] = []
-    wayback_path = run_dir / "waybackurls.txt"
-    if not wayback_path.exists():
-        return historical
-
-    limit = depth * 1000
-    with wayback_path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for idx, line in enumerate(fh):
-            if idx >= limit:
-                break
-            url = line.strip()
-            if url:
-                historical.append(url)
-    return historical
-
-
-def _parse_amass_results(run_dir: Path) -> List[str]:
-    """Parse amass subdomain results."""
-    subdomains: List[str] = []
-    amass_path = run_dir / "amass.txt"
-    if not amass_path.exists():
-        return subdomains
 
-    with amass_path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            host = line.strip()
-            if host:
-                subdomains.append(host)
-    return subdomains
-
-
-def _parse_httpx_entries(httpx_path: Path) -> List[Dict[str, object]]:
-    """Parse httpx JSON entries."""
-    return parse_httpx_entries(httpx_path)
+def _iter_amass_results(run_dir: Path) -> Iterator[str]:
+    """Iterate amass subdomain results."""
+    for line in iter_lines(run_dir / "amass.txt"):
+        host = line.strip()
+        if host:
+            yield host
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -284,49 +609,115 @@ def _parse_httpx_entries(httpx_path: Path) -> List[Dict[str, object]]:
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _collect_unique_urls(
+def _iter_candidate_urls(
     base_url: str,
-    paths: List[Dict[str, object]],
-    historical: List[str],
-    subdomains: List[str],
-) -> set[str]:
-    """Collect all unique URLs from various sources."""
-    seen = {base_url}
+    paths: Iterable[Dict[str, object]],
+    historical: Iterable[str],
+    subdomains: Iterable[str],
+) -> Iterator[str]:
+    """Yield candidate URLs from all sources, most trusted first.
+
+    Collapsing keeps the first URL per key, so live discovery results win
+    over archived variants of the same endpoint.
+    """
+    yield base_url
 
     for path_data in paths:
         path = path_data.get("path", "")
-        full = base_url.rstrip("/") + "/" + path.lstrip("/")
-        seen.add(full)
-
-    seen.update(historical)
+        yield base_url.rstrip("/") + "/" + path.lstrip("/")
 
     for host in subdomains:
-        seen.add(f"https://{host}")
+        yield f"https://{host}"
 
-    return seen
+    yield from historical
 
 
-def _write_httpx_targets(run_dir: Path, seen: set[str]) -> None:
+def _write_httpx_targets(run_dir: Path, urls: List[str]) -> None:
     """Write unique URLs to httpx targets file."""
     httpx_targets = run_dir / "httpx-targets.txt"
     with httpx_targets.open("w", encoding="utf-8") as fh:
-        for url in sorted(filter(None, seen)):
+        for url in sorted(urls):
             fh.write(f"{url}\n")
 
 
-def _build_metadata(run_dir: Path, depth: int) -> Dict[str, object]:
-    """Build metadata from all discovery sources."""
+def _dns_resolvers(options: WebMapOptions) -> Optional[List[Resolver]]:
+    """Return the resolvers for the DNS prefilter, or None when disabled."""
+    if not options.dns_filter:
+        return None
+    return parse_resolvers(options.resolvers) or system_resolvers()
+
+
+def _resolve_subdomains(
+    subdomains: List[str], resolvers: List[Resolver]
+) -> Tuple[List[str], Dict[str, object]]:
+    """Drop subdomains that do not resolve and collapse wildcard matches.
+
+    Names whose lookups failed outright are kept for httpx to decide.
+    """
+    resolved = resolve_names(subdomains, resolvers=resolvers)
+    wildcards = detect_wildcards(resolved, resolvers=resolvers)
+    live, collapsed = collapse_wildcards(resolved, wildcards)
+    statuses = Counter(result.status for result in resolved.values())
+    undecided = [n for n, r in resolved.items() if r.status == "error"]
+    dns = {
+        "resolvers": [f"{host}:{port}" for host, port in resolvers],
+        "checked": len(resolved),
+        "kept": len(live) + len(undecided),
+        "nxdomain": statuses["nxdomain"],
+        "nodata": statuses["nodata"],
+        "errors": statuses["error"],
+        "wildcard_collapsed": collapsed,
+        "wildcards": {zone: list(addrs) for zone, addrs in wildcards.items()},
+        "addresses": {
+            name: list(result.addresses)
+            for name, result in resolved.items()
+            if result.status == "resolved"
+        },
+    }
+    logger.info(
+        "DNS prefilter kept %s of %s subdomains", dns["kept"], len(resolved)
+    )
+    return sorted(live + undecided), dns
+
+
+def _build_metadata(
+    run_dir: Path, depth: int, resolvers: Optional[List[Resolver]] = None
+) -> Dict[str, object]:
+    """Write the httpx targets and the derived discovery metadata.
+
+    Discovery results are streamed from the tool outputs rather than copied
+    into the metadata. With ``resolvers`` set, subdomains go through the DNS
+    prefilter before they become httpx targets.
+    """
     target = load_json(run_dir / "target.json")
     base_url = target.get("url", "")
 
-    paths = _parse_gobuster_results(run_dir, base_url)
-    historical = _parse_waybackurls_results(run_dir, depth)
-    subdomains = _parse_amass_results(run_dir)
-
-    seen = _collect_unique_urls(base_url, paths, historical, subdomains)
-    _write_httpx_targets(run_dir, seen)
+    subdomains: Iterable[str] = _iter_amass_results(run_dir)
+    dns = None
+    if resolvers:
+        names = list(subdomains)
+        subdomains = names
+        if names:
+            subdomains, dns = _resolve_subdomains(names, resolvers)
+
+    urls, collapse = collapse_urls(
+        _iter_candidate_urls(
+            base_url,
+            _iter_gobuster_results(run_dir),
+            _iter_waybackurls_results(run_dir, depth),
+            subdomains,
+        )
+    )
+    _write_httpx_targets(run_dir, urls)
+    logger.info(
+        "httpx targets: %s of %s candidate URLs", len(urls), collapse["input"]
+    )
 
-    meta = {"paths": paths, "historical": historical, "subdomains": subdomains}
+    meta: Dict[str, object] = {
+        "collapse": {**collapse, "ratio": collapse_ratio(collapse)},
+    }
+    if dns is not None:
+        meta["dns"] = dns
     write_json(run_dir / "webmap-meta.json", meta)
     return meta
 
@@ -336,92 +727,474 @@ def _build_metadata(run_dir: Path, depth: int) -> Dict[str, object]:
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _write_csv_rows(
-    writer: csv.writer,
-    paths: List[Dict[str, object]],
-    historical: List[str],
-    subdomains: List[str],
-    http_entries: List[Dict[str, object]],
-) -> None:
-    """Write CSV rows for all discovery data."""
-    for item in paths:
-        writer.writerow(
-            [
-                "directory",
-                "gobuster",
-                item.get("path"),
-                item.get("status"),
-                item.get("length"),
-            ]
-        )
+CSV_HEADER = ("category", "source", "value", "status", "notes")
+
+
+def _csv_row(category: str, item: Any) -> List[object]:
+    """Build the CSV row for one item of a discovery category."""
+    if category == "directories":
+        return [
+            "directory",
+            "gobuster",
+            item.get("path"),
+            item.get("status"),
+            item.get("length"),
+        ]
+    if category == "historical_urls":
+        return ["historical-url", "waybackurls", item, "", ""]
+    if category == "subdomains":
+        return ["subdomain", "amass", item, "", ""]
+    return [
+        "http",
+        "httpx",
+        item.get("url"),
+        item.get("status_code"),
+        item.get("title"),
+    ]
 
-    for url in historical:
-        writer.writerow(["historical-url", "waybackurls", url, "", ""])
 
-    for host in subdomains:
-        writer.writerow(["subdomain", "amass", host, "", ""])
-
-    for entry in http_entries:
-        writer.writerow(
-            [
-                "http",
-                "httpx",
-                entry.get("url"),
-                entry.get("status_code"),
-                entry.get("title"),
-            ]
-        )
+def _tee_csv_rows(
+    category: str,
+    items: Iterable[Any],
+    writer: Any,
+    counts: Dict[str, int],
+) -> Iterator[Any]:
+    """Yield ``items`` unchanged, writing and counting a CSV row for each."""
+    counts[category] = 0
+    for item in items:
+        writer.writerow(_csv_row(category, item))
+        counts[category] += 1
+        yield item
 
 
-def _write_csv_summary(
+def _write_summary(
     run_dir: Path,
-    paths: List[Dict[str, object]],
-    historical: List[str],
-    subdomains: List[str],
-    http_entries: List[Dict[str, object]],
-) -> None:
-    """Write CSV summary file."""
+    depth: int,
+    rate: int,
+    stages: Optional[Dict[str, Dict[str, object]]] = None,
+) -> Dict[str, int]:
+    """Write webmap.json and webmap.csv in one pass over the tool outputs.
+
+    Each discovery item gets its CSV row as the JSON writer pulls it, so
+    both files come out in the same order without holding the results in
+    memory. Returns the number of items per discovery category.
+    """
+    sources: Dict[str, Iterable[Any]] = {
+        "directories": _iter_gobuster_results(run_dir),
+        "historical_urls": _iter_waybackurls_results(run_dir, depth),
+        "subdomains": _iter_amass_results(run_dir),
+        "http": iter_httpx_entries(run_dir / "httpx.json"),
+    }
+    counts: Dict[str, int] = {}
     csv_path = run_dir / "webmap.csv"
     with csv_path.open("w", encoding="utf-8", newline="") as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow(["category", "source", "value", "status", "notes"])
-        _write_csv_rows(writer, paths, historical, subdomains, http_entries)
+        writer.writerow(CSV_HEADER)
+        summary = {
+            "target": load_json(run_dir / "target.json"),
+            "generated_at": utc_timestamp(),
+            "discovery": {
+                category: _tee_csv_rows(category, items, writer, counts)
+                for category, items in sources.items()
+            },
+            "artifacts": {
+                "gobuster_json": "gobuster.json",
+                "wayback_urls": "waybackurls.txt",
+                "amass_output": "amass.txt",
+                "httpx_json": "httpx.json",
+            },
+            "settings": {
+                "depth": int(depth),
+                "rate": int(rate),
+            },
+        }
+        if stages is not None:
+            summary["stages"] = stages
+        write_json_stream(run_dir / "webmap.json", summary)
+    return counts
 
 
-def _build_summary(run_dir: Path, depth: int, rate: int) -> Dict[str, object]:
-    """Build final summary JSON with all discovery data."""
-    target = load_json(run_dir / "target.json")
-    meta = load_json(run_dir / "webmap-meta.json")
-    http_entries = _parse_httpx_entries(run_dir / "httpx.json")
+# ──────────────────────────────────────────────────────────────────────────────
+# Probe cache
+# ──────────────────────────────────────────────────────────────────────────────
+
 
-    paths = meta.get("paths", [])
-    historical = meta.get("historical", [])
-    subdomains = meta.get("subdomains", [])
+def _open_probe_cache(runner: DockerRunner) -> sqlite3.Connection:
+    """Open the cross-run per-URL httpx result cache."""
+    return open_store(
+        runner.paths.data / PROBE_CACHE_FILENAME, PROBE_CACHE_SCHEMA
+    )
+
+
+def _plan_probes(
+    conn: sqlite3.Connection, run_dir: Path, max_age: float
+) -> Dict[str, int]:
+    """Split httpx targets into fresh cached results and URLs to probe.
+
+    Cached responses are written to the cached-probes file and the rest of
+    the targets to the probe list; URLs recently found unresponsive are
+    skipped. A ``max_age`` of zero or less probes everything.
+    """
+    cutoff = time.time() - max_age
+    plan = {"cached": 0, "probed": 0}
+    urls = iter_lines(run_dir / "httpx-targets.txt")
+    with (run_dir / CACHED_PROBES_FILENAME).open(
+        "w", encoding="utf-8"
+    ) as cached_fh, (run_dir / PROBE_TARGETS_FILENAME).open(
+        "w", encoding="utf-8"
+    ) as probe_fh:
+        while batch := list(islice(urls, PROBE_LOOKUP_BATCH)):
+            fresh: Dict[str, Optional[str]] = {}
+            if max_age > 0:
+                fresh = {
+                    row["url"]: row["record"]
+                    for row in conn.execute(
+                        "SELECT url, record FROM probes WHERE probed_at >= ?"
+                        f" AND url IN ({', '.join('?' * len(batch))})",
+                        (cutoff, *batch),
+                    )
+                }
+            for url in batch:
+                if url not in fresh:
+                    plan["probed"] += 1
+                    probe_fh.write(f"{url}\n")
+                    continue
+                plan["cached"] += 1
+                record = fresh[url]
+                if record is not None:
+                    cached_fh.write(f"{record}\n")
+    logger.info(
+        "httpx probe cache: %s cached, %s to probe",
+        plan["cached"],
+        plan["probed"],
+    )
+    return plan
+
+
+def _cache_record(url: str, entry: Dict[str, object]) -> str:
+    """Trim an httpx result to the cached fields, keyed by its input URL."""
+    record = {field: entry[field] for field in PROBE_FIELDS if field in entry}
+    return json.dumps({**record, "input": url})
+
+
+def _record_probes(
+    conn: sqlite3.Connection, run_dir: Path, complete: bool
+) -> None:
+    """Write httpx.json from cached and fresh results, caching the fresh ones.
+
+    URLs httpx did not answer are cached as unresponsive only when the stage
+    completed, since a timed-out run leaves some of them untested.
+    """
+    upsert = (
+        "INSERT INTO probes (url, probed_at, record) VALUES (?, ?, ?)"
+        " ON CONFLICT (url) DO UPDATE SET"
+        " probed_at = excluded.probed_at, record = excluded.record"
+    )
+    now = time.time()
+    answered: set[str] = set()
+    with conn, (run_dir / "httpx.json").open("w", encoding="utf-8") as out:
+        for line in iter_lines(run_dir / CACHED_PROBES_FILENAME):
+            out.write(f"{line}\n")
+        for line in iter_lines(run_dir / PROBED_FILENAME):
+            entry = parse_httpx_line(line)
+            if not entry:
+                continue
+            out.write(f"{line}\n")
+            url = str(entry.get("input") or entry.get("url"))
+            conn.execute(upsert, (url, now, _cache_record(url, entry)))
+            answered.add(url)
+        if complete:
+            conn.executemany(
+                upsert,
+                (
+                    (url, now, None)
+                    for url in iter_lines(run_dir / PROBE_TARGETS_FILENAME)
+                    if url not in answered
+                ),
+            )
+
+
+def _probe_stage(
+    runner: DockerRunner,
+    conn: sqlite3.Connection,
+    run_dir: Path,
+    options: WebMapOptions,
+    env: dict,
+) -> Dict[str, Dict[str, object]]:
+    """Run httpx on the targets missing from the probe cache.
+
+    The stage record also counts cached and probed URLs.
+    """
+    plan = _plan_probes(conn, run_dir, options.probe_max_age)
+    run_rel = runner.relative_posix(run_dir)
+
+    def probe(timeout: Optional[float]) -> None:
+        if not plan["probed"]:
+            (run_dir / PROBED_FILENAME).write_text("", encoding="utf-8")
+            return
+        _run_httpx(
+            runner,
+            run_rel,
+            options.rate,
+            env,
+            timeout,
+            targets=PROBE_TARGETS_FILENAME,
+            output=PROBED_FILENAME,
+        )
 
-    summary = {
-        "target": target,
+    stages = run_stages(
+        {"httpx": probe}, options.timeout, options.tool_timeouts
+    )
+    _record_probes(conn, run_dir, stages["httpx"]["status"] == "ok")
+    stages["httpx"].update(plan)
+    return stages
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Batch mode
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _load_batch_urls(path: Path) -> List[str]:
+    """Read base URLs from a file, skipping comments and duplicates."""
+    if not path.exists():
+        raise RuntimeError(f"URLs file not found: {path}")
+    urls: Dict[str, None] = {}
+    for line in iter_lines(path):
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        _parse_url(url)
+        urls.setdefault(url)
+    if not urls:
+        raise RuntimeError(f"No URLs found in {path}")
+    return list(urls)
+
+
+def _batch_layout(
+    batch_dir: Path, urls: List[str]
+) -> Tuple[Dict[str, Path], Dict[str, List[str]]]:
+    """Create per-target directories and group targets by domain.
+
+    Returns URL -> target directory and registrable domain -> URLs.
+    """
+    target_dirs: Dict[str, Path] = {}
+    groups: Dict[str, List[str]] = {}
+    for index, url in enumerate(urls):
+        target_dir = batch_dir / "targets" / f"{index:03d}-{slugify(url)}"
+        target_dir.mkdir(parents=True)
+        target_dirs[url] = target_dir
+        domain, _ = _parse_url(url)
+        groups.setdefault(registrable_domain(domain), []).append(url)
+    for domain in groups:
+        (batch_dir / "domains" / slugify(domain)).mkdir(parents=True)
+    return target_dirs, groups
+
+
+def _batch_discovery_jobs(
+    runner: DockerRunner,
+    batch_dir: Path,
+    options: WebMapOptions,
+    target_dirs: Dict[str, Path],
+    groups: Dict[str, List[str]],
+    wordlist_path: str,
+    env: dict,
+) -> Dict[str, Stage]:
+    """Build per-domain amass/waybackurls and per-target gobuster stages.
+
+    Domain stages come first so the slow passive tools start early.
+    """
+    jobs: Dict[str, Stage] = {}
+    for domain, urls in groups.items():
+        domain_dir = batch_dir / "domains" / slugify(domain)
+        # Keep the single-target URL budget for every target in the group.
+        depth = options.depth * len(urls)
+        jobs[f"{domain}/amass"] = (
+            lambda timeout, d=domain, dd=domain_dir: _run_amass(
+                runner, dd, d, env, timeout
+            )
+        )
+        jobs[f"{domain}/waybackurls"] = (
+            lambda timeout, d=domain, dd=domain_dir, n=depth: _run_waybackurls(
+                runner, dd, d, n, env, timeout
+            )
+        )
+    for url, target_dir in target_dirs.items():
+        jobs[f"{target_dir.name}/gobuster"] = _gobuster_stage(
+            runner, target_dir, url, wordlist_path, options, env
+        )
+    return jobs
+
+
+def _split_domain_results(
+    domain_dir: Path, target_dir: Path, host: str
+) -> None:
+    """Copy the domain's amass and waybackurls lines in scope for a target."""
+    with (target_dir / "waybackurls.txt").open("w", encoding="utf-8") as out:
+        for url in iter_lines(domain_dir / "waybackurls.txt"):
+            if in_scope(urlparse(url).hostname or "", host):
+                out.write(f"{url}\n")
+    with (target_dir / "amass.txt").open("w", encoding="utf-8") as out:
+        for name in iter_lines(domain_dir / "amass.txt"):
+            if in_scope(name.strip(), host):
+                out.write(f"{name.strip()}\n")
+
+
+def _merge_httpx_targets(
+    batch_dir: Path, target_dirs: Dict[str, Path]
+) -> Dict[str, List[Path]]:
+    """Write the union of per-target httpx inputs; return URL -> targets."""
+    owners: Dict[str, List[Path]] = {}
+    for target_dir in target_dirs.values():
+        for url in iter_lines(target_dir / "httpx-targets.txt"):
+            owners.setdefault(url, []).append(target_dir)
+    _write_httpx_targets(batch_dir, list(owners))
+    return owners
+
+
+def _split_httpx_results(
+    batch_dir: Path, owners: Dict[str, List[Path]]
+) -> None:
+    """Route each line of the batch httpx output to the targets that asked.
+
+    At most ``SPLIT_OPEN_FILES`` per-target files are open at once; the
+    least recently written one is closed when another target needs a handle.
+    """
+    for target_dirs in owners.values():
+        for target_dir in target_dirs:
+            (target_dir / "httpx.json").write_text("", encoding="utf-8")
+    handles: OrderedDict[Path, TextIO] = OrderedDict()
+    try:
+        for line in iter_lines(batch_dir / "httpx.json"):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            url = entry.get("input") or entry.get("url")
+            for target_dir in owners.get(url, []):
+                handle = handles.pop(target_dir, None)
+                if handle is None:
+                    if len(handles) >= SPLIT_OPEN_FILES:
+                        handles.popitem(last=False)[1].close()
+                    handle = (target_dir / "httpx.json").open(
+                        "a", encoding="utf-8"
+                    )
+                handles[target_dir] = handle
+                handle.write(f"{line}\n")
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+
+def _target_stages(
+    stages: Dict[str, Dict[str, object]], target_dir: Path, domain: str
+) -> Dict[str, Dict[str, object]]:
+    """Pick the stage records that produced one target's results."""
+    picked = {
+        "gobuster": stages.get(f"{target_dir.name}/gobuster"),
+        "waybackurls": stages.get(f"{domain}/waybackurls"),
+        "amass": stages.get(f"{domain}/amass"),
+        "httpx": stages.get("httpx"),
+    }
+    return {name: status for name, status in picked.items() if status}
+
+
+def run_webmap_batch(options: WebMapOptions, runner: DockerRunner) -> Path:
+    """Map many base URLs at once and return the batch index path.
+
+    Passive discovery runs once per registrable domain, gobuster once per
+    target, and a single httpx job verifies every target's URLs. Each
+    target gets a regular webmap run layout under ``targets/``.
+    """
+    urls = _load_batch_urls(options.urls_file)  # type: ignore[arg-type]
+    wordlist_path, wordlist_digest = _resolve_wordlist(runner, options)
+    runner.ensure_image()
+    batch_dir = runner.new_run_dir(
+        "webmap-batch", options.urls_file.stem  # type: ignore[union-attr]
+    )
+    batch_rel = runner.relative_posix(batch_dir)
+    env = {
+        "RUN_DIR": f"/work/{batch_rel}",
+        "WEBMAP_DEPTH": str(options.depth),
+        "WEBMAP_RATE": str(options.rate),
+    }
+    target_dirs, groups = _batch_layout(batch_dir, urls)
+    for url, target_dir in target_dirs.items():
+        domain, netloc = _parse_url(url)
+        _write_target_data(target_dir, url, domain, netloc, wordlist_digest)
+    logger.info(
+        "webmap batch: %s targets across %s domains", len(urls), len(groups)
+    )
+
+    stages = run_stages(
+        _batch_discovery_jobs(
+            runner,
+            batch_dir,
+            options,
+            target_dirs,
+            groups,
+            wordlist_path,
+            env,
+        ),
+        options.timeout,
+        options.tool_timeouts,
+        workers=options.concurrency,
+    )
+
+    domain_of: Dict[str, str] = {}
+    resolvers = _dns_resolvers(options)
+    for domain, group in groups.items():
+        for url in group:
+            domain_of[url] = domain
+            _split_domain_results(
+                batch_dir / "domains" / slugify(domain),
+                target_dirs[url],
+                _parse_url(url)[0],
+            )
+            _build_metadata(target_dirs[url], options.depth, resolvers)
+
+    owners = _merge_httpx_targets(batch_dir, target_dirs)
+    with closing(_open_probe_cache(runner)) as probes:
+        stages.update(_probe_stage(runner, probes, batch_dir, options, env))
+    _split_httpx_results(batch_dir, owners)
+
+    entries: List[Dict[str, object]] = []
+    for url, target_dir in target_dirs.items():
+        counts = _write_summary(
+            target_dir,
+            options.depth,
+            options.rate,
+            _target_stages(stages, target_dir, domain_of[url]),
+        )
+        entries.append(
+            {
+                "url": url,
+                "domain": domain_of[url],
+                "summary": f"{target_dir.relative_to(batch_dir).as_posix()}"
+                "/webmap.json",
+                "counts": counts,
+            }
+        )
+
+    index = {
         "generated_at": utc_timestamp(),
-        "discovery": {
-            "directories": paths,
-            "historical_urls": historical,
-            "subdomains": subdomains,
-            "http": http_entries,
-        },
+        "urls_file": str(options.urls_file),
+        "targets": entries,
+        "domains": {domain: len(group) for domain, group in groups.items()},
         "artifacts": {
-            "gobuster_json": "gobuster.json",
-            "wayback_urls": "waybackurls.txt",
-            "amass_output": "amass.txt",
+            "httpx_targets": "httpx-targets.txt",
             "httpx_json": "httpx.json",
         },
         "settings": {
-            "depth": int(depth),
-            "rate": int(rate),
+            "depth": int(options.depth),
+            "rate": int(options.rate),
+            "concurrency": int(options.concurrency),
         },
+        "stages": stages,
     }
-
-    _write_csv_summary(run_dir, paths, historical, subdomains, http_entries)
-    write_json(run_dir / "webmap.json", summary)
-    return summary
+    index_path = batch_dir / "batch.json"
+    write_json(index_path, index)
+    return index_path
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -431,7 +1204,10 @@ def _build_summary(run_dir: Path, depth: int, rate: int) -> Dict[str, object]:
 
 def run_webmap(options: WebMapOptions, runner: DockerRunner) -> Path:
     """Run web surface mapping scan."""
+    if options.urls_file is not None:
+        return run_webmap_batch(options, runner)
     descriptor = _descriptor(options)
+    wordlist_path, wordlist_digest = _resolve_wordlist(runner, options)
     key = CacheKey(
         namespace="webmap",
         components=(
@@ -439,7 +1215,8 @@ def run_webmap(options: WebMapOptions, runner: DockerRunner) -> Path:
             descriptor,
             f"depth={options.depth}",
             f"rate={options.rate}",
-            f"wordlist={options.wordlist.name if options.wordlist else 'default'}",
+            f"wordlist={wordlist_digest or 'default'}",
+            f"recursive={int(options.recursive)}",
         ),
     )
 
@@ -458,19 +1235,26 @@ def run_webmap(options: WebMapOptions, runner: DockerRunner) -> Path:
     }
 
     domain, netloc = _parse_url(options.url)
-    _write_target_data(run_dir, options.url, domain, netloc)
+    _write_target_data(run_dir, options.url, domain, netloc, wordlist_digest)
 
-    wordlist_path = _resolve_wordlist(run_dir, run_rel, options.wordlist)
-
-    _run_gobuster(runner, run_rel, options.url, wordlist_path, env)
-    _run_waybackurls(runner, run_dir, domain, options.depth, env)
-    _run_amass(runner, run_dir, domain, env)
+    stages = run_stages(
+        _discovery_jobs(
+            runner, run_dir, run_rel, options, domain, wordlist_path, env
+        ),
+        options.timeout,
+        options.tool_timeouts,
+    )
 
-    _build_metadata(run_dir, options.depth)
-    _run_httpx(runner, run_rel, options.rate, env)
+    _build_metadata(run_dir, options.depth, _dns_resolvers(options))
+    with closing(_open_probe_cache(runner)) as probes:
+        stages.update(_probe_stage(runner, probes, run_dir, options, env))
 
-    summary = _build_summary(run_dir, options.depth, options.rate)
+    _write_summary(run_dir, options.depth, options.rate, stages)
     summary_path = run_dir / "webmap.json"
-    write_json(summary_path, summary)
-    runner.cache_store(key, run_dir, descriptor)
+    if all(stage["status"] == "ok" for stage in stages.values()):
+        runner.cache_store(key, run_dir, descriptor)
+    else:
+        logger.warning(
+            "Not caching %s: some stages did not complete", descriptor
+        )
     return summary_path
@@ -4,16 +4,108 @@ from __future__ import annotations
 
 from pentool.common.cache import check_cache
 from pentool.common.convert import safe_int
+from pentool.common.dns import (
+    Resolution,
+    Resolver,
+    collapse_wildcards,
+    detect_wildcards,
+    parse_resolvers,
+    resolve_names,
+    system_resolvers,
+)
+from pentool.common.extsort import external_sort
 from pentool.common.fileio import (
+    concatenate_files,
     iter_lines,
     iter_lines_buffered,
     iter_lines_mmap,
 )
+from pentool.common.ports import (
+    PortRanks,
+    compress_ports,
+    load_port_ranks,
+    masscan_port_spec,
+    top_ports,
+)
+from pentool.common.probe import (
+    ProbeResult,
+    ServiceSignature,
+    probe_endpoints,
+    signature_endpoints,
+)
+from pentool.common.stages import (
+    Stage,
+    parse_tool_timeouts,
+    run_stages,
+    stage_timeout,
+)
+from pentool.common.store import open_store
+from pentool.common.targets import (
+    TargetPlan,
+    build_target_plan,
+    iter_target_entries,
+    iter_target_file,
+    normalise_host,
+    target_file_digest,
+)
+from pentool.common.urls import (
+    canonicalise_url,
+    collapse_ratio,
+    collapse_urls,
+    in_scope,
+    is_static_url,
+    registrable_domain,
+)
+from pentool.common.wordlists import (
+    ingest_wordlist,
+    wordlist_container_path,
+)
+from pentool.common.zap import ZapClient, wait_for_zap, zap_baseline_scan
 
 __all__ = [
+    "PortRanks",
+    "ProbeResult",
+    "Resolution",
+    "Resolver",
+    "ServiceSignature",
+    "Stage",
+    "TargetPlan",
+    "ZapClient",
+    "build_target_plan",
+    "canonicalise_url",
     "check_cache",
+    "collapse_ratio",
+    "collapse_urls",
+    "collapse_wildcards",
+    "compress_ports",
+    "concatenate_files",
+    "detect_wildcards",
+    "external_sort",
+    "in_scope",
+    "ingest_wordlist",
+    "is_static_url",
     "iter_lines",
     "iter_lines_buffered",
     "iter_lines_mmap",
+    "iter_target_entries",
+    "iter_target_file",
+    "load_port_ranks",
+    "masscan_port_spec",
+    "normalise_host",
+    "open_store",
+    "parse_resolvers",
+    "parse_tool_timeouts",
+    "probe_endpoints",
+    "registrable_domain",
+    "resolve_names",
+    "run_stages",
     "safe_int",
+    "signature_endpoints",
+    "stage_timeout",
+    "system_resolvers",
+    "target_file_digest",
+    "top_ports",
+    "wait_for_zap",
+    "wordlist_container_path",
+    "zap_baseline_scan",
 ]
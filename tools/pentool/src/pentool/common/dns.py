@@ -0,0 +1,320 @@
+"""Concurrent DNS resolution with wildcard-zone detection.
+
+A small asyncio stub resolver sends A and AAAA queries over UDP to the
+configured resolvers, so thousands of passively enumerated names can be
+checked in seconds without extra dependencies. Resolvers are ``ip[:port]``
+strings, which also lets tests point it at a local stub server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import socket
+import string
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DNS_PORT = 53
+DNS_TIMEOUT = 2.0
+DNS_ATTEMPTS = 2
+DNS_CONCURRENCY = 256
+FALLBACK_RESOLVERS = ("1.1.1.1", "8.8.8.8")
+RESOLV_CONF = Path("/etc/resolv.conf")
+
+QTYPE_A = 1
+QTYPE_AAAA = 28
+RCODE_NXDOMAIN = 3
+
+Resolver = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """Outcome of resolving one name.
+
+    ``status`` is ``resolved``, ``nxdomain``, ``nodata`` (the name exists
+    but has no addresses) or ``error`` (no usable answer).
+    """
+
+    status: str
+    addresses: Tuple[str, ...] = ()
+
+
+def parse_resolvers(values: Iterable[str]) -> List[Resolver]:
+    """Parse ``ip[:port]`` resolver strings (IPv6 as ``[addr]:port``)."""
+    resolvers: List[Resolver] = []
+    for value in values:
+        entry = value.strip()
+        if not entry:
+            continue
+        host, port = entry, str(DNS_PORT)
+        if entry.startswith("["):
+            host, _, rest = entry[1:].partition("]")
+            port = rest.lstrip(":") or port
+        elif entry.count(":") == 1:
+            host, port = entry.split(":")
+        try:
+            socket.inet_pton(
+                socket.AF_INET6 if ":" in host else socket.AF_INET, host
+            )
+            resolvers.append((host, int(port)))
+        except (OSError, ValueError):
+            raise RuntimeError(
+                f"Invalid resolver {value!r}; expected IP[:PORT]"
+            ) from None
+    return resolvers
+
+
+def system_resolvers() -> List[Resolver]:
+    """Return the nameservers from resolv.conf, or public fallbacks."""
+    names: List[str] = []
+    if RESOLV_CONF.exists():
+        for line in RESOLV_CONF.read_text(encoding="utf-8").splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and parts[0] == "nameserver":
+                names.append(parts[1].split("%", 1)[0])
+    try:
+        return parse_resolvers(names) or parse_resolvers(FALLBACK_RESOLVERS)
+    except RuntimeError:
+        return parse_resolvers(FALLBACK_RESOLVERS)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Wire format
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _build_query(name: str, qtype: int, ident: int) -> bytes:
+    """Build a recursive query packet for one name and record type."""
+    labels = name.rstrip(".").encode("ascii").split(b".")
+    if any(not label or len(label) > 63 for label in labels):
+        raise ValueError(f"Invalid DNS name: {name}")
+    qname = b"".join(bytes([len(label)]) + label for label in labels)
+    header = struct.pack("!HHHHHH", ident, 0x0100, 1, 0, 0, 0)
+    return header + qname + b"\0" + struct.pack("!HH", qtype, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    """Return the offset just past an encoded (possibly compressed) name."""
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += 1 + length
+
+
+def _parse_response(data: bytes) -> Tuple[int, List[str]]:
+    """Return the response code and A/AAAA addresses of an answer."""
+    _, flags, questions, answers, _, _ = struct.unpack("!HHHHHH", data[:12])
+    offset = 12
+    for _ in range(questions):
+        offset = _skip_name(data, offset) + 4
+    addresses: List[str] = []
+    for _ in range(answers):
+        offset = _skip_name(data, offset)
+        rtype, _, _, length = struct.unpack("!HHIH", data[offset : offset + 10])
+        offset += 10
+        rdata = data[offset : offset + length]
+        offset += length
+        if rtype == QTYPE_A and length == 4:
+            addresses.append(socket.inet_ntop(socket.AF_INET, rdata))
+        elif rtype == QTYPE_AAAA and length == 16:
+            addresses.append(socket.inet_ntop(socket.AF_INET6, rdata))
+    return flags & 0x000F, addresses
+
+
+class _ReplyProtocol(asyncio.DatagramProtocol):
+    """Resolve a future with the first datagram carrying our query id."""
+
+    def __init__(self, future: asyncio.Future, ident: bytes) -> None:
+        self.future = future
+        self.ident = ident
+
+    def datagram_received(self, data: bytes, addr: object) -> None:
+        if data[:2] == self.ident and not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def _exchange(packet: bytes, resolver: Resolver, timeout: float) -> bytes:
+    """Send one query and wait for its reply."""
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _ReplyProtocol(future, packet[:2]), remote_addr=resolver
+    )
+    try:
+        transport.sendto(packet)
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        transport.close()
+
+
+async def _query(
+    name: str,
+    qtype: int,
+    resolvers: Sequence[Resolver],
+    timeout: float,
+    attempts: int,
+) -> Optional[Tuple[int, List[str]]]:
+    """Query one record type, rotating resolvers on failure."""
+    ident = random.randrange(1 << 16)
+    packet = _build_query(name, qtype, ident)
+    start = random.randrange(len(resolvers))
+    for attempt in range(attempts):
+        resolver = resolvers[(start + attempt) % len(resolvers)]
+        try:
+            return _parse_response(await _exchange(packet, resolver, timeout))
+        except (OSError, asyncio.TimeoutError, struct.error, IndexError):
+            continue
+    return None
+
+
+async def _resolve(
+    name: str,
+    resolvers: Sequence[Resolver],
+    timeout: float,
+    attempts: int,
+    limit: asyncio.Semaphore,
+) -> Resolution:
+    """Resolve A and AAAA records of one name."""
+    async with limit:
+        try:
+            replies = await asyncio.gather(
+                *(
+                    _query(name, qtype, resolvers, timeout, attempts)
+                    for qtype in (QTYPE_A, QTYPE_AAAA)
+                )
+            )
+        except (UnicodeError, ValueError):
+            return Resolution("error")
+    answered = [reply for reply in replies if reply is not None]
+    addresses = sorted({addr for _, found in answered for addr in found})
+    if addresses:
+        return Resolution("resolved", tuple(addresses))
+    if any(rcode == RCODE_NXDOMAIN for rcode, _ in answered):
+        return Resolution("nxdomain")
+    if any(rcode == 0 for rcode, _ in answered):
+        return Resolution("nodata")
+    return Resolution("error")
+
+
+async def _resolve_all(
+    names: Sequence[str],
+    resolvers: Sequence[Resolver],
+    timeout: float,
+    attempts: int,
+    concurrency: int,
+) -> List[Resolution]:
+    """Resolve names concurrently under a shared in-flight limit."""
+    limit = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(_resolve(name, resolvers, timeout, attempts, limit) for name in names)
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def resolve_names(
+    names: Iterable[str],
+    *,
+    resolvers: Optional[Sequence[Resolver]] = None,
+    timeout: float = DNS_TIMEOUT,
+    attempts: int = DNS_ATTEMPTS,
+    concurrency: int = DNS_CONCURRENCY,
+) -> Dict[str, Resolution]:
+    """Resolve names concurrently, returning name -> resolution."""
+    unique = sorted({name.strip().lower().rstrip(".") for name in names} - {""})
+    if not unique:
+        return {}
+    results = asyncio.run(
+        _resolve_all(
+            unique,
+            resolvers or system_resolvers(),
+            timeout,
+            attempts,
+            concurrency,
+        )
+    )
+    return dict(zip(unique, results))
+
+
+def _parent_zone(name: str) -> Optional[str]:
+    """Return the zone a name sits in, skipping top-level domains."""
+    _, _, parent = name.partition(".")
+    return parent if parent.count(".") >= 1 else None
+
+
+def detect_wildcards(
+    resolved: Dict[str, Resolution],
+    **options: object,
+) -> Dict[str, Tuple[str, ...]]:
+    """Find wildcard zones among the parents of resolved names.
+
+    Each parent zone is probed with a random label; zones that answer are
+    returned with the addresses the wildcard resolves to. ``options`` are
+    passed to ``resolve_names``.
+    """
+    zones = sorted(
+        {
+            zone
+            for name, result in resolved.items()
+            if result.status == "resolved"
+            for zone in [_parent_zone(name)]
+            if zone
+        }
+    )
+    if not zones:
+        return {}
+    label = "".join(
+        random.choices(string.ascii_lowercase + string.digits, k=20)
+    )
+    probes = {f"{label}.{zone}": zone for zone in zones}
+    results = resolve_names(probes, **options)  # type: ignore[arg-type]
+    return {
+        probes[probe]: result.addresses
+        for probe, result in results.items()
+        if result.status == "resolved"
+    }
+
+
+def collapse_wildcards(
+    resolved: Dict[str, Resolution],
+    wildcards: Dict[str, Tuple[str, ...]],
+) -> Tuple[List[str], int]:
+    """Keep resolved names, folding wildcard matches into one per zone.
+
+    A name is synthetic when its parent is a wildcard zone and it resolves
+    only to the wildcard's addresses. Returns kept names and how many were
+    collapsed.
+    """
+    kept: List[str] = []
+    represented: set[str] = set()
+    collapsed = 0
+    for name in sorted(resolved):
+        result = resolved[name]
+        if result.status != "resolved":
+            continue
+        zone = _parent_zone(name)
+        wildcard = wildcards.get(zone or "")
+        if wildcard is not None and set(result.addresses) <= set(wildcard):
+            if zone in represented:
+                collapsed += 1
+                continue
+            represented.add(zone)  # type: ignore[arg-type]
+        kept.append(name)
+    return kept, collapsed
@@ -0,0 +1,100 @@
+"""Bounded-memory external sort for large line-oriented datasets.
+
+Lines are buffered up to a fixed count, sorted, and spilled to temporary run
+files; the runs are then k-way merged with ``heapq.merge``. Inputs that fit
+in one buffer never touch the disk. Lines must not contain newlines.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_LINES = 1_000_000
+MAX_MERGE_FAN_IN = 64
+
+
+def _spill(lines: Iterable[str], workdir: Path, index: int) -> Path:
+    """Write one sorted run to disk."""
+    path = workdir / f"run-{index:06d}.txt"
+    with path.open("w", encoding="utf-8") as fh:
+        fh.writelines(f"{line}\n" for line in lines)
+    return path
+
+
+def _iter_run(fh: Iterable[str]) -> Iterator[str]:
+    """Iterate a run file without trailing newlines."""
+    for line in fh:
+        yield line[:-1]
+
+
+def _merge_runs(runs: List[Path]) -> Iterator[str]:
+    """K-way merge sorted run files."""
+    with ExitStack() as stack:
+        handles = [
+            stack.enter_context(run.open("r", encoding="utf-8")) for run in runs
+        ]
+        yield from heapq.merge(*(_iter_run(fh) for fh in handles))
+
+
+def _unique(lines: Iterable[str]) -> Iterator[str]:
+    """Drop adjacent duplicates from a sorted stream."""
+    previous: Optional[str] = None
+    for line in lines:
+        if line != previous:
+            yield line
+            previous = line
+
+
+def external_sort(
+    lines: Iterable[str],
+    *,
+    buffer_lines: int = DEFAULT_BUFFER_LINES,
+    unique: bool = False,
+    tmp_dir: Optional[Path] = None,
+) -> Iterator[str]:
+    """Yield ``lines`` in sorted order holding at most ``buffer_lines``.
+
+    With ``unique`` set, duplicates are dropped both when spilling and while
+    merging. More runs than ``MAX_MERGE_FAN_IN`` are merged in several
+    passes so open file handles stay bounded too. The input is consumed in
+    full before the first line is yielded.
+    """
+    if buffer_lines <= 0:
+        raise ValueError("buffer_lines must be positive")
+    order = (lambda values: sorted(set(values))) if unique else sorted
+    with tempfile.TemporaryDirectory(prefix="extsort-", dir=tmp_dir) as tmp:
+        workdir = Path(tmp)
+        runs: List[Path] = []
+        buffer: List[str] = []
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= buffer_lines:
+                runs.append(_spill(order(buffer), workdir, len(runs)))
+                buffer = []
+        if not runs:
+            yield from order(buffer)
+            return
+        if buffer:
+            runs.append(_spill(order(buffer), workdir, len(runs)))
+            buffer = []
+        logger.debug("External sort merging %s runs", len(runs))
+
+        spilled = len(runs)
+        while len(runs) > MAX_MERGE_FAN_IN:
+            batch, runs = runs[:MAX_MERGE_FAN_IN], runs[MAX_MERGE_FAN_IN:]
+            merged = _merge_runs(batch)
+            runs.append(
+                _spill(_unique(merged) if unique else merged, workdir, spilled)
+            )
+            spilled += 1
+            for run in batch:
+                run.unlink()
+        merged = _merge_runs(runs)
+        yield from _unique(merged) if unique else merged
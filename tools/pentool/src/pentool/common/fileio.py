@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import mmap
+import shutil
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Sequence
 
 
 def iter_lines_mmap(path: Path) -> Iterator[str]:
@@ -43,3 +44,12 @@ def iter_lines(path: Path) -> Iterator[str]:
         yield from iter_lines_mmap(path)
     except Exception:
         yield from iter_lines_buffered(path)
+
+
+def concatenate_files(sources: Sequence[Path], destination: Path) -> None:
+    """Concatenate files into ``destination``, skipping missing sources."""
+    with destination.open("wb") as out:
+        for source in sources:
+            if source.exists():
+                with source.open("rb") as fh:
+                    shutil.copyfileobj(fh, out)
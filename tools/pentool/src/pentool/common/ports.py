@@ -0,0 +1,190 @@
+"""Port frequency ranking and masscan port specifications."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pentool.common.convert import safe_int
+from pentool.constants import port_ranks_content
+
+logger = logging.getLogger(__name__)
+
+MAX_PORT = 65535
+PROTOCOLS = ("tcp", "udp")
+# Tier lines with this prefix list ports known to follow the ranked ones but
+# without a usable order among themselves.
+UNRANKED_PREFIX = "unranked"
+
+
+@dataclass(frozen=True)
+class PortRanks:
+    """Ports per protocol, most frequently open first.
+
+    Only the first ``ranked[proto]`` ports of ``ports[proto]`` are in true
+    frequency order; the rest form one unordered tier.
+    """
+
+    ports: Dict[str, Tuple[int, ...]]
+    ranked: Dict[str, int]
+
+
+def iter_port_spec(spec: str) -> Iterator[int]:
+    """Expand a ``80,443,8000-8010`` style spec in written order."""
+    for token in spec.split(","):
+        start, _, end = token.strip().partition("-")
+        first = safe_int(start)
+        last = safe_int(end) if end else first
+        if first is None or last is None:
+            continue
+        yield from range(first, last + 1)
+
+
+def compress_ports(ports: Iterable[int]) -> str:
+    """Render ports as an ascending, range-compressed spec."""
+    ordered = sorted(set(ports))
+    parts: List[str] = []
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1] == ordered[j] + 1:
+            j += 1
+        parts.append(
+            str(ordered[i]) if i == j else f"{ordered[i]}-{ordered[j]}"
+        )
+        i = j + 1
+    return ",".join(parts)
+
+
+def masscan_port_spec(tcp: Sequence[int], udp: Sequence[int] = ()) -> str:
+    """Build a masscan ``--ports`` value, prefixing UDP ranges with ``U:``."""
+    parts = [compress_ports(tcp)] if tcp else []
+    if udp:
+        parts.extend(f"U:{token}" for token in compress_ports(udp).split(","))
+    return ",".join(parts)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Ranking tables
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def parse_port_ranks(lines: Iterable[str]) -> PortRanks:
+    """Parse ``[unranked] <proto> <spec>`` tier lines into a ``PortRanks``.
+
+    Ranking for a protocol ends at its first ``unranked`` tier.
+    """
+    ports: Dict[str, List[int]] = {proto: [] for proto in PROTOCOLS}
+    ranked: Dict[str, Optional[int]] = {proto: None for proto in PROTOCOLS}
+    seen: Dict[str, set[int]] = {proto: set() for proto in PROTOCOLS}
+    for line in lines:
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        proto, _, spec = entry.partition(" ")
+        unranked = proto == UNRANKED_PREFIX
+        if unranked:
+            proto, _, spec = spec.strip().partition(" ")
+        if proto not in ports:
+            continue
+        if unranked and ranked[proto] is None:
+            ranked[proto] = len(ports[proto])
+        for port in iter_port_spec(spec):
+            if 0 < port <= MAX_PORT and port not in seen[proto]:
+                seen[proto].add(port)
+                ports[proto].append(port)
+    return PortRanks(
+        ports={proto: tuple(values) for proto, values in ports.items()},
+        ranked={
+            proto: len(ports[proto]) if depth is None else depth
+            for proto, depth in ranked.items()
+        },
+    )
+
+
+def rank_nmap_services(lines: Iterable[str]) -> List[Tuple[str, List[int]]]:
+    """Group nmap-services entries into tiers of equal open frequency."""
+    tiers: Dict[Tuple[str, float], List[int]] = {}
+    for line in lines:
+        fields = line.split("#", 1)[0].split()
+        if len(fields) < 3:
+            continue
+        port_str, _, proto = fields[1].partition("/")
+        port = safe_int(port_str)
+        try:
+            freq = float(fields[2])
+        except ValueError:
+            continue
+        if proto not in PROTOCOLS or port is None or freq <= 0:
+            continue
+        tiers.setdefault((proto, freq), []).append(port)
+    ordered = sorted(tiers, key=lambda item: (item[0], -item[1]))
+    return [(proto, tiers[(proto, freq)]) for proto, freq in ordered]
+
+
+def render_port_ranks(tiers: Iterable[Tuple[str, List[int]]]) -> str:
+    """Render tiers in the resource format consumed by ``parse_port_ranks``."""
+    lines = ["# Port frequency ranking derived from nmap-services."]
+    lines.extend(f"{proto} {compress_ports(ports)}" for proto, ports in tiers)
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=4)
+def load_port_ranks(override: Optional[Path] = None) -> PortRanks:
+    """Load the ranking from ``override`` when present, else the bundled table."""
+    if override is not None and override.exists():
+        text = override.read_text(encoding="utf-8")
+    else:
+        text = port_ranks_content()
+    return parse_port_ranks(text.splitlines())
+
+
+def top_ports(
+    count: int,
+    protocol: str = "tcp",
+    ranks: Optional[PortRanks] = None,
+) -> List[int]:
+    """Return the ``count`` most frequently open ports for a protocol.
+
+    Past the ranked head, ports come from the unordered tier and then in
+    ascending numeric order, so any count up to 65535 yields exactly that
+    many unique ports; a warning says when the count leaves the ranking.
+    """
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unsupported protocol: {protocol}")
+    count = max(0, min(count, MAX_PORT))
+    table = ranks or load_port_ranks()
+    listed = table.ports[protocol]
+    depth = table.ranked[protocol]
+    if count > len(listed):
+        logger.warning(
+            "Only %s %s ports are known to the port table; the other %s of"
+            " the top %s follow in ascending port order. Run 'pentool"
+            " update' for the full nmap-services ranking",
+            len(listed),
+            protocol.upper(),
+            count - len(listed),
+            count,
+        )
+    elif count > depth:
+        logger.warning(
+            "Only the top %s %s ports are ranked; the remaining %s of the"
+            " top %s are taken from an unordered tier. Run 'pentool update'"
+            " for the full nmap-services ranking",
+            depth,
+            protocol.upper(),
+            count - depth,
+            count,
+        )
+    picked = list(listed[:count])
+    if len(picked) < count:
+        taken = set(picked)
+        for port in range(1, MAX_PORT + 1):
+            if port not in taken:
+                picked.append(port)
+                if len(picked) == count:
+                    break
+    return picked
@@ -0,0 +1,179 @@
+"""Lightweight handshake probes and cheap signatures for live endpoints.
+
+Probes connect directly from the host process: they do not go through the
+container network or the proxy settings the scanning tools use, so an
+endpoint reachable only through that path looks silent here.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import socket
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 3.0
+PROBE_WORKERS = 64
+PROBE_READ_BYTES = 16
+# Signature checks wait this long for a server-first greeting (SSH, SMTP...).
+BANNER_WAIT = 1.0
+BANNER_BYTES = 256
+
+Endpoint = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """What an endpoint speaks, as far as a handshake can tell.
+
+    ``answered`` is False when the endpoint refused, timed out or stayed
+    silent, in which case ``tls`` and ``http`` carry no information.
+    """
+
+    tls: bool
+    http: bool
+    answered: bool = True
+
+
+@dataclass(frozen=True)
+class ServiceSignature:
+    """Cheap fingerprint of a live endpoint used to spot unchanged services."""
+
+    banner_hash: str
+    cert_fingerprint: str
+
+
+def _http_request(host: str) -> bytes:
+    """Build a minimal HTTP request for ``host``."""
+    return f"HEAD / HTTP/1.0\r\nHost: {host}\r\n\r\n".encode("ascii", "replace")
+
+
+def _speaks_http(sock: socket.socket, host: str) -> Optional[bool]:
+    """Send a HEAD request and check the reply starts like HTTP.
+
+    Returns None when no reply arrives before the socket timeout.
+    """
+    try:
+        sock.sendall(_http_request(host))
+        return sock.recv(PROBE_READ_BYTES).startswith(b"HTTP/")
+    except socket.timeout:
+        return None
+    except (OSError, ssl.SSLError):
+        return False
+
+
+def _tls_context() -> ssl.SSLContext:
+    """Build a permissive context; the probe only needs the handshake."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def probe_endpoint(
+    host: str, port: int, timeout: float = PROBE_TIMEOUT
+) -> ProbeResult:
+    """Classify an endpoint by attempting a TLS handshake, then plain HTTP."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as raw:
+            with _tls_context().wrap_socket(
+                raw, server_hostname=host
+            ) as tls_sock:
+                http = _speaks_http(tls_sock, host)
+                return ProbeResult(tls=True, http=bool(http))
+    except (ssl.SSLError, ConnectionResetError, socket.timeout):
+        pass
+    except OSError as exc:
+        logger.debug("Probe of %s:%s failed: %s", host, port, exc)
+        return ProbeResult(tls=False, http=False, answered=False)
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            http = _speaks_http(sock, host)
+            return ProbeResult(
+                tls=False, http=bool(http), answered=http is not None
+            )
+    except OSError as exc:
+        logger.debug("Probe of %s:%s failed: %s", host, port, exc)
+        return ProbeResult(tls=False, http=False, answered=False)
+
+
+def probe_endpoints(
+    endpoints: Iterable[Endpoint],
+    *,
+    timeout: float = PROBE_TIMEOUT,
+    workers: int = PROBE_WORKERS,
+) -> Dict[Endpoint, ProbeResult]:
+    """Probe endpoints concurrently, returning endpoint -> result."""
+    unique = sorted(set(endpoints))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+        results = pool.map(
+            lambda endpoint: probe_endpoint(*endpoint, timeout=timeout), unique
+        )
+        return dict(zip(unique, results))
+
+
+def _read_greeting(host: str, port: int, timeout: float) -> Optional[bytes]:
+    """Return the first line a server sends unprompted, or None if closed."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.settimeout(min(timeout, BANNER_WAIT))
+            try:
+                data = sock.recv(BANNER_BYTES)
+            except (socket.timeout, ConnectionResetError):
+                data = b""
+    except OSError as exc:
+        logger.debug("Signature of %s:%s failed: %s", host, port, exc)
+        return None
+    return data.split(b"\n", 1)[0].strip()
+
+
+def _certificate_fingerprint(host: str, port: int, timeout: float) -> str:
+    """Return the SHA-256 fingerprint of the leaf certificate, if any."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as raw:
+            with _tls_context().wrap_socket(
+                raw, server_hostname=host
+            ) as tls_sock:
+                der = tls_sock.getpeercert(binary_form=True)
+    except (OSError, ssl.SSLError):
+        return ""
+    return hashlib.sha256(der).hexdigest() if der else ""
+
+
+def grab_signature(
+    host: str, port: int, timeout: float = PROBE_TIMEOUT
+) -> Optional[ServiceSignature]:
+    """Take a cheap signature: greeting banner hash, else TLS certificate.
+
+    Returns None when the endpoint does not accept connections.
+    """
+    greeting = _read_greeting(host, port, timeout)
+    if greeting is None:
+        return None
+    if greeting:
+        return ServiceSignature(hashlib.sha256(greeting).hexdigest(), "")
+    return ServiceSignature("", _certificate_fingerprint(host, port, timeout))
+
+
+def signature_endpoints(
+    endpoints: Iterable[Endpoint],
+    *,
+    timeout: float = PROBE_TIMEOUT,
+    workers: int = PROBE_WORKERS,
+) -> Dict[Endpoint, Optional[ServiceSignature]]:
+    """Take signatures concurrently, returning endpoint -> signature."""
+    unique = sorted(set(endpoints))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+        results = pool.map(
+            lambda endpoint: grab_signature(*endpoint, timeout=timeout), unique
+        )
+        return dict(zip(unique, results))
@@ -0,0 +1,94 @@
+"""Concurrent execution of independent tool stages with per-stage timeouts."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Mapping, Optional
+
+from pentool.docker_runner import ContainerTimeout
+
+logger = logging.getLogger(__name__)
+
+# A stage receives its timeout in seconds (None for unbounded).
+Stage = Callable[[Optional[float]], None]
+
+
+def parse_tool_timeouts(values: Iterable[str]) -> Dict[str, float]:
+    """Parse ``TOOL=SECONDS`` pairs into a timeout mapping."""
+    timeouts: Dict[str, float] = {}
+    for value in values:
+        tool, sep, seconds = value.partition("=")
+        try:
+            parsed = float(seconds)
+        except ValueError:
+            parsed = -1.0
+        if not sep or not tool.strip() or parsed <= 0:
+            raise RuntimeError(
+                f"Invalid tool timeout {value!r}; expected TOOL=SECONDS"
+            )
+        timeouts[tool.strip().lower()] = parsed
+    return timeouts
+
+
+def stage_timeout(
+    name: str,
+    default: Optional[float],
+    overrides: Mapping[str, float],
+) -> Optional[float]:
+    """Return the timeout for a stage, preferring a per-tool override.
+
+    Stage names may carry a group prefix such as ``shard-01/nmap``; overrides
+    are looked up by the tool part.
+    """
+    timeout = overrides.get(name.rpartition("/")[2], default)
+    return timeout if timeout and timeout > 0 else None
+
+
+def _run_stage(
+    name: str, stage: Stage, timeout: Optional[float]
+) -> Dict[str, object]:
+    """Run one stage and describe how it ended instead of raising."""
+    started = time.monotonic()
+    status: Dict[str, object] = {"status": "ok"}
+    try:
+        stage(timeout)
+    except ContainerTimeout as exc:
+        logger.warning("%s timed out after %ss", name, timeout)
+        status = {"status": "timeout", "error": str(exc)}
+    except Exception as exc:  # isolate stage failures from each other
+        logger.warning("%s failed: %s", name, exc)
+        status = {"status": "failed", "error": str(exc)}
+    status["timeout"] = timeout
+    status["seconds"] = round(time.monotonic() - started, 3)
+    return status
+
+
+def run_stages(
+    stages: Mapping[str, Stage],
+    default_timeout: Optional[float] = None,
+    timeouts: Optional[Mapping[str, float]] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Dict[str, object]]:
+    """Run stages concurrently and return per-stage status records.
+
+    A failing or timed-out stage never cancels the others; callers merge
+    whatever artifacts each stage managed to write. ``workers`` caps how
+    many stages run at once; stages start in mapping order.
+    """
+    if not stages:
+        return {}
+    overrides = timeouts or {}
+    limit = min(workers, len(stages)) if workers else len(stages)
+    with ThreadPoolExecutor(max_workers=max(limit, 1)) as pool:
+        futures = {
+            name: pool.submit(
+                _run_stage,
+                name,
+                stage,
+                stage_timeout(name, default_timeout, overrides),
+            )
+            for name, stage in stages.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,23 @@
+"""Persistent sqlite stores shared across runs."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+STORE_TIMEOUT = 30.0
+
+
+def open_store(path: Path, schema: str) -> sqlite3.Connection:
+    """Open (creating if needed) a WAL-mode sqlite store with ``schema``.
+
+    The schema must be idempotent (``CREATE ... IF NOT EXISTS``) since it is
+    applied on every open.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=STORE_TIMEOUT)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    return conn
@@ -0,0 +1,374 @@
+"""Target planning: parse, resolve, merge and exclude scan targets.
+
+Scope entries may be CIDRs, address ranges (``10.0.0.1-10.0.0.50`` or the
+short ``10.0.0.1-50`` form), single addresses or hostnames. Everything is
+reduced to sorted, non-overlapping integer intervals per address family so
+overlapping customer scope files collapse to a single sweep and exclusions
+subtract in linear time after sorting.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import ipaddress
+import logging
+import re
+import socket
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pentool.common.fileio import iter_lines
+
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[int, int]
+ParsedTarget = Union[Tuple[int, int, int], str]
+
+RESOLVE_WORKERS = 32
+
+_LABEL = r"[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9_])?"
+_HOSTNAME_RE = re.compile(rf"^{_LABEL}(?:\.{_LABEL})*\.?$", re.IGNORECASE)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Parsing
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _parse_range(value: str) -> Optional[Tuple[int, int, int]]:
+    """Parse ``start-end`` or short IPv4 ``a.b.c.d-e`` ranges."""
+    left, _, right = value.partition("-")
+    try:
+        start = ipaddress.ip_address(left.strip())
+    except ValueError:
+        return None
+    right = right.strip()
+    if start.version == 4 and right.isdigit():
+        last = int(right)
+        if last > 255:
+            return None
+        end_int = (int(start) & ~0xFF) | last
+    else:
+        try:
+            end = ipaddress.ip_address(right)
+        except ValueError:
+            return None
+        if end.version != start.version:
+            return None
+        end_int = int(end)
+    lo, hi = sorted((int(start), end_int))
+    return start.version, lo, hi
+
+
+def parse_target_spec(value: str) -> Optional[ParsedTarget]:
+    """Parse one scope entry into ``(version, start, end)`` or a hostname."""
+    entry = value.strip()
+    if not entry:
+        return None
+    if "/" in entry:
+        try:
+            net = ipaddress.ip_network(entry, strict=False)
+        except ValueError:
+            return None
+        return (
+            net.version,
+            int(net.network_address),
+            int(net.broadcast_address),
+        )
+    if "-" in entry:
+        parsed = _parse_range(entry)
+        if parsed:
+            return parsed
+    try:
+        addr = ipaddress.ip_address(entry)
+    except ValueError:
+        pass
+    else:
+        return addr.version, int(addr), int(addr)
+    if _HOSTNAME_RE.match(entry):
+        return entry.lower().rstrip(".")
+    return None
+
+
+def iter_target_entries(lines: Iterable[str]) -> Iterator[str]:
+    """Yield scope entries from lines, dropping comments and separators."""
+    for line in lines:
+        content = line.split("#", 1)[0]
+        for token in re.split(r"[\s,]+", content):
+            if token:
+                yield token
+
+
+def iter_target_file(path: Path) -> Iterator[str]:
+    """Yield scope entries from a targets or exclusion file."""
+    if not path.exists():
+        raise RuntimeError(f"Targets file not found: {path}")
+    yield from iter_target_entries(iter_lines(path))
+
+
+def target_file_digest(path: Path) -> str:
+    """Return the SHA-256 of a targets or exclusion file's contents.
+
+    Cache keys use it so editing a file in place invalidates cached runs.
+    """
+    if not path.exists():
+        raise RuntimeError(f"Targets file not found: {path}")
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalise_host(host: str) -> str:
+    """Return the canonical form of an address literal, or the lowercased host."""
+    try:
+        return str(ipaddress.ip_address(host.strip("[]")))
+    except ValueError:
+        return host.strip().lower().rstrip(".")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Interval arithmetic
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and coalesce overlapping or adjacent inclusive intervals."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(
+    include: Sequence[Interval], exclude: Sequence[Interval]
+) -> List[Interval]:
+    """Remove merged ``exclude`` intervals from merged ``include`` intervals."""
+    result: List[Interval] = []
+    j = 0
+    for start, end in include:
+        while j < len(exclude) and exclude[j][1] < start:
+            j += 1
+        k = j
+        cursor = start
+        while k < len(exclude) and exclude[k][0] <= end:
+            ex_start, ex_end = exclude[k]
+            if ex_start > cursor:
+                result.append((cursor, ex_start - 1))
+            cursor = max(cursor, ex_end + 1)
+            if cursor > end:
+                break
+            k += 1
+        if cursor <= end:
+            result.append((cursor, end))
+    return result
+
+
+def _address(
+    version: int, value: int
+) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+    """Build an address object of the given family from its integer value."""
+    if version == 4:
+        return ipaddress.IPv4Address(value)
+    return ipaddress.IPv6Address(value)
+
+
+def _render_interval(version: int, start: int, end: int) -> str:
+    """Render an interval as an address, CIDR or ``start-end`` range."""
+    first = _address(version, start)
+    if start == end:
+        return str(first)
+    size = end - start + 1
+    if size & (size - 1) == 0 and start % size == 0:
+        prefix = first.max_prefixlen - (size.bit_length() - 1)
+        return f"{first}/{prefix}"
+    return f"{first}-{_address(version, end)}"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Resolution
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _resolve_one(name: str) -> List[str]:
+    """Resolve a hostname to its unique addresses."""
+    try:
+        infos = socket.getaddrinfo(name, None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError, OSError) as exc:
+        logger.debug("Failed to resolve %s: %s", name, exc)
+        return []
+    return sorted({normalise_host(str(info[4][0])) for info in infos})
+
+
+def resolve_hostnames(
+    names: Iterable[str], *, workers: int = RESOLVE_WORKERS
+) -> Dict[str, List[str]]:
+    """Resolve hostnames concurrently, returning name -> addresses."""
+    unique = sorted(set(names))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+        return dict(zip(unique, pool.map(_resolve_one, unique)))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Plans
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class TargetPlan:
+    """Normalised, deduplicated scan scope."""
+
+    intervals: Dict[int, List[Interval]]
+    resolved: Dict[str, List[str]] = field(default_factory=dict)
+    unresolved: Tuple[str, ...] = ()
+    hostnames: frozenset = frozenset()
+
+    @property
+    def address_count(self) -> int:
+        """Number of addresses covered by the plan."""
+        return sum(
+            end - start + 1
+            for spans in self.intervals.values()
+            for start, end in spans
+        )
+
+    def iter_ranges(self) -> Iterator[str]:
+        """Yield masscan-compatible range lines, IPv4 first."""
+        for version in sorted(self.intervals):
+            for start, end in self.intervals[version]:
+                yield _render_interval(version, start, end)
+
+    def iter_shards(
+        self, max_addresses: int
+    ) -> Iterator[Tuple[List[str], int]]:
+        """Yield ``(ranges, address_count)`` chunks of at most ``max_addresses``."""
+        if max_addresses <= 0:
+            raise ValueError("max_addresses must be positive")
+        shard: List[str] = []
+        room = max_addresses
+        for version in sorted(self.intervals):
+            for start, end in self.intervals[version]:
+                while start <= end:
+                    stop = min(end, start + room - 1)
+                    shard.append(_render_interval(version, start, stop))
+                    room -= stop - start + 1
+                    start = stop + 1
+                    if room == 0:
+                        yield shard, max_addresses
+                        shard, room = [], max_addresses
+        if shard:
+            yield shard, max_addresses - room
+
+    def contains(self, host: str) -> bool:
+        """Return True when an address literal or hostname is in the plan."""
+        try:
+            addr = ipaddress.ip_address(host.strip("[]"))
+        except ValueError:
+            return normalise_host(host) in self.hostnames
+        spans = self.intervals.get(addr.version, [])
+        idx = bisect_right(spans, (int(addr), float("inf"))) - 1
+        return idx >= 0 and spans[idx][0] <= int(addr) <= spans[idx][1]
+
+    def write(self, path: Path) -> None:
+        """Write the plan as one range per line."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fh:
+            fh.writelines(f"{line}\n" for line in self.iter_ranges())
+
+    def describe(self) -> Dict[str, object]:
+        """Summarise the plan for JSON artifacts."""
+        return {
+            "address_count": self.address_count,
+            "ranges": sum(len(v) for v in self.intervals.values()),
+            "resolved": self.resolved,
+            "unresolved": list(self.unresolved),
+        }
+
+
+def _collect_intervals(
+    entries: Iterable[str],
+) -> Tuple[Dict[int, List[Interval]], List[str]]:
+    """Split entries into per-family intervals and hostnames."""
+    intervals: Dict[int, List[Interval]] = {4: [], 6: []}
+    names: List[str] = []
+    for entry in entries:
+        parsed = parse_target_spec(entry)
+        if parsed is None:
+            logger.warning("Ignoring unparseable target %r", entry)
+        elif isinstance(parsed, str):
+            names.append(parsed)
+        else:
+            version, start, end = parsed
+            intervals[version].append((start, end))
+    return intervals, names
+
+
+def _add_resolved(
+    intervals: Dict[int, List[Interval]], resolved: Dict[str, List[str]]
+) -> None:
+    """Fold resolved hostname addresses into the interval lists."""
+    for addresses in resolved.values():
+        for address in addresses:
+            addr = ipaddress.ip_address(address)
+            intervals[addr.version].append((int(addr), int(addr)))
+
+
+def build_target_plan(
+    entries: Iterable[str],
+    excludes: Iterable[str] = (),
+    *,
+    resolve: bool = True,
+) -> TargetPlan:
+    """Build a merged plan from scope entries minus exclusions.
+
+    Hostnames are resolved in bulk when ``resolve`` is set; excluded
+    hostnames are matched by name and their addresses are subtracted too.
+    """
+    include, names = _collect_intervals(entries)
+    exclude, excluded_names = _collect_intervals(excludes)
+    excluded_set = set(excluded_names)
+    hostnames = sorted(set(names) - excluded_set)
+
+    resolved: Dict[str, List[str]] = {}
+    unresolved: Tuple[str, ...] = ()
+    if resolve and (hostnames or excluded_set):
+        lookups = resolve_hostnames([*hostnames, *excluded_set])
+        resolved = {n: lookups[n] for n in hostnames if lookups.get(n)}
+        unresolved = tuple(n for n in hostnames if n not in resolved)
+        _add_resolved(exclude, {n: lookups[n] for n in excluded_set})
+        _add_resolved(include, resolved)
+        for name in unresolved:
+            logger.warning("Target %s did not resolve; skipping", name)
+
+    merged = {
+        version: subtract_intervals(
+            merge_intervals(include[version]),
+            merge_intervals(exclude[version]),
+        )
+        for version in (4, 6)
+    }
+    return TargetPlan(
+        intervals={v: spans for v, spans in merged.items() if spans},
+        resolved=resolved,
+        unresolved=unresolved,
+        hostnames=frozenset(hostnames),
+    )
@@ -0,0 +1,190 @@
+"""URL canonicalisation and near-duplicate collapsing ahead of HTTP probing.
+
+Archived URL lists are dominated by variants of the same endpoint: different
+query values, tracking parameters, fragments, host case or trailing slashes.
+URLs are normalised, then collapsed to one representative per (scheme, host,
+path, parameter-name set), with static assets dropped and the number of
+representatives per host and first path segment capped.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+DEFAULT_PREFIX_LIMIT = 50
+TRACKING_PARAMETERS = frozenset(
+    {"_ga", "dclid", "fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "msclkid"}
+)
+TRACKING_PREFIXES = ("utm_",)
+# Paths with these suffixes are assets, not attack surface.
+STATIC_EXTENSIONS = (
+    ".bmp",
+    ".css",
+    ".eot",
+    ".gif",
+    ".ico",
+    ".jpeg",
+    ".jpg",
+    ".mp3",
+    ".mp4",
+    ".otf",
+    ".png",
+    ".svg",
+    ".ttf",
+    ".webm",
+    ".webp",
+    ".woff",
+    ".woff2",
+)
+
+# Public suffixes under which registrations happen one level deeper.
+MULTI_LABEL_SUFFIXES = frozenset(
+    {
+        "ac.uk",
+        "co.in",
+        "co.jp",
+        "co.kr",
+        "co.nz",
+        "co.uk",
+        "co.za",
+        "com.au",
+        "com.br",
+        "com.cn",
+        "com.mx",
+        "com.sg",
+        "com.tr",
+        "gov.uk",
+        "net.au",
+        "org.au",
+        "org.uk",
+    }
+)
+
+CollapseKey = Tuple[str, str, str, Tuple[str, ...]]
+
+
+def _is_tracking(name: str) -> bool:
+    """Return True for analytics parameters that never change a response."""
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMETERS or lowered.startswith(
+        TRACKING_PREFIXES
+    )
+
+
+def canonicalise_url(url: str) -> Optional[str]:
+    """Normalise an http(s) URL, or return None for anything else.
+
+    Scheme and host are lowercased, default ports, fragments and tracking
+    parameters dropped, repeated and trailing slashes removed and the query
+    sorted. Path case is kept since servers may treat it as significant.
+    """
+    try:
+        parsed = urlsplit(url.strip())
+        port = parsed.port
+    except ValueError:
+        return None
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").rstrip(".")
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+    netloc = f"[{host}]" if ":" in host else host
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+    path = re.sub(r"/{2,}", "/", parsed.path).rstrip("/") or "/"
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking(name)
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def registrable_domain(host: str) -> str:
+    """Approximate the registrable domain of a host name.
+
+    Uses the last two labels, or three under a known multi-label suffix;
+    IP addresses and single-label names are returned unchanged.
+    """
+    host = host.lower().rstrip(".")
+    labels = host.split(".")
+    if ":" in host or labels[-1].isdigit() or len(labels) <= 2:
+        return host
+    size = 3 if ".".join(labels[-2:]) in MULTI_LABEL_SUFFIXES else 2
+    return ".".join(labels[-size:])
+
+
+def in_scope(host: str, scope: str) -> bool:
+    """Return True when ``host`` is ``scope`` or one of its subdomains."""
+    host = host.lower().rstrip(".")
+    return host == scope or host.endswith(f".{scope}")
+
+
+def is_static_url(url: str) -> bool:
+    """Return True when the URL path points at a static asset."""
+    try:
+        path = urlsplit(url).path
+    except ValueError:
+        return False
+    return path.lower().endswith(STATIC_EXTENSIONS)
+
+
+def _collapse_key(canonical: str) -> Tuple[CollapseKey, str]:
+    """Return the collapse key and path prefix of a canonical URL."""
+    parts = urlsplit(canonical)
+    names = tuple(sorted({name for name, _ in parse_qsl(parts.query, True)}))
+    segment = parts.path.split("/", 2)[1]
+    prefix = f"{parts.scheme}://{parts.netloc}/{segment}"
+    return (parts.scheme, parts.netloc, parts.path, names), prefix
+
+
+def collapse_urls(
+    urls: Iterable[str], *, prefix_limit: int = DEFAULT_PREFIX_LIMIT
+) -> Tuple[List[str], Dict[str, int]]:
+    """Canonicalise and collapse URLs, returning representatives and counts.
+
+    The first URL seen for each key is kept, so callers should list their
+    most trusted sources first. Counts cover every reason a URL was dropped.
+    """
+    stats = {
+        "input": 0,
+        "invalid": 0,
+        "static": 0,
+        "collapsed": 0,
+        "capped": 0,
+        "output": 0,
+    }
+    seen: set[CollapseKey] = set()
+    per_prefix: Dict[str, int] = defaultdict(int)
+    kept: List[str] = []
+    for url in urls:
+        stats["input"] += 1
+        canonical = canonicalise_url(url)
+        if canonical is None:
+            stats["invalid"] += 1
+            continue
+        if is_static_url(canonical):
+            stats["static"] += 1
+            continue
+        key, prefix = _collapse_key(canonical)
+        if key in seen:
+            stats["collapsed"] += 1
+            continue
+        if per_prefix[prefix] >= prefix_limit:
+            stats["capped"] += 1
+            continue
+        seen.add(key)
+        per_prefix[prefix] += 1
+        kept.append(canonical)
+    stats["output"] = len(kept)
+    return kept, stats
+
+
+def collapse_ratio(stats: Dict[str, int]) -> float:
+    """Return how many input URLs each kept URL stands for."""
+    if not stats.get("output"):
+        return 0.0
+    return round(stats["input"] / stats["output"], 2)
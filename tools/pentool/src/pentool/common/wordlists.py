@@ -0,0 +1,105 @@
+"""Content-addressed wordlist store shared by all runs.
+
+Custom wordlists are streamed into the store once, named by the SHA-256 of
+their stored content, and mounted read-only into containers, so a run only
+needs to record the hash. An index keyed by source path, size and mtime lets
+repeat runs skip rehashing unchanged files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator
+
+from pentool.common.extsort import external_sort
+from pentool.docker_runner import file_lock
+
+logger = logging.getLogger(__name__)
+
+# DockerRunner mounts the store here read-only.
+WORDLIST_MOUNT = "/wordlists"
+INDEX_FILENAME = "index.json"
+COPY_CHUNK = 1 << 20
+
+
+def wordlist_container_path(digest: str) -> str:
+    """Return where a stored wordlist appears inside containers."""
+    return f"{WORDLIST_MOUNT}/{digest}.txt"
+
+
+def _source_key(source: Path, dedup: bool) -> str:
+    """Identify a source file version without reading it."""
+    stat = source.stat()
+    return f"{source.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{int(dedup)}"
+
+
+def _iter_words(source: Path) -> Iterator[str]:
+    """Yield the non-blank entries of a wordlist."""
+    with source.open("r", encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            word = line.strip()
+            if word:
+                yield word
+
+
+def _copy_hashed(source: Path, out: BinaryIO, dedup: bool) -> str:
+    """Stream ``source`` into ``out``, returning the SHA-256 of the output."""
+    digest = hashlib.sha256()
+    if dedup:
+        for word in external_sort(_iter_words(source), unique=True):
+            data = f"{word}\n".encode("utf-8")
+            digest.update(data)
+            out.write(data)
+        return digest.hexdigest()
+    with source.open("rb") as fh:
+        while chunk := fh.read(COPY_CHUNK):
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+def ingest_wordlist(store: Path, source: Path, *, dedup: bool = False) -> str:
+    """Add a wordlist to the store and return its content hash.
+
+    With ``dedup`` set, entries are stripped, blank lines dropped and the
+    rest sorted and deduplicated on the way in.
+    """
+    if not source.is_file():
+        raise RuntimeError(f"Wordlist not found: {source}")
+    store.mkdir(parents=True, exist_ok=True)
+    key = _source_key(source, dedup)
+    with file_lock(store / ".lock"):
+        index_path = store / INDEX_FILENAME
+        index: Dict[str, str] = (
+            json.loads(index_path.read_text(encoding="utf-8"))
+            if index_path.exists()
+            else {}
+        )
+        digest = index.get(key)
+        if digest and (store / f"{digest}.txt").exists():
+            return digest
+
+        fd, tmp_name = tempfile.mkstemp(dir=store, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                digest = _copy_hashed(source, out, dedup)
+            target = store / f"{digest}.txt"
+            if target.exists():
+                os.unlink(tmp_name)
+            else:
+                os.chmod(tmp_name, 0o444)
+                shutil.move(tmp_name, target)
+                logger.info("Stored wordlist %s as %s", source, digest)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        index[key] = digest
+        index_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return digest
@@ -0,0 +1,176 @@
+"""Drive a running ZAP daemon through its JSON API.
+
+One daemon can baseline-scan many targets: each target gets a fresh session,
+a spider run and a wait for the passive scanner, and its alerts are grouped
+per rule into the same report layout ``zap-baseline.py -J`` writes, so they
+flow through ``ZapBaselineModel`` unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import ProxyHandler, Request, build_opener
+
+logger = logging.getLogger(__name__)
+
+ZAP_REQUEST_TIMEOUT = 30.0
+ZAP_STARTUP_TIMEOUT = 180.0
+ZAP_POLL_INTERVAL = 2.0
+ZAP_ALERT_PAGE = 500
+
+
+class ZapClient:
+    """Minimal client for the ZAP JSON API."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = ZAP_REQUEST_TIMEOUT,
+    ) -> None:
+        """Set up the client; environment proxies are bypassed."""
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self._opener = build_opener(ProxyHandler({}))
+
+    def call(
+        self, component: str, kind: str, name: str, **params: object
+    ) -> Dict[str, object]:
+        """Call ``/JSON/<component>/<kind>/<name>/`` and return the reply."""
+        query = urlencode({k: str(v) for k, v in params.items()})
+        request = Request(
+            f"{self.base_url}/JSON/{component}/{kind}/{name}/?{query}",
+            headers={"X-ZAP-API-Key": self.api_key},
+        )
+        with self._opener.open(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+
+def wait_for_zap(
+    client: ZapClient, timeout: float = ZAP_STARTUP_TIMEOUT
+) -> str:
+    """Wait until the daemon answers API calls and return its version."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return str(client.call("core", "view", "version")["version"])
+        except (OSError, URLError, ValueError, KeyError) as exc:
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"ZAP daemon not reachable at {client.base_url} after"
+                    f" {timeout:.0f}s: {exc}"
+                ) from exc
+        time.sleep(ZAP_POLL_INTERVAL)
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    """Return True once an optional deadline has passed."""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _view_int(
+    client: ZapClient, component: str, name: str, **params: object
+) -> int:
+    """Return the single numeric value of a ZAP view."""
+    reply = client.call(component, "view", name, **params)
+    return int(next(iter(reply.values())))  # type: ignore[call-overload]
+
+
+def _spider(client: ZapClient, url: str, deadline: Optional[float]) -> bool:
+    """Spider a target; return False if the deadline stopped it early."""
+    reply = client.call("spider", "action", "scan", url=url, recurse="true")
+    scan_id = reply["scan"]
+    while _view_int(client, "spider", "status", scanId=scan_id) < 100:
+        if _expired(deadline):
+            client.call("spider", "action", "stop", scanId=scan_id)
+            return False
+        time.sleep(ZAP_POLL_INTERVAL)
+    return True
+
+
+def _drain_passive_scan(client: ZapClient, deadline: Optional[float]) -> bool:
+    """Wait for the passive scanner queue to empty, up to the deadline."""
+    while _view_int(client, "pscan", "recordsToScan") > 0:
+        if _expired(deadline):
+            return False
+        time.sleep(ZAP_POLL_INTERVAL)
+    return True
+
+
+def _fetch_alerts(client: ZapClient, url: str) -> List[Dict[str, object]]:
+    """Page through the alert instances recorded under ``url``."""
+    alerts: List[Dict[str, object]] = []
+    while True:
+        page: List[Dict[str, object]] = client.call(  # type: ignore[assignment]
+            "core",
+            "view",
+            "alerts",
+            baseurl=url,
+            start=len(alerts),
+            count=ZAP_ALERT_PAGE,
+        )["alerts"]
+        alerts.extend(page)
+        if len(page) < ZAP_ALERT_PAGE:
+            return alerts
+
+
+def baseline_report(
+    url: str, alerts: List[Dict[str, object]]
+) -> Dict[str, object]:
+    """Group API alert instances per rule in the baseline report layout."""
+    grouped: Dict[object, Dict[str, object]] = {}
+    instances: Dict[object, List[Dict[str, object]]] = {}
+    for alert in alerts:
+        key = alert.get("pluginId") or alert.get("alert")
+        if key not in grouped:
+            instances[key] = []
+            references = str(alert.get("reference") or "").splitlines()
+            grouped[key] = {
+                "pluginid": alert.get("pluginId"),
+                "alert": alert.get("alert"),
+                "name": alert.get("name") or alert.get("alert"),
+                "riskdesc": f"{alert.get('risk')} ({alert.get('confidence')})",
+                "desc": alert.get("description"),
+                "solution": alert.get("solution"),
+                "reference": ",".join(
+                    r.strip() for r in references if r.strip()
+                ),
+                "cweid": alert.get("cweid"),
+                "wascid": alert.get("wascid"),
+                "instances": instances[key],
+            }
+        instances[key].append(
+            {
+                "uri": alert.get("url"),
+                "method": alert.get("method"),
+                "param": alert.get("param"),
+                "evidence": alert.get("evidence"),
+            }
+        )
+    for key, entry in grouped.items():
+        entry["count"] = str(len(instances[key]))
+    return {"site": [{"@name": url, "alerts": list(grouped.values())}]}
+
+
+def zap_baseline_scan(
+    client: ZapClient, url: str, *, timeout: Optional[float] = None
+) -> Tuple[Dict[str, object], bool]:
+    """Spider and passively scan one target in a fresh session.
+
+    Returns the baseline-style report and whether the scan finished inside
+    ``timeout``; alerts found before the deadline are reported either way.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    client.call("core", "action", "newSession", overwrite="true")
+    client.call("core", "action", "accessUrl", url=url, followRedirects="true")
+    complete = _spider(client, url, deadline)
+    complete = _drain_passive_scan(client, deadline) and complete
+    alerts = _fetch_alerts(client, url)
+    logger.info("ZAP found %s alert instances for %s", len(alerts), url)
+    return baseline_report(url, alerts), complete
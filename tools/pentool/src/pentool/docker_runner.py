@@ -9,10 +9,13 @@ import random
 import shlex
 import shutil
 import subprocess
+import threading
+import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import timezone as tz
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import quote
 
 from .constants import dockerfile_content, dockerignore_content
@@ -34,9 +37,19 @@ class RunnerPaths:
     runs: Path
     cache: Path
     data: Path
+    wordlists: Path
     docker_context: Path
 
 
+class ContainerTimeout(RuntimeError):
+    """Raised when a container exceeds its timeout and has been killed."""
+
+    def __init__(self, message: str, output: str = "") -> None:
+        """Store the output the container produced before it was killed."""
+        super().__init__(message)
+        self.output = output
+
+
 @dataclass
 class file_lock:
     """File-based lock context manager."""
@@ -101,6 +114,7 @@ class DockerRunner:
             runs=root / "runs",
             cache=root / "cache",
             data=root / "datasets",
+            wordlists=root / "wordlists",
             docker_context=root / "docker",
         )
         self._create_paths(paths)
@@ -108,7 +122,13 @@ class DockerRunner:
 
     def _create_paths(self, paths: RunnerPaths) -> None:
         """Create all required directory paths."""
-        for path in (paths.runs, paths.cache, paths.data, paths.docker_context):
+        for path in (
+            paths.runs,
+            paths.cache,
+            paths.data,
+            paths.wordlists,
+            paths.docker_context,
+        ):
             path.mkdir(parents=True, exist_ok=True)
         for namespace in ("discover", "fingerprint", "webmap", "scan"):
             (paths.cache / namespace).mkdir(parents=True, exist_ok=True)
@@ -124,6 +144,17 @@ class DockerRunner:
             return shlex.split(env_opts)
         return ["--network=host", "--cap-add=NET_RAW", "--cap-add=NET_ADMIN"]
 
+    @property
+    def network_mode(self) -> Optional[str]:
+        """Return the ``--network`` value from the Docker options, if set."""
+        mode: Optional[str] = None
+        opts = iter(self.docker_opts)
+        for opt in opts:
+            flag, _, value = opt.partition("=")
+            if flag in ("--network", "--net"):
+                mode = value or next(opts, None)
+        return mode
+
     def _load_extra_volumes(self) -> List[str]:
         """Load extra Docker volumes from environment."""
         extra = os.environ.get("PENTEST_TOOLKIT_DOCKER_VOLUMES")
@@ -338,22 +369,38 @@ class DockerRunner:
         return env_args
 
     def _base_command(
-        self, extra_env: Optional[Dict[str, str]] = None
+        self,
+        extra_env: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+        *,
+        detach: bool = False,
+        ports: Sequence[int] = (),
     ) -> List[str]:
-        """Build base Docker run command."""
+        """Build base Docker run command.
+
+        ``ports`` are published on the host loopback interface.
+        """
         env_vars = self._build_base_env_vars(extra_env)
         env_args = self._env_vars_to_args(env_vars)
 
-        cmd: List[str] = [
-            "docker",
-            "run",
-            "--rm",
-            "-v",
-            f"{self.paths.root}:/work",
-            "-v",
-            f"{self.paths.data}:/datasets",
-        ]
+        cmd: List[str] = ["docker", "run", "--rm"]
+        if detach:
+            cmd.append("--detach")
+        if name:
+            cmd.extend(["--name", name])
+        cmd.extend(
+            [
+                "-v",
+                f"{self.paths.root}:/work",
+                "-v",
+                f"{self.paths.data}:/datasets",
+                "-v",
+                f"{self.paths.wordlists}:/wordlists:ro",
+            ]
+        )
         cmd.extend(self.docker_opts)
+        for port in ports:
+            cmd.extend(["-p", f"127.0.0.1:{port}:{port}"])
         cmd.extend(self.extra_volumes)
         cmd.extend(env_args)
         cmd.append(self.image)
@@ -382,6 +429,15 @@ class DockerRunner:
         """Run Docker command without output capture."""
         return subprocess.run(cmd, check=check, timeout=timeout)
 
+    def _kill_container(self, name: str) -> None:
+        """Kill a named container; stopping the docker client leaves it running."""
+        subprocess.run(
+            ["docker", "kill", name],
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
     def run(
         self,
         args: Sequence[str],
@@ -391,8 +447,13 @@ class DockerRunner:
         capture_output: bool = False,
         timeout: Optional[float] = None,
     ) -> subprocess.CompletedProcess:
-        """Run command in Docker container."""
-        cmd = self._base_command(extra_env)
+        """Run command in Docker container.
+
+        Containers are named so a timed-out run can be killed; the timeout
+        surfaces as ``ContainerTimeout`` carrying any captured output.
+        """
+        name = f"pentool-{uuid.uuid4().hex[:12]}"
+        cmd = self._base_command(extra_env, name)
         cmd.extend(args)
         logger.debug("Running container command: %s", shlex.join(cmd))
         try:
@@ -403,7 +464,13 @@ class DockerRunner:
         except subprocess.CalledProcessError as exc:
             raise RuntimeError(f"Container execution failed: {exc}") from exc
         except subprocess.TimeoutExpired as exc:
-            raise RuntimeError(f"Container command timed out: {exc}") from exc
+            self._kill_container(name)
+            output = exc.output or ""
+            if isinstance(output, bytes):
+                output = output.decode("utf-8", "replace")
+            raise ContainerTimeout(
+                f"Container command timed out: {exc}", output
+            ) from exc
         return result
 
     def run_collect(
@@ -425,6 +492,97 @@ class DockerRunner:
         output = result.stdout or ""
         return result.returncode, output
 
+    @contextmanager
+    def stream(
+        self,
+        args: Sequence[str],
+        extra_env: Optional[Dict[str, str]] = None,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Iterator[subprocess.Popen]:
+        """Run command in Docker container, yielding the live process.
+
+        Read ``proc.stdout`` line by line inside the block; leaving the block
+        before the output ends kills the container. ``proc.returncode`` is
+        set once the block exits, and a run that exceeds ``timeout`` is
+        killed and raises ``ContainerTimeout`` after whatever was read.
+        """
+        name = f"pentool-{uuid.uuid4().hex[:12]}"
+        cmd = self._base_command(extra_env, name)
+        cmd.extend(args)
+        logger.debug("Streaming container command: %s", shlex.join(cmd))
+        expired = threading.Event()
+
+        def expire() -> None:
+            expired.set()
+            self._kill_container(name)
+
+        timer = threading.Timer(timeout, expire) if timeout else None
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        ) as proc:
+            if timer is not None:
+                timer.start()
+            try:
+                yield proc
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                if proc.poll() is None:
+                    self._kill_container(name)
+        if expired.is_set():
+            raise ContainerTimeout(
+                f"Container command timed out after {timeout}s"
+            )
+
+    @contextmanager
+    def daemon(
+        self,
+        args: Sequence[str],
+        extra_env: Optional[Dict[str, str]] = None,
+        *,
+        ports: Sequence[int] = (),
+    ) -> Iterator[str]:
+        """Run a long-lived service container for the duration of the block.
+
+        ``ports`` must be reachable from the host: they are published on
+        127.0.0.1 unless the container shares the host network. Yields the
+        container name; the container is killed (and removed) when the block
+        exits, however it exits.
+        """
+        mode = self.network_mode
+        if ports and (mode == "none" or (mode or "").startswith("container:")):
+            raise RuntimeError(
+                f"Service ports cannot be reached with --network={mode}; "
+                "adjust PENTEST_TOOLKIT_DOCKER_OPTS"
+            )
+        published = () if mode == "host" else ports
+        name = f"pentool-{uuid.uuid4().hex[:12]}"
+        cmd = self._base_command(extra_env, name, detach=True, ports=published)
+        cmd.extend(args)
+        logger.debug("Starting service container: %s", shlex.join(cmd))
+        try:
+            subprocess.run(
+                cmd,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except subprocess.CalledProcessError as exc:
+            raise RuntimeError(
+                f"Failed to start service container: {exc.stderr or exc}"
+            ) from exc
+        try:
+            yield name
+        finally:
+            logger.debug("Stopping service container %s", name)
+            self._kill_container(name)
+
     # ──────────────────────────────────────────────────────────────────────────────
     # Run directory management
     # ──────────────────────────────────────────────────────────────────────────────
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pentool.models.finding import Finding
-from pentool.models.nikto import NiktoFindingModel
+from pentool.models.nikto import NIKTO_FINDINGS, NiktoFindingModel
 from pentool.models.severity import (
     SEVERITY_LEVEL,
     SEVERITY_ORDER,
@@ -27,6 +27,7 @@ __all__ = [
     "normalise_severity",
     "risk_to_severity",
     # Nikto
+    "NIKTO_FINDINGS",
     "NiktoFindingModel",
     # ZAP
     "ZapAlertModel",
@@ -2,46 +2,110 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+import hashlib
+from typing import Any, Dict, List, Optional
 
 from pentool.models.severity import SEVERITY_LEVEL, normalise_severity
-from pydantic import BaseModel, Field
 
+FINDING_FIELDS = (
+    "source",
+    "severity",
+    "title",
+    "description",
+    "references",
+    "cwe",
+    "location",
+)
 
-class Finding(BaseModel):
-    """Represents a security finding from any scan tool."""
 
-    source: str
-    severity: str
-    title: str
-    description: str = ""
-    references: List[str] = Field(default_factory=list)
-    cwe: Optional[str] = None
+class Finding:
+    """Represents a security finding from any scan tool.
 
-    @property
-    def normalised_severity(self) -> str:
-        """Normalized severity level."""
-        return normalise_severity(self.severity)
+    Findings are built from tool models that are already validated, so this
+    is a plain slotted class rather than a pydantic model: scans produce tens
+    of thousands of them. Derived values are computed once at construction.
+    """
 
-    @property
-    def level(self) -> str:
-        """SARIF level corresponding to severity."""
-        return SEVERITY_LEVEL[self.normalised_severity]
+    __slots__ = FINDING_FIELDS + (
+        "normalised_severity",
+        "level",
+        "rule_id",
+        "_fingerprint",
+    )
+
+    def __init__(
+        self,
+        source: str,
+        severity: str,
+        title: str,
+        description: str = "",
+        references: Optional[List[str]] = None,
+        cwe: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> None:
+        self.source = source
+        self.severity = severity
+        self.title = title
+        self.description = description
+        self.references = references if references is not None else []
+        self.cwe = cwe
+        self.location = location
+        self.normalised_severity = normalise_severity(severity)
+        self.level = SEVERITY_LEVEL[self.normalised_severity]
+        self.rule_id = f"{source}:{(title or 'finding')[:48]}"
+        self._fingerprint: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"Finding(source={self.source!r}, title={self.title!r})"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Finding:
+        """Rebuild a finding from ``to_dict`` output."""
+        return cls(
+            **{name: data[name] for name in FINDING_FIELDS if name in data}
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the raw field values."""
+        return {
+            "source": self.source,
+            "severity": self.severity,
+            "title": self.title,
+            "description": self.description,
+            "references": list(self.references),
+            "cwe": self.cwe,
+            "location": self.location,
+        }
 
     @property
-    def rule_id(self) -> str:
-        """Unique rule identifier."""
-        trimmed = (self.title or "finding")[:48]
-        return f"{self.source}:{trimmed}"
+    def fingerprint(self) -> str:
+        """Stable content hash of source, title, location and CWE.
+
+        Case and whitespace are normalised so cosmetic changes between tool
+        versions or runs do not produce a new fingerprint.
+        """
+        if self._fingerprint is None:
+            parts = (
+                self.source,
+                self.title,
+                self.location or "",
+                self.cwe or "",
+            )
+            normalised = "\x1f".join(" ".join(p.lower().split()) for p in parts)
+            self._fingerprint = hashlib.sha256(
+                normalised.encode("utf-8")
+            ).hexdigest()
+        return self._fingerprint
 
     def summary_payload(self) -> dict:
         """Generate summary payload for JSON output."""
-        payload = self.model_dump()
+        payload = self.to_dict()
         payload.update(
             {
                 "severity": self.normalised_severity,
                 "rule_id": self.rule_id,
                 "level": self.level,
+                "fingerprint": self.fingerprint,
             }
         )
         return payload
@@ -57,9 +121,11 @@ class Finding(BaseModel):
             "defaultConfiguration": {"level": self.level},
         }
 
-    def sarif_result(self, url: str) -> dict:
+    def sarif_result(
+        self, url: str, baseline_state: Optional[str] = None
+    ) -> dict:
         """Generate SARIF result entry."""
-        return {
+        result = {
             "ruleId": self.rule_id,
             "level": self.level,
             "message": {"text": (self.description[:512] or self.title)},
@@ -74,4 +140,8 @@ class Finding(BaseModel):
                     }
                 }
             ],
+            "partialFingerprints": {"pentool/v1": self.fingerprint},
         }
+        if baseline_state is not None:
+            result["baselineState"] = baseline_state
+        return result
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from pentool.models.finding import Finding
 from pentool.models.severity import risk_to_severity
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class NiktoFindingModel(BaseModel):
@@ -16,6 +16,7 @@ class NiktoFindingModel(BaseModel):
     description: Optional[str] = None
     id: Optional[str] = None
     reference: Optional[str] = None
+    url: Optional[str] = None
 
     def to_finding(self) -> Finding:
         """Convert to standard Finding."""
@@ -27,4 +28,9 @@ class NiktoFindingModel(BaseModel):
             title=title,
             description=self.description or "",
             references=references,
+            location=self.url,
         )
+
+
+# Validates a whole nikto findings array in one pass.
+NIKTO_FINDINGS = TypeAdapter(List[NiktoFindingModel])
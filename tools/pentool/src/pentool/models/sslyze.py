@@ -42,11 +42,13 @@ class SslyzeResultModel(BaseModel):
             self.connectivity_result.error_message or "TLS handshake failure"
         )
         description = f"{host} - {message}" if host else message
+        port = self.server_info.port
         return Finding(
             source="sslyze",
             severity="medium",
             title="TLS handshake failure",
             description=description,
+            location=f"{host}:{port}" if host and port else host or None,
         )
 
 
@@ -18,8 +18,8 @@ class ZapAlertModel(BaseModel):
     reference: Optional[str] = None
     cweid: Optional[str] = None
 
-    def to_finding(self) -> Finding:
-        """Convert to standard Finding."""
+    def to_finding(self, location: Optional[str] = None) -> Finding:
+        """Convert to standard Finding, located at the scanned site."""
         severity_token = (self.riskdesc or "").split()
         severity = risk_to_severity(
             severity_token[0] if severity_token else None
@@ -40,12 +40,14 @@ class ZapAlertModel(BaseModel):
             description=self.desc or "",
             references=references,
             cwe=self.cweid,
+            location=location,
         )
 
 
 class ZapSiteModel(BaseModel):
     """ZAP site model."""
 
+    name: Optional[str] = Field(default=None, alias="@name")
     alerts: List[ZapAlertModel] = Field(default_factory=list)
 
 
@@ -15,9 +15,20 @@ from pentool.parsers.httpx import (
     extract_host_from_httpx,
     extract_port_from_httpx,
     iter_httpx,
+    iter_httpx_entries,
     parse_httpx_entries,
     parse_httpx_line,
 )
+from pentool.parsers.nmap_xml import (
+    build_service_banner,
+    build_service_dict,
+    create_xml_port_dict,
+    extract_address_from_host,
+    iter_nmap_host_elements,
+    iter_nmap_results,
+    iter_nmap_xml,
+    merge_nmap_xml,
+)
 from pentool.parsers.sslyze import (
     build_tls_info,
     extract_server_info,
@@ -38,8 +49,18 @@ __all__ = [
     "extract_host_from_httpx",
     "extract_port_from_httpx",
     "iter_httpx",
+    "iter_httpx_entries",
     "parse_httpx_entries",
     "parse_httpx_line",
+    # nmap XML
+    "build_service_banner",
+    "build_service_dict",
+    "create_xml_port_dict",
+    "extract_address_from_host",
+    "iter_nmap_host_elements",
+    "iter_nmap_results",
+    "iter_nmap_xml",
+    "merge_nmap_xml",
     # sslyze
     "build_tls_info",
     "extract_server_info",
@@ -40,26 +40,23 @@ def build_http_info(data: Dict[str, object]) -> Dict[str, object]:
     return {k: v for k, v in http_info.items() if v}
 
 
+def iter_httpx_entries(httpx_path: Path) -> Iterator[Dict[str, object]]:
+    """Iterate parsed httpx JSON entries one line at a time."""
+    for raw in iter_lines(httpx_path):
+        parsed = parse_httpx_line(raw.strip())
+        if parsed:
+            yield {
+                "url": parsed.get("url"),
+                "status_code": parsed.get("status-code"),
+                "title": parsed.get("title"),
+                "content_length": parsed.get("content-length"),
+                "technologies": parsed.get("technologies"),
+            }
+
+
 def parse_httpx_entries(httpx_path: Path) -> List[Dict[str, object]]:
     """Parse httpx JSON entries returning list of parsed entries."""
-    entries: List[Dict[str, object]] = []
-    if not httpx_path.exists() or httpx_path.stat().st_size == 0:
-        return entries
-
-    with httpx_path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            parsed = parse_httpx_line(line.strip())
-            if parsed:
-                entries.append(
-                    {
-                        "url": parsed.get("url"),
-                        "status_code": parsed.get("status-code"),
-                        "title": parsed.get("title"),
-                        "content_length": parsed.get("content-length"),
-                        "technologies": parsed.get("technologies"),
-                    }
-                )
-    return entries
+    return list(iter_httpx_entries(httpx_path))
 
 
 def iter_httpx(
@@ -0,0 +1,133 @@
+"""nmap XML output parsing utilities."""
+
+from __future__ import annotations
+
+import logging
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pentool.common import safe_int
+from pentool.parsers.gnmap import iter_gnmap
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ATTRIBUTES = (
+    "product",
+    "version",
+    "extrainfo",
+    "tunnel",
+    "method",
+    "conf",
+    "ostype",
+    "hostname",
+    "devicetype",
+)
+
+
+def iter_nmap_host_elements(xml_path: Path) -> Iterator[ET.Element]:
+    """Stream completed ``<host>`` elements, clearing each once consumed."""
+    if not xml_path.exists() or xml_path.stat().st_size == 0:
+        return
+    context = ET.iterparse(str(xml_path), events=("start", "end"))
+    try:
+        _, root = next(context)
+        for event, elem in context:
+            if event == "end" and elem.tag == "host":
+                yield elem
+                root.clear()
+    except ET.ParseError as exc:
+        logger.warning("Stopped reading truncated %s: %s", xml_path, exc)
+
+
+def extract_address_from_host(host: ET.Element) -> Optional[str]:
+    """Extract the IP address of a host element, ignoring MAC addresses."""
+    for addr in host.iter("address"):
+        if addr.get("addrtype") in ("ipv4", "ipv6") and addr.get("addr"):
+            return addr.get("addr")
+    return None
+
+
+def build_service_banner(service: Dict[str, object]) -> str:
+    """Rebuild the gnmap-style version banner from service fields."""
+    parts = [service.get("product"), service.get("version")]
+    extra = service.get("extrainfo")
+    if extra:
+        parts.append(f"({extra})")
+    return " ".join(str(p) for p in parts if p)
+
+
+def build_service_dict(service: Optional[ET.Element]) -> Dict[str, object]:
+    """Build service dictionary from a ``<service>`` element."""
+    if service is None:
+        return {}
+    details: Dict[str, object] = {"name": service.get("name", "")}
+    for attr in SERVICE_ATTRIBUTES:
+        value = service.get(attr)
+        if value:
+            details[attr] = value
+    cpes: List[str] = [c.text for c in service.iter("cpe") if c.text]
+    if cpes:
+        details["cpe"] = cpes
+    banner = build_service_banner(details)
+    if banner:
+        details["banner"] = banner
+    return details
+
+
+def create_xml_port_dict(
+    port_elem: ET.Element,
+) -> Optional[Tuple[int, Dict[str, object]]]:
+    """Create a port dictionary shaped like ``create_gnmap_port_dict``."""
+    port = safe_int(port_elem.get("portid"))
+    if port is None:
+        return None
+    state_elem = port_elem.find("state")
+    state = state_elem.get("state", "") if state_elem is not None else ""
+    return port, {
+        "port": port,
+        "state": state,
+        "protocol": port_elem.get("protocol", "tcp"),
+        "service": build_service_dict(port_elem.find("service")),
+    }
+
+
+def iter_nmap_xml(
+    xml_path: Path,
+) -> Iterator[Tuple[str, int, Dict[str, object]]]:
+    """Iterate host, port, and port details from nmap XML output."""
+    for host in iter_nmap_host_elements(xml_path):
+        ip = extract_address_from_host(host)
+        if not ip:
+            continue
+        for port_elem in host.iter("port"):
+            parsed = create_xml_port_dict(port_elem)
+            if parsed:
+                port, port_dict = parsed
+                yield ip, port, port_dict
+
+
+def iter_nmap_results(
+    xml_path: Path, gnmap_path: Path
+) -> Iterator[Tuple[str, int, Dict[str, object]]]:
+    """Iterate nmap results, preferring XML and falling back to gnmap."""
+    if xml_path.exists() and xml_path.stat().st_size > 0:
+        return iter_nmap_xml(xml_path)
+    return iter_gnmap(gnmap_path)
+
+
+def merge_nmap_xml(sources: Sequence[Path], destination: Path) -> int:
+    """Stream the ``<host>`` elements of several nmap XML files into one.
+
+    Returns the number of hosts written.
+    """
+    count = 0
+    with destination.open("w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write('<nmaprun scanner="nmap">\n')
+        for source in sources:
+            for host in iter_nmap_host_elements(source):
+                out.write(ET.tostring(host, encoding="unicode"))
+                count += 1
+        out.write("</nmaprun>\n")
+    return count
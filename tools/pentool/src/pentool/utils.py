@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import collections.abc
 import datetime as dt
 import hashlib
 import json
@@ -11,7 +12,7 @@ import re
 from dataclasses import dataclass
 from datetime import timezone as tz
 from pathlib import Path
-from typing import Any, Iterable, Optional, Sequence, Tuple
+from typing import IO, Any, Iterable, Mapping, Optional, Sequence, Tuple
 
 logger = logging.getLogger("pentool")
 
@@ -70,6 +71,62 @@ def write_json(path: Path, data: Any) -> None:
         fh.write("\n")
 
 
+def _dump_indented(value: Any, indent: str) -> str:
+    """Serialise ``value`` like ``json.dump(indent=2)`` at a nesting level."""
+    return json.dumps(value, indent=2).replace("\n", "\n" + indent)
+
+
+def _write_json_array(fh: IO[str], items: Iterable[Any], indent: str) -> None:
+    """Write ``items`` as an indented JSON array, one item at a time."""
+    empty = True
+    for item in items:
+        fh.write("[" if empty else ",")
+        fh.write(f"\n{indent}  {_dump_indented(item, indent + '  ')}")
+        empty = False
+    fh.write("[]" if empty else f"\n{indent}]")
+
+
+def _has_iterators(data: Mapping[str, Any]) -> bool:
+    """Return True when ``data`` holds iterator values at any depth."""
+    return any(
+        isinstance(value, collections.abc.Iterator)
+        or (isinstance(value, Mapping) and _has_iterators(value))
+        for value in data.values()
+    )
+
+
+def _write_json_object(
+    fh: IO[str], data: Mapping[str, Any], indent: str
+) -> None:
+    """Write ``data`` as an indented JSON object, streaming iterator values."""
+    if not data:
+        fh.write("{}")
+        return
+    for index, (key, value) in enumerate(data.items()):
+        fh.write(f"{',' if index else '{'}\n{indent}  {json.dumps(key)}: ")
+        if isinstance(value, collections.abc.Iterator):
+            _write_json_array(fh, value, indent + "  ")
+        elif isinstance(value, Mapping) and _has_iterators(value):
+            _write_json_object(fh, value, indent + "  ")
+        else:
+            fh.write(_dump_indented(value, indent + "  "))
+    fh.write(f"\n{indent}}}")
+
+
+def write_json_stream(path: Path, data: Mapping[str, Any]) -> None:
+    """Write ``data`` like ``write_json``, streaming iterator values.
+
+    Values that are iterators (generators included), at the top level or in
+    nested mappings, are written as arrays item by item and never
+    materialised. The output is identical to ``write_json`` on the same data
+    with those iterators as lists.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        _write_json_object(fh, data, "")
+        fh.write("\n")
+
+
 def append_log(path: Path, message: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8") as fh: